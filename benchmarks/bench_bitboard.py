@@ -0,0 +1,110 @@
+"""Benchmark the bitboard representation head-to-head with the mailbox boards.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_bitboard.py --rounds 200
+
+Each row times the same work on the middlegame positions of
+``bench_movegen.py``: pseudo-legal and legal move generation, check detection
+and make/unmake pairs, once per ``Board`` backend and once on
+:class:`~xiangqi_core.bitboard.BitboardPosition`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from bench_movegen import middlegame_positions
+
+from xiangqi_core.attack import is_in_check
+from xiangqi_core.bitboard import BitboardPosition
+from xiangqi_core.board import BACKENDS
+from xiangqi_core.legality import generate_legal_moves
+from xiangqi_core.movegen import generate_pseudo_legal_moves
+
+
+def _time(work: Callable[[], int], rounds: int) -> float:
+    start = time.perf_counter()
+    items = 0
+    for _ in range(rounds):
+        items += work()
+    return items / (time.perf_counter() - start)
+
+
+def _board_tasks(positions: Sequence) -> Dict[str, Callable[[], int]]:  # type: ignore[type-arg]
+    def pseudo() -> int:
+        return sum(len(generate_pseudo_legal_moves(p, p.side_to_move)) for p in positions)
+
+    def legal() -> int:
+        return sum(len(generate_legal_moves(p, p.side_to_move)) for p in positions)
+
+    def check() -> int:
+        for p in positions:
+            is_in_check(p, p.side_to_move)
+            is_in_check(p, p.side_to_move.opponent())
+        return 2 * len(positions)
+
+    moves = [generate_pseudo_legal_moves(p, p.side_to_move) for p in positions]
+
+    def make_unmake() -> int:
+        for p, position_moves in zip(positions, moves):
+            for move in position_moves:
+                p.unmake_move(p.make_move(move))
+        return sum(len(m) for m in moves)
+
+    return {"pseudo-legal moves": pseudo, "legal moves": legal, "in-check tests": check, "make + unmake": make_unmake}
+
+
+def _bitboard_tasks(positions: Sequence[BitboardPosition]) -> Dict[str, Callable[[], int]]:
+    def pseudo() -> int:
+        return sum(len(p.generate_pseudo_legal_moves(p.side_to_move)) for p in positions)
+
+    def legal() -> int:
+        return sum(len(p.generate_legal_moves(p.side_to_move)) for p in positions)
+
+    def check() -> int:
+        for p in positions:
+            p.is_in_check(p.side_to_move)
+            p.is_in_check(p.side_to_move.opponent())
+        return 2 * len(positions)
+
+    moves = [p.generate_pseudo_legal_moves(p.side_to_move) for p in positions]
+
+    def make_unmake() -> int:
+        for p, position_moves in zip(positions, moves):
+            for move in position_moves:
+                p.unmake_move(p.make_move(move))
+        return sum(len(m) for m in moves)
+
+    return {"pseudo-legal moves": pseudo, "legal moves": legal, "in-check tests": check, "make + unmake": make_unmake}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    columns: Dict[str, Dict[str, float]] = {}
+    for backend in BACKENDS:
+        positions = middlegame_positions(backend)
+        columns[backend] = {
+            name: _time(work, args.rounds) for name, work in _board_tasks(positions).items()
+        }
+    bitboards = [BitboardPosition.from_position(p) for p in middlegame_positions()]
+    for bitboard, position in zip(bitboards, middlegame_positions()):
+        side = position.side_to_move
+        assert set(bitboard.generate_legal_moves(side)) == set(generate_legal_moves(position, side))
+    columns["bitboard"] = {
+        name: _time(work, args.rounds) for name, work in _bitboard_tasks(bitboards).items()
+    }
+
+    names = list(columns)
+    print(f"{'per second':20s}" + "".join(f"{name:>14s}" for name in names))
+    for task in columns[names[0]]:
+        print(f"{task:20s}" + "".join(f"{columns[name][task]:14,.0f}" for name in names))
+
+
+if __name__ == "__main__":
+    main()
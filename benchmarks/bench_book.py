@@ -0,0 +1,57 @@
+"""Benchmark building an opening book and probing it through ``mmap``.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_book.py --games 2000
+
+The book is compiled from the same synthetic archive of random legal games as
+``bench_pgn.py``; lookups probe every position along those games, so roughly
+half of them hit and half fall out of book past ``--max-ply``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from typing import List, Optional
+
+from bench_pgn import random_records
+
+from xiangqi_core.book import OpeningBook, build_book
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=2000, help="games in the archive")
+    parser.add_argument("--max-ply", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    records = list(random_records(args.games))
+    keys: List[int] = []
+    for record in records:
+        position = record.start_position()
+        for move in record.moves[: 2 * args.max_ply]:
+            keys.append(position.key)
+            position.make_move(move)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "book.bin")
+        start = time.perf_counter()
+        count = build_book(records, path, args.max_ply)
+        built = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        with OpeningBook(path) as book:
+            start = time.perf_counter()
+            hits = sum(1 for key in keys if book.lookup(key))
+            probed = time.perf_counter() - start
+
+    print(f"{args.games} games, {count} book records, {size / 1e6:.1f} MB")
+    print(f"build:   {args.games / built:10,.0f} games/sec")
+    print(f"lookup:  {probed / len(keys) * 1e6:10.2f} us/probe ({hits}/{len(keys)} hits)")
+
+
+if __name__ == "__main__":
+    main()
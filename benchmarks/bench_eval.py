@@ -0,0 +1,72 @@
+"""Benchmark static evaluation in evaluations per second.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_eval.py --count 200000
+
+The incremental score is compared with a from-scratch scan of the board (how
+the search evaluated leaves before ``xiangqi_core.eval`` existed) and with
+the optional mobility and king-safety terms switched on. The last line times
+make/unmake pairs, which now also update the score.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, List, Optional, Sequence
+
+from bench_movegen import middlegame_positions
+
+from xiangqi_core import Position
+from xiangqi_core.board import BACKENDS
+from xiangqi_core.eval import compute_score, evaluate
+from xiangqi_core.legality import generate_legal_moves
+from xiangqi_core.types import Side
+
+
+def _scan(position: Position) -> int:
+    score = compute_score(position.board)
+    return score if position.side_to_move is Side.RED else -score
+
+
+def _rate(function: Callable[[Position], int], positions: Sequence[Position], count: int) -> float:
+    start = time.perf_counter()
+    for index in range(count):
+        function(positions[index % len(positions)])
+    return count / (time.perf_counter() - start)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000, help="evaluations per variant")
+    parser.add_argument("--backend", choices=BACKENDS, default="dict")
+    args = parser.parse_args(argv)
+
+    positions = middlegame_positions(args.backend)
+    for position in positions:
+        assert evaluate(position) == _scan(position)
+
+    variants = (
+        ("incremental", evaluate),
+        ("from-scratch scan", _scan),
+        ("+ mobility", lambda position: evaluate(position, mobility_term=True)),
+        ("+ king safety", lambda position: evaluate(position, king_safety_term=True)),
+    )
+    for name, function in variants:
+        count = args.count if name in ("incremental", "from-scratch scan") else args.count // 20
+        print(f"{name:20s} {_rate(function, positions, count):14,.0f} evals/sec")
+
+    pairs = [(position, generate_legal_moves(position, position.side_to_move)) for position in positions]
+    made = 0
+    start = time.perf_counter()
+    while made < args.count:
+        for position, moves in pairs:
+            for move in moves:
+                position.unmake_move(position.make_move(move))
+            made += len(moves)
+    print(f"{'make + unmake':20s} {made / (time.perf_counter() - start):14,.0f} pairs/sec")
+
+
+if __name__ == "__main__":
+    main()
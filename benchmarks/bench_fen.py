@@ -0,0 +1,58 @@
+"""Benchmark FEN parsing and serialization round trips.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_fen.py --count 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import List, Optional
+
+from xiangqi_core import Position, generate_legal_moves, initial_position
+from xiangqi_core.board import BACKENDS
+
+
+def sample_fens(count: int, seed: int = 7, max_plies: int = 60) -> List[str]:
+    """Collect FENs from random playouts starting at the initial position."""
+
+    rng = random.Random(seed)
+    fens: List[str] = []
+    while len(fens) < count:
+        position = initial_position()
+        for _ in range(rng.randint(0, max_plies)):
+            moves = generate_legal_moves(position, position.side_to_move)
+            if not moves:
+                break
+            position.make_move(rng.choice(moves))
+        fens.append(position.to_fen())
+    return fens
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="round trips to time")
+    parser.add_argument("--pool", type=int, default=200, help="distinct positions to cycle")
+    parser.add_argument("--backend", choices=BACKENDS, default="dict")
+    args = parser.parse_args(argv)
+
+    pool = sample_fens(args.pool)
+    fens = [pool[index % len(pool)] for index in range(args.count)]
+
+    start = time.perf_counter()
+    positions = [Position.from_fen(fen, backend=args.backend) for fen in fens]
+    parsed = time.perf_counter()
+    output = [position.to_fen() for position in positions]
+    finished = time.perf_counter()
+
+    assert output == fens
+    print(f"parse:      {args.count / (parsed - start):12,.0f} FEN/sec")
+    print(f"serialize:  {args.count / (finished - parsed):12,.0f} FEN/sec")
+    print(f"round trip: {args.count / (finished - start):12,.0f} FEN/sec ({finished - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark legal move generation on a handful of middlegame positions.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_movegen.py
+
+The brute-force reference probes all 90 destination squares per piece, the
+way ``generate_legal_moves`` worked before the direct generator existed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, List, Optional, Sequence
+
+from xiangqi_core import (
+    Coord,
+    Game,
+    Move,
+    Position,
+    Side,
+    initial_position,
+    is_in_check,
+    is_pseudo_legal_move,
+)
+from xiangqi_core.board import BACKENDS
+from xiangqi_core.legality import generate_legal_moves
+
+# Opening lines (ICCS coordinates) that lead into typical middlegames.
+MIDDLEGAME_LINES: Sequence[str] = (
+    "h2e2 h9g7 h0g2 i9h9 i0h0 b9c7 b0c2 c6c5 g3g4 b7b3",
+    "b2e2 b9c7 b0c2 a9b9 a0b0 h9g7 h0g2 c6c5 c3c4 h7h3",
+    "c3c4 g6g5 b0c2 h9g7 b2a2 b9c7 a0b0 a9b9 h2h4 i9h9",
+    "h2e2 b9c7 h0g2 a9b9 i0h0 h9g7 h0h6 b7a7 c3c4 b9b5 b0c2 g6g5",
+    "g3g4 h9g7 h0g2 b9c7 b2e2 g6g5 g4g5 g7f5 e3e4 i9h9",
+)
+
+
+def middlegame_positions(backend: Optional[str] = None) -> List[Position]:
+    """Play each line from the start position and return the results."""
+
+    positions = []
+    for line in MIDDLEGAME_LINES:
+        game = Game(initial_position(backend=backend))
+        for text in line.split():
+            game.apply_move(Move.from_str(text))
+        positions.append(game.position)
+    return positions
+
+
+def brute_force_legal_moves(position: Position, side: Side) -> List[Move]:
+    legal_moves = []
+    for coord, piece in list(position.board):
+        if piece.side is not side:
+            continue
+        for x in range(9):
+            for y in range(10):
+                move = Move(coord, Coord(x, y))
+                if not is_pseudo_legal_move(position, move):
+                    continue
+                undo = position.make_move(move)
+                in_check = is_in_check(position, side)
+                position.unmake_move(undo)
+                if not in_check:
+                    legal_moves.append(move)
+    return legal_moves
+
+
+def _measure(
+    generator: Callable[[Position, Side], List[Move]],
+    positions: Sequence[Position],
+    rounds: int,
+) -> float:
+    moves = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for position in positions:
+            moves += len(generator(position, position.side_to_move))
+    elapsed = time.perf_counter() - start
+    return moves / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--skip-reference", action="store_true")
+    parser.add_argument("--backend", choices=BACKENDS, default="dict")
+    args = parser.parse_args()
+
+    positions = middlegame_positions(args.backend)
+    for position in positions:
+        side = position.side_to_move
+        assert set(generate_legal_moves(position, side)) == set(brute_force_legal_moves(position, side))
+
+    rate = _measure(generate_legal_moves, positions, args.rounds)
+    print(f"generate_legal_moves:    {rate:12,.0f} legal moves/sec")
+    if not args.skip_reference:
+        reference = _measure(brute_force_legal_moves, positions, max(1, args.rounds // 10))
+        print(f"brute-force reference:   {reference:12,.0f} legal moves/sec")
+        print(f"speed-up:                {rate / reference:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
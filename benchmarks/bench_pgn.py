@@ -0,0 +1,78 @@
+"""Benchmark streaming game-record reading and writing in games/sec.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_pgn.py --games 2000
+
+A synthetic archive of random legal games is written to a temporary file and
+then streamed back twice: once as raw records (notation decoding only) and
+once as fully validated ``Game`` objects.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Iterator, List, Optional
+
+from xiangqi_core import GameResult, generate_legal_moves, initial_position
+from xiangqi_core.pgn import NOTATIONS, GameRecord, iter_games, iter_records, write_records
+
+
+def random_records(count: int, seed: int = 5, max_plies: int = 120) -> Iterator[GameRecord]:
+    """Yield ``count`` records of random legal playouts from the initial position."""
+
+    rng = random.Random(seed)
+    for index in range(count):
+        position = initial_position()
+        record = GameRecord(headers={"Event": "bench", "Round": str(index + 1)})
+        for _ in range(rng.randint(20, max_plies)):
+            moves = generate_legal_moves(position, position.side_to_move)
+            if not moves:
+                break
+            move = rng.choice(moves)
+            position.make_move(move)
+            record.moves.append(move)
+        record.result = "*"
+        yield record
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=2000, help="games in the archive")
+    parser.add_argument("--notation", choices=NOTATIONS, default="iccs")
+    args = parser.parse_args(argv)
+
+    records = list(random_records(args.games))
+    plies = sum(len(record.moves) for record in records)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "archive.pgn")
+
+        start = time.perf_counter()
+        with open(path, "w", encoding="utf-8") as stream:
+            write_records(stream, records, args.notation)
+        written = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        with open(path, encoding="utf-8") as stream:
+            count = sum(1 for _ in iter_records(stream))
+        read = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(path, encoding="utf-8") as stream:
+            replayed = sum(1 for game in iter_games(stream) if game.result is GameResult.ONGOING)
+        validated = time.perf_counter() - start
+
+    assert count == args.games
+    print(f"{args.games} games, {plies} plies, {size / 1e6:.1f} MB ({args.notation})")
+    print(f"write:          {args.games / written:10,.0f} games/sec")
+    print(f"read records:   {args.games / read:10,.0f} games/sec")
+    print(f"read + replay:  {args.games / validated:10,.0f} games/sec ({replayed} unfinished)")
+
+
+if __name__ == "__main__":
+    main()
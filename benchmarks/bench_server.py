@@ -0,0 +1,111 @@
+"""Load-test the game server: move latency with many concurrent sessions.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_server.py --sessions 500 --moves 20
+
+The server is started in a child process (or pass ``--port`` to target one
+already running). Every session creates a game over HTTP, opens its
+WebSocket and plays random legal moves taken from the server's own
+``legal_moves`` list. Latency is the time from sending a move to receiving
+its delta.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+from xiangqi_server import open_websocket, request_json
+
+HOST = "127.0.0.1"
+
+
+async def play_session(port: int, moves: int, seed: int, latencies: List[float]) -> None:
+    rng = random.Random(seed)
+    _, state = await request_json(HOST, port, "POST", "/games")
+    socket = await open_websocket(HOST, port, f"/games/{state['id']}/ws")
+    message = json.loads(await socket.receive() or "{}")
+    for _ in range(moves):
+        if not message.get("legal_moves"):
+            break
+        started = time.perf_counter()
+        await socket.send(json.dumps({"type": "move", "move": rng.choice(message["legal_moves"])}))
+        message = json.loads(await socket.receive() or "{}")
+        latencies.append(time.perf_counter() - started)
+    await socket.close()
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples; never beyond the largest."""
+
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+async def run(port: int, sessions: int, moves: int, ramp: float) -> None:
+    latencies: List[float] = []
+    started = time.perf_counter()
+    tasks = []
+    for index in range(sessions):
+        tasks.append(asyncio.create_task(play_session(port, moves, index, latencies)))
+        if ramp:
+            await asyncio.sleep(ramp / sessions)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"sessions: {sessions}, moves: {len(latencies)} in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:,.0f} moves/s)")
+    if not latencies:
+        print("no moves completed")
+        return
+    p50, p99 = percentile(latencies, 0.50), percentile(latencies, 0.99)
+    print(f"latency p50 {p50 * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms, "
+          f"max {latencies[-1] * 1000:.2f} ms")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=500, help="concurrent games")
+    parser.add_argument("--moves", type=int, default=20, help="moves sent per game")
+    parser.add_argument("--workers", type=int, default=4, help="server worker threads")
+    parser.add_argument("--ramp", type=float, default=1.0, help="seconds to open all sessions")
+    parser.add_argument("--port", type=int, default=None, help="use a running server")
+    args = parser.parse_args(argv)
+
+    server = None
+    port = args.port
+    if port is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                os.path.join(root, "src", "xiangqi_server.py"),
+                "--port", "0",
+                "--workers", str(args.workers),
+                "--max-sessions", str(args.sessions),
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+            env={**os.environ, "PYTHONPATH": os.path.join(root, "src")},
+        )
+        assert server.stdout is not None
+        port = int(server.stdout.readline().rsplit(":", 1)[1])
+    try:
+        asyncio.run(run(port, args.sessions, args.moves, args.ramp))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
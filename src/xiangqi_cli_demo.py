@@ -6,7 +6,8 @@ remain separate from the core rules so the engine can stay UI-agnostic.
 
 from __future__ import annotations
 
-from typing import Iterable, List
+import argparse
+from typing import Iterable, List, Optional, Sequence
 
 from xiangqi_core import (
     Game,
@@ -14,12 +15,14 @@ from xiangqi_core import (
     Move,
     Position,
     Side,
+    Termination,
     XiangqiError,
     is_in_check,
 )
 from xiangqi_core.board import Board
 from xiangqi_core.coord import Coord
 from xiangqi_core.piece import Piece
+from xiangqi_core.search import Searcher
 from xiangqi_core.types import PieceType
 
 _PIECE_SYMBOLS = {
@@ -33,6 +36,13 @@ _PIECE_SYMBOLS = {
 }
 
 
+_TERMINATION_SUFFIXES = {
+    Termination.STALEMATE: " by stalemate",
+    Termination.PERPETUAL_CHECK: " (perpetual check)",
+    Termination.PERPETUAL_CHASE: " (perpetual chase)",
+}
+
+
 def _piece_symbol(piece: Piece) -> str:
     """Return a single-character symbol for ``piece``."""
 
@@ -61,9 +71,14 @@ def describe_status(game: Game) -> str:
     side_label = "Red" if game.position.side_to_move is Side.RED else "Black"
     parts = [f"Side to move: {side_label}"]
 
+    if game.result is GameResult.DRAW:
+        parts.append("Game over — Draw")
+        return " | ".join(parts)
+
     if game.result is not GameResult.ONGOING:
         winner = "Red" if game.result is GameResult.RED_WIN else "Black"
-        parts.append(f"Game over — {winner} wins")
+        suffix = _TERMINATION_SUFFIXES.get(game.termination, "")
+        parts.append(f"Game over — {winner} wins{suffix}")
         return " | ".join(parts)
 
     if is_in_check(game.position, game.position.side_to_move):
@@ -81,9 +96,24 @@ def _prompt() -> str:
     return input("move> ").strip()
 
 
-def main() -> None:  # pragma: no cover - interactive wrapper
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Interactive Xiangqi CLI demo.")
+    parser.add_argument(
+        "--engine",
+        choices=("red", "black"),
+        help="let the engine play this side",
+    )
+    parser.add_argument("--depth", type=int, default=4, help="engine search depth in plies")
+    parser.add_argument("--time", type=float, default=None, help="engine time per move in seconds")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:  # pragma: no cover - interactive wrapper
     """Run the interactive CLI demo."""
 
+    args = _parse_args(argv)
+    engine_side = {"red": Side.RED, "black": Side.BLACK}.get(args.engine or "")
+    searcher = Searcher()
     game = Game()
     print("Xiangqi CLI demo (from-to format, e.g., a0a1). Type 'help' for info.")
     while True:
@@ -92,6 +122,17 @@ def main() -> None:  # pragma: no cover - interactive wrapper
         if game.result is not GameResult.ONGOING:
             break
 
+        if game.position.side_to_move is engine_side:
+            result = searcher.search(game.position, depth=args.depth, time_limit=args.time)
+            if result.best_move is None:
+                break
+            print(
+                f"engine> {result.best_move.to_str()} "
+                f"(score {result.score}, depth {result.depth}, nodes {result.nodes})"
+            )
+            game.apply_move(result.best_move)
+            continue
+
         command = _prompt()
         lower = command.lower()
         if lower in {"quit", "exit"}:
@@ -1,18 +1,28 @@
 """Core package for Xiangqi rules engine v1.0.0."""
 
-from xiangqi_core.board import Board, Position, initial_position
-from xiangqi_core.attack import find_king, is_in_check, is_square_attacked
+from xiangqi_core.board import Board, Position, UndoInfo, initial_position
+from xiangqi_core.attack import find_king, has_both_kings, is_in_check, is_square_attacked
 from xiangqi_core.coord import Coord
 from xiangqi_core.errors import (
     GameOverError,
     IllegalMoveError,
     ParseCoordError,
+    ParseFenError,
+    ParseGameError,
     ParseMoveError,
     XiangqiError,
 )
-from xiangqi_core.game import Game, GameResult
-from xiangqi_core.legality import generate_legal_moves, is_checkmate, is_legal_move
-from xiangqi_core.move import Move
+from xiangqi_core.game import Game, GameResult, Termination
+from xiangqi_core.legality import (
+    generate_legal_move_codes,
+    generate_legal_moves,
+    has_legal_move,
+    is_checkmate,
+    is_legal_move,
+    is_stalemate,
+    iter_legal_moves,
+)
+from xiangqi_core.move import Move, decode_moves, encode_moves
 from xiangqi_core.piece import Piece
 from xiangqi_core.types import PieceType, Side
 from xiangqi_core.rules import is_pseudo_legal_move
@@ -23,21 +33,32 @@ __all__ = [
     "Board",
     "Coord",
     "GameOverError",
+    "decode_moves",
+    "encode_moves",
+    "generate_legal_move_codes",
     "generate_legal_moves",
     "find_king",
+    "has_both_kings",
+    "has_legal_move",
     "IllegalMoveError",
     "is_checkmate",
     "is_in_check",
     "is_legal_move",
     "is_pseudo_legal_move",
     "is_square_attacked",
+    "is_stalemate",
+    "iter_legal_moves",
     "Move",
     "ParseCoordError",
+    "ParseFenError",
+    "ParseGameError",
     "ParseMoveError",
     "Piece",
     "PieceType",
     "Position",
     "Side",
+    "Termination",
+    "UndoInfo",
     "XiangqiError",
     "initial_position",
 ]
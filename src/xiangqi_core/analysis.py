@@ -0,0 +1,295 @@
+"""Whole-game analysis: a score, best move and quality label for every ply.
+
+Every position of the game is searched once, so analysing ``n`` plies costs
+``n + 1`` searches. Ply ``i`` is judged by comparing the best score before
+the move with the score of the position the move actually reached, both from
+the mover's point of view.
+
+Positions are split into chunks of consecutive plies and searched in worker
+processes. Each worker keeps one :class:`~xiangqi_core.search.Searcher`, and
+so one transposition table, for all of its chunks. A chunk is searched from
+its last position back to its first, so the entries left by later positions
+seed the searches of earlier ones. Jobs carry the start FEN and the packed
+move codes, as in :mod:`xiangqi_core.batch`. A ply's result is yielded as
+soon as both of its positions are done, so callers can render progressively.
+A position whose time budget runs out before depth 1 completes is searched
+again to depth 1, so every label rests on a real score.
+
+Command line::
+
+    python -m xiangqi_core.analysis game.pgn --time 0.2 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from array import array
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from xiangqi_core.board import Position
+from xiangqi_core.fen import START_FEN
+from xiangqi_core.game import Game
+from xiangqi_core.move import Move, decode_moves, encode_moves
+from xiangqi_core.pgn import iter_records
+from xiangqi_core.search import DEFAULT_HASH_MB, Searcher
+from xiangqi_core.types import Side
+
+DEFAULT_TIME_PER_PLY = 0.2
+DEFAULT_CHUNK_SIZE = 4
+
+
+class MoveQuality(str, Enum):
+    """How much a move gave away compared with the best move."""
+
+    BEST = "best"
+    GOOD = "good"
+    INACCURACY = "inaccuracy"
+    MISTAKE = "mistake"
+    BLUNDER = "blunder"
+
+
+# Largest score loss (in evaluation units) still given each label.
+QUALITY_THRESHOLDS: Tuple[Tuple[int, MoveQuality], ...] = (
+    (15, MoveQuality.BEST),
+    (50, MoveQuality.GOOD),
+    (120, MoveQuality.INACCURACY),
+    (300, MoveQuality.MISTAKE),
+)
+
+
+def classify(loss: int) -> MoveQuality:
+    """Return the label for a move that lost ``loss`` points."""
+
+    for limit, quality in QUALITY_THRESHOLDS:
+        if loss <= limit:
+            return quality
+    return MoveQuality.BLUNDER
+
+
+@dataclass(frozen=True)
+class PlyAnalysis:
+    """Analysis of one ply; scores are from the mover's point of view."""
+
+    ply: int
+    move: Move
+    side: Side
+    score: int
+    best_move: Optional[Move]
+    best_score: int
+    depth: int
+    quality: MoveQuality
+    pv: List[Move] = field(default_factory=list)
+
+    @property
+    def delta(self) -> int:
+        """Score change caused by the move (zero or negative when it was not best)."""
+
+        return self.score - self.best_score
+
+    @property
+    def red_score(self) -> int:
+        """Score after the move from Red's point of view, for score graphs."""
+
+        return self.score if self.side is Side.RED else -self.score
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "ply": self.ply,
+            "move": self.move.to_str(),
+            "side": self.side.value,
+            "score": self.score,
+            "best_move": self.best_move.to_str() if self.best_move else None,
+            "best_score": self.best_score,
+            "delta": self.delta,
+            "quality": self.quality.value,
+            "depth": self.depth,
+            "pv": [move.to_str() for move in self.pv],
+        }
+
+
+# (first position index, last position index, start FEN, move codes up to last)
+_Job = Tuple[int, int, str, bytes]
+# (position index, best move code or None, score, depth, packed PV codes)
+_Found = Tuple[int, Optional[int], int, int, bytes]
+
+# One searcher per worker process, so the table survives between chunks.
+_searcher: Optional[Searcher] = None
+
+
+def _init_worker(hash_mb: float) -> None:
+    global _searcher
+    _searcher = Searcher(hash_mb=hash_mb)
+
+
+def _analyze_chunk(
+    job: _Job,
+    depth: Optional[int],
+    time_per_ply: Optional[float],
+    searcher: Optional[Searcher] = None,
+) -> List[_Found]:
+    """Worker entry point: search positions ``first..last``, last one first."""
+
+    if searcher is None:
+        searcher = _searcher
+    assert searcher is not None
+    first, last, fen, data = job
+    codes = array("H")
+    codes.frombytes(data)
+    position = Position.from_fen(fen)
+    undos = [position.make_move(move) for move in decode_moves(codes)]
+
+    found: List[_Found] = []
+    for index in range(last, first - 1, -1):
+        if index < last:
+            position.unmake_move(undos[index])
+        result = searcher.search(position, depth=depth, time_limit=time_per_ply)
+        if result.depth == 0 and result.best_move is not None:
+            # Time ran out inside depth 1; the placeholder score means nothing.
+            result = searcher.search(position, depth=1)
+        best = result.best_move.code if result.best_move is not None else None
+        pv = encode_moves(result.pv).tobytes()
+        found.append((index, best, result.score, result.depth, pv))
+    return found
+
+
+def _jobs(fen: str, codes: "array[int]", chunk_size: int) -> Iterator[_Job]:
+    # Positions 0..n: the start position and the one after each move.
+    count = len(codes) + 1
+    for first in range(0, count, chunk_size):
+        last = min(first + chunk_size, count) - 1
+        yield first, last, fen, codes[:last].tobytes()
+
+
+def _ply_result(
+    moves: List[Move], side: Side, index: int, before: _Found, after: _Found
+) -> PlyAnalysis:
+    _, best, best_score, depth, pv_data = before
+    score = -after[2]
+    pv = array("H")
+    pv.frombytes(pv_data)
+    move = moves[index]
+    best_move = Move.from_code(best) if best is not None else None
+    loss = 0 if move == best_move else max(best_score - score, 0)
+    return PlyAnalysis(
+        ply=index + 1,
+        move=move,
+        side=side,
+        score=score,
+        best_move=best_move,
+        best_score=best_score,
+        depth=depth,
+        quality=classify(loss),
+        pv=decode_moves(pv),
+    )
+
+
+def analyze_moves(
+    moves: Iterable[Move],
+    start_fen: Optional[str] = None,
+    time_per_ply: Optional[float] = DEFAULT_TIME_PER_PLY,
+    depth: Optional[int] = None,
+    workers: Optional[int] = None,
+    hash_mb: float = DEFAULT_HASH_MB,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[PlyAnalysis]:
+    """Analyse ``moves`` played from ``start_fen`` and yield each ply when ready.
+
+    Plies arrive in completion order, not game order; use
+    :attr:`PlyAnalysis.ply` to place them. Every position gets
+    ``time_per_ply`` seconds and/or ``depth`` plies of search. ``workers``
+    defaults to the number of CPUs. With a single worker the analysis runs
+    in the calling process, still streaming. Moves are assumed legal.
+    Positions are searched without the game's repetition history.
+    """
+
+    if time_per_ply is None and depth is None:
+        raise ValueError("give time_per_ply or depth to bound the search")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    moves = list(moves)
+    fen = start_fen or START_FEN
+    position = Position.from_fen(fen)
+    sides: List[Side] = []
+    for move in moves:
+        sides.append(position.side_to_move)
+        position.make_move(move)
+
+    codes = encode_moves(moves)
+    found: Dict[int, _Found] = {}
+    emitted: Set[int] = set()
+
+    def ready(results: List[_Found]) -> Iterator[PlyAnalysis]:
+        for entry in results:
+            found[entry[0]] = entry
+        for entry in results:
+            for index in (entry[0] - 1, entry[0]):
+                if 0 <= index < len(moves) and index not in emitted:
+                    if index in found and index + 1 in found:
+                        emitted.add(index)
+                        before, after = found[index], found[index + 1]
+                        yield _ply_result(moves, sides[index], index, before, after)
+
+    workers = workers or os.cpu_count() or 1
+    jobs = _jobs(fen, codes, chunk_size)
+    if workers == 1:
+        searcher = Searcher(hash_mb=hash_mb)
+        for job in jobs:
+            yield from ready(_analyze_chunk(job, depth, time_per_ply, searcher))
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(hash_mb,)
+    ) as executor:
+        pending: Set[Future] = {
+            executor.submit(_analyze_chunk, job, depth, time_per_ply) for job in jobs
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from ready(future.result())
+
+
+def analyze_game(game: Game, **options: Any) -> Iterator[PlyAnalysis]:
+    """Analyse the moves of ``game`` up to its current ply.
+
+    Keyword options are those of :func:`analyze_moves`. Plies that were
+    undone but can still be redone are not analysed.
+    """
+
+    return analyze_moves(list(game.history), game.start_fen, **options)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m xiangqi_core.analysis",
+        description="Analyse every ply of a game and stream one JSON line per ply.",
+    )
+    parser.add_argument("path", help="game record file (the first game is analysed)")
+    parser.add_argument("--time", type=float, default=DEFAULT_TIME_PER_PLY, help="seconds per ply")
+    parser.add_argument("--depth", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--hash", type=float, default=DEFAULT_HASH_MB, help="MB per worker")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    with open(args.path, encoding="utf-8") as stream:
+        record = next(iter_records(stream), None)
+    if record is None:
+        print("no game found", file=sys.stderr)
+        return 1
+    fen = record.headers.get("FEN") or START_FEN
+    for result in analyze_moves(
+        record.moves, fen, args.time, args.depth, args.workers, args.hash, args.chunk_size
+    ):
+        print(json.dumps(result.to_dict()), flush=True)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - script entrypoint
+    sys.exit(main())
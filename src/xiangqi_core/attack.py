@@ -1,40 +1,203 @@
-"""Attack and check detection utilities."""
+"""Attack and check detection utilities.
+
+Attacks are detected by working outward from the target square instead of
+asking every attacking piece whether it can reach it: rook, cannon and king
+rays along the file and rank, the eight squares a horse could jump from
+(with the leg rule applied in reverse), advisor and elephant points, and the
+squares an attacking pawn could step from.
+
+:func:`check_info` applies the same tables to a side's own king to find the
+few moves that could expose it, so legality filtering can skip the full test
+for everything else.
+"""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, FrozenSet, List, Tuple
 
 from xiangqi_core.board import Position
-from xiangqi_core.coord import Coord
+from xiangqi_core.coord import Coord, _COORDS
 from xiangqi_core.move import Move
-from xiangqi_core.rules import _count_blockers, is_pseudo_legal_move
+from xiangqi_core.movegen import _DIAGONAL, _HORSE_STEPS, _RAYS
+from xiangqi_core.piece import Piece
 from xiangqi_core.types import PieceType, Side
 
 if TYPE_CHECKING:  # pragma: no cover - import cycle guard
     from xiangqi_core.game import Game
 
+AttackerTable = Tuple[Tuple[Coord, ...], ...]
+BlockableAttackerTable = Tuple[Tuple[Tuple[Coord, Coord], ...], ...]
+
+
+def _offset_squares(square: Coord, offsets: Tuple[Tuple[int, int], ...]) -> Tuple[Coord, ...]:
+    return tuple(
+        Coord.at(square.x + dx, square.y + dy)
+        for dx, dy in offsets
+        if 0 <= square.x + dx <= 8 and 0 <= square.y + dy <= 9
+    )
+
+
+def _build_horse_attackers() -> BlockableAttackerTable:
+    """(horse square, leg square) pairs from which a horse reaches each square."""
+
+    table = []
+    for square in _COORDS:
+        entries = []
+        for dx, dy, leg_dx, leg_dy in _HORSE_STEPS:
+            hx, hy = square.x - dx, square.y - dy
+            if 0 <= hx <= 8 and 0 <= hy <= 9:
+                entries.append((Coord.at(hx, hy), Coord.at(hx + leg_dx, hy + leg_dy)))
+        table.append(tuple(entries))
+    return tuple(table)
+
+
+def _build_advisor_attackers(side: Side) -> AttackerTable:
+    palace_rows = (0, 1, 2) if side is Side.RED else (7, 8, 9)
+    return tuple(
+        _offset_squares(square, _DIAGONAL) if 3 <= square.x <= 5 and square.y in palace_rows else ()
+        for square in _COORDS
+    )
+
+
+def _build_elephant_attackers(side: Side) -> BlockableAttackerTable:
+    """(elephant square, eye square) pairs, only for squares on ``side``'s half."""
+
+    table = []
+    for square in _COORDS:
+        x, y = square.x, square.y
+        entries = []
+        if (y <= 4) if side is Side.RED else (y >= 5):
+            for dx, dy in _DIAGONAL:
+                if 0 <= x + 2 * dx <= 8 and 0 <= y + 2 * dy <= 9:
+                    entries.append((Coord.at(x + 2 * dx, y + 2 * dy), Coord.at(x + dx, y + dy)))
+        table.append(tuple(entries))
+    return tuple(table)
+
+
+def _build_pawn_attackers(side: Side) -> AttackerTable:
+    """Squares a pawn steps from: straight behind, or beside once across the river."""
+
+    forward = 1 if side is Side.RED else -1
+    table = []
+    for square in _COORDS:
+        offsets = [(0, -forward)]
+        if (square.y >= 5) if side is Side.RED else (square.y <= 4):
+            offsets.extend(((-1, 0), (1, 0)))
+        table.append(_offset_squares(square, tuple(offsets)))
+    return tuple(table)
+
+
+# Rays are ordered up, down, right, left (see ``movegen._ORTHOGONAL``).
+_ATTACK_RAYS = tuple(tuple(tuple(move.to for move in ray) for ray in rays) for rays in _RAYS)
+_HORSE_ATTACKERS = _build_horse_attackers()
+# Side-dependent tables are pairs indexed by ``0`` for Red and ``1`` for Black.
+_ADVISOR_ATTACKERS = (_build_advisor_attackers(Side.RED), _build_advisor_attackers(Side.BLACK))
+_ELEPHANT_ATTACKERS = (_build_elephant_attackers(Side.RED), _build_elephant_attackers(Side.BLACK))
+_PAWN_ATTACKERS = (_build_pawn_attackers(Side.RED), _build_pawn_attackers(Side.BLACK))
+
 
 def find_king(position: Position, side: Side) -> Coord:
     """Return the coordinate of ``side``'s king."""
 
+    square = position.king_square(side)
+    if square is not None:
+        return square
+    # Only reachable for hand-built boards that overwrote a tracked king.
     for coord, piece in position.board:
         if piece.type is PieceType.KING and piece.side is side:
             return coord
     raise ValueError(f"No king found for side {side}")
 
 
+def has_both_kings(position: Position) -> bool:
+    """Return ``True`` if both kings are on the board, as play requires."""
+
+    for side in Side:
+        try:
+            find_king(position, side)
+        except ValueError:
+            return False
+    return True
+
+
 def is_square_attacked(position: Position, by_side: Side, square: Coord) -> bool:
-    """Return ``True`` if any piece of ``by_side`` attacks ``square``."""
+    """Return ``True`` if any piece of ``by_side`` attacks ``square``.
 
-    for coord, piece in position.board:
-        if piece.side is not by_side:
-            continue
+    "Attack" means a pseudo-legal move of ``by_side`` could land on
+    ``square``, so an empty square is attacked by an unscreened cannon while an
+    occupied one needs a screen. A king of ``by_side`` with an open file to
+    ``square`` always counts as an attacker (the flying-general rule), even
+    when ``square`` holds one of its own pieces.
+    """
+
+    board = position.board
+    peek = board.peek
+    occupant = peek(square)
+    if occupant is not None and occupant.side is by_side:
+        return occupant.type is PieceType.KING or _king_faces(position, by_side, square)
+
+    x, y = square.x, square.y
+    index = y * 9 + x
+    side_index = 0 if by_side is Side.RED else 1
+    in_palace = 3 <= x <= 5 and (y <= 2 if side_index == 0 else y >= 7)
 
-        if piece.type is PieceType.KING and coord.x == square.x:
-            if _count_blockers(position.board, coord, square) == 0:
-                return True
+    for direction, ray in enumerate(_ATTACK_RAYS[index]):
+        screened = False
+        for distance, coord in enumerate(ray):
+            piece = peek(coord)
+            if piece is None:
+                continue
+            if screened:
+                if (
+                    occupant is not None
+                    and piece.side is by_side
+                    and piece.type is PieceType.CANNON
+                ):
+                    return True
+                break
+            if piece.side is by_side:
+                piece_type = piece.type
+                # A cannon reaches an empty square without a screen.
+                if piece_type is PieceType.ROOK or (
+                    piece_type is PieceType.CANNON and occupant is None
+                ):
+                    return True
+                # Directions 0 and 1 run along the file (flying general).
+                if piece_type is PieceType.KING and (
+                    direction < 2 or (in_palace and distance == 0)
+                ):
+                    return True
+            screened = True
 
-        if is_pseudo_legal_move(position, Move(coord, square)):
+    for horse_square, leg in _HORSE_ATTACKERS[index]:
+        piece = peek(horse_square)
+        if (
+            piece is not None
+            and piece.side is by_side
+            and piece.type is PieceType.HORSE
+            and peek(leg) is None
+        ):
+            return True
+
+    for coord in _ADVISOR_ATTACKERS[side_index][index]:
+        piece = peek(coord)
+        if piece is not None and piece.side is by_side and piece.type is PieceType.ADVISOR:
+            return True
+
+    for coord, eye in _ELEPHANT_ATTACKERS[side_index][index]:
+        piece = peek(coord)
+        if (
+            piece is not None
+            and piece.side is by_side
+            and piece.type is PieceType.ELEPHANT
+            and peek(eye) is None
+        ):
+            return True
+
+    for coord in _PAWN_ATTACKERS[side_index][index]:
+        piece = peek(coord)
+        if piece is not None and piece.side is by_side and piece.type is PieceType.PAWN:
             return True
 
     return False
@@ -45,3 +208,109 @@ def is_in_check(position: Position, side: Side) -> bool:
 
     king_square = find_king(position, side)
     return is_square_attacked(position, side.opponent(), king_square)
+
+
+def _king_faces(position: Position, side: Side, square: Coord) -> bool:
+    """Return ``True`` if ``side``'s king sees ``square`` along an open file."""
+
+    king = position.king_square(side)
+    if king is None or king.x != square.x:
+        return False
+    step = 1 if square.y > king.y else -1
+    return all(
+        position.board.peek(Coord.at(square.x, y)) is None
+        for y in range(king.y + step, square.y, step)
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class CheckInfo:
+    """King-safety summary for one side, used to skip redundant legality tests.
+
+    ``risky_from`` holds the square indexes of pieces that may be pinned: the
+    first or second piece on a king ray with an enemy rook, king or cannon
+    behind it, and horse-leg squares next to the king with an enemy horse on
+    the matching jump square. ``risky_to`` holds the empty squares between the
+    king and an enemy cannon, where a piece would become the cannon's screen.
+    """
+
+    king: Coord
+    in_check: bool
+    risky_from: FrozenSet[int]
+    risky_to: FrozenSet[int]
+
+    def needs_verification(self, move: Move) -> bool:
+        """Return ``True`` unless ``move`` provably keeps the king safe."""
+
+        frm = move.frm
+        to = move.to
+        return (
+            self.in_check
+            or frm is self.king
+            or frm.y * 9 + frm.x in self.risky_from
+            or to.y * 9 + to.x in self.risky_to
+        )
+
+
+def check_info(position: Position, side: Side) -> CheckInfo:
+    """Analyze which of ``side``'s moves could leave its king attacked.
+
+    A move not flagged by :meth:`CheckInfo.needs_verification` neither moves
+    the king nor opens or closes a line onto it, so it cannot expose the king
+    when ``side`` is not already in check.
+    """
+
+    king = find_king(position, side)
+    king = _COORDS[king.y * 9 + king.x]
+    in_check = is_in_check(position, side)
+    if in_check:
+        return CheckInfo(king, True, frozenset(), frozenset())
+
+    peek = position.board.peek
+    index = king.y * 9 + king.x
+    risky_from: List[int] = []
+    risky_to: List[int] = []
+
+    for ray in _ATTACK_RAYS[index]:
+        # The first three pieces along the ray decide every line attack.
+        found: List[Tuple[int, Piece]] = []
+        empty: List[int] = []
+        for coord in ray:
+            piece = peek(coord)
+            if piece is None:
+                if not found:
+                    empty.append(coord.y * 9 + coord.x)
+                continue
+            found.append((coord.y * 9 + coord.x, piece))
+            if len(found) == 3:
+                break
+        if not found:
+            continue
+        first_square, first = found[0]
+        if first.side is not side and first.type is PieceType.CANNON:
+            risky_to.extend(empty)
+        if len(found) < 2:
+            continue
+        second_square, second = found[1]
+        # Vacating the first piece lets a rook or king behind it through.
+        if (
+            first.side is side
+            and second.side is not side
+            and (second.type is PieceType.ROOK or second.type is PieceType.KING)
+        ):
+            risky_from.append(first_square)
+        # Vacating either of two screens leaves the cannon behind them one.
+        if len(found) == 3:
+            third = found[2][1]
+            if third.side is not side and third.type is PieceType.CANNON:
+                if first.side is side:
+                    risky_from.append(first_square)
+                if second.side is side:
+                    risky_from.append(second_square)
+
+    for horse_square, leg in _HORSE_ATTACKERS[index]:
+        piece = peek(horse_square)
+        if piece is not None and piece.side is not side and piece.type is PieceType.HORSE:
+            risky_from.append(leg.y * 9 + leg.x)
+
+    return CheckInfo(king, False, frozenset(risky_from), frozenset(risky_to))
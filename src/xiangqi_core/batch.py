@@ -0,0 +1,248 @@
+"""Parallel replay and validation of game archives.
+
+Games are replayed through :meth:`Game.apply_move` in worker processes. The
+parent sends each chunk of games as compact tuples (start FEN and the moves
+packed into a ``bytes`` string of 16-bit codes) instead of pickled boards,
+and gets back one small tuple per game. Only a bounded number of chunks is in
+flight at a time, so archives larger than memory stream straight through. A
+game that cannot be parsed, or whose ``FEN`` header is malformed or lacks a
+king, is reported as an unparsed outcome and the run moves on to the next
+game.
+
+Command line::
+
+    python -m xiangqi_core.batch archive.pgn --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from xiangqi_core.attack import has_both_kings
+from xiangqi_core.board import BACKENDS, Position, initial_position
+from xiangqi_core.errors import XiangqiError
+from xiangqi_core.game import Game, GameResult, Termination
+from xiangqi_core.move import decode_moves, encode_moves
+from xiangqi_core.pgn import RESULT_TOKENS, GameRecord, iter_records
+
+DEFAULT_CHUNK_SIZE = 64
+
+# (index, start FEN or None, packed move codes, declared result token, parse error)
+_Job = Tuple[int, Optional[str], bytes, str, Optional[str]]
+# (index, plies replayed, illegal ply or None, error, result, termination, declared)
+_Outcome = Tuple[int, int, Optional[int], Optional[str], str, Optional[str], str]
+
+
+@dataclass(frozen=True)
+class GameOutcome:
+    """The result of replaying one game of an archive."""
+
+    index: int
+    plies: int
+    illegal_ply: Optional[int]
+    error: Optional[str]
+    result: GameResult
+    termination: Optional[Termination]
+    declared_result: str
+    parsed: bool = True
+
+    @property
+    def valid(self) -> bool:
+        """``True`` if the game was parsed and every move of it was legal."""
+
+        return self.parsed and self.illegal_ply is None
+
+    @property
+    def result_matches(self) -> bool:
+        """``True`` if the declared result agrees with the replayed one.
+
+        A declared ``*`` or an unfinished replay (resignation, adjudication)
+        is never counted as a mismatch.
+        """
+
+        declared = RESULT_TOKENS.get(self.declared_result, GameResult.ONGOING)
+        if declared is GameResult.ONGOING or self.result is GameResult.ONGOING:
+            return True
+        return declared is self.result
+
+
+def _job(index: int, record: GameRecord) -> _Job:
+    fen = record.headers.get("FEN")
+    return index, fen, encode_moves(record.moves).tobytes(), record.result, record.error
+
+
+def _replay(job: _Job, backend: Optional[str]) -> _Outcome:
+    index, fen, data, declared, parse_error = job
+    if parse_error is not None:
+        return index, 0, None, parse_error, GameResult.ONGOING.value, None, declared
+    try:
+        position = Position.from_fen(fen, backend=backend) if fen else initial_position(backend)
+    except XiangqiError as exc:
+        return index, 0, None, str(exc), GameResult.ONGOING.value, None, declared
+    if not has_both_kings(position):
+        return index, 0, None, "FEN must place both kings", GameResult.ONGOING.value, None, declared
+    game = Game(position=position, keyframe_interval=0)
+    codes = array("H")
+    codes.frombytes(data)
+    moves = decode_moves(codes)
+    for ply, move in enumerate(moves, start=1):
+        try:
+            game.apply_move(move)
+        except XiangqiError as exc:
+            return index, ply - 1, ply, str(exc), game.result.value, _value(game.termination), declared
+    return index, len(moves), None, None, game.result.value, _value(game.termination), declared
+
+
+def _value(termination: Optional[Termination]) -> Optional[str]:
+    return termination.value if termination is not None else None
+
+
+def _replay_chunk(jobs: List[_Job], backend: Optional[str]) -> List[_Outcome]:
+    """Worker entry point: replay every game of a chunk."""
+
+    return [_replay(job, backend) for job in jobs]
+
+
+def _outcome(raw: _Outcome) -> GameOutcome:
+    index, plies, illegal_ply, error, result, termination, declared = raw
+    # Only an unparsed game carries an error without an illegal ply.
+    return GameOutcome(
+        index=index,
+        plies=plies,
+        illegal_ply=illegal_ply,
+        error=error,
+        result=GameResult(result),
+        termination=Termination(termination) if termination is not None else None,
+        declared_result=declared,
+        parsed=error is None or illegal_ply is not None,
+    )
+
+
+def _chunks(records: Iterable[GameRecord], chunk_size: int) -> Iterator[List[_Job]]:
+    chunk: List[_Job] = []
+    for index, record in enumerate(records):
+        chunk.append(_job(index, record))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validate_games(
+    records: Iterable[GameRecord],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    backend: Optional[str] = None,
+) -> Iterator[GameOutcome]:
+    """Replay ``records`` and yield a :class:`GameOutcome` per game, in order.
+
+    ``workers`` defaults to the number of CPUs; with a single worker games
+    are replayed in the calling process without a pool. At most two chunks
+    per worker are queued at once.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in _chunks(records, chunk_size):
+            for raw in _replay_chunk(chunk, backend):
+                yield _outcome(raw)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        window = 2 * workers
+        pending: Deque[Future] = deque()
+        for chunk in _chunks(records, chunk_size):
+            pending.append(executor.submit(_replay_chunk, chunk, backend))
+            if len(pending) >= window:
+                for raw in pending.popleft().result():
+                    yield _outcome(raw)
+        while pending:
+            for raw in pending.popleft().result():
+                yield _outcome(raw)
+
+
+def summarize(outcomes: Iterable[GameOutcome]) -> Dict[str, Any]:
+    """Aggregate outcomes into JSON-ready counts."""
+
+    summary: Dict[str, Any] = {
+        "games": 0,
+        "plies": 0,
+        "valid": 0,
+        "illegal": 0,
+        "unparsed": 0,
+        "result_mismatches": 0,
+        "results": {result.value: 0 for result in GameResult},
+    }
+    for outcome in outcomes:
+        summary["games"] += 1
+        summary["plies"] += outcome.plies
+        if not outcome.parsed:
+            summary["unparsed"] += 1
+        else:
+            summary["valid" if outcome.valid else "illegal"] += 1
+        summary["results"][outcome.result.value] += 1
+        if not outcome.result_matches:
+            summary["result_mismatches"] += 1
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m xiangqi_core.batch",
+        description="Replay a PGN-style archive in parallel and report illegal games.",
+    )
+    parser.add_argument("paths", nargs="+", help="game record files")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--backend", choices=BACKENDS, default=None)
+    parser.add_argument("--indent", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    def records() -> Iterator[GameRecord]:
+        for path in args.paths:
+            with open(path, encoding="utf-8") as stream:
+                yield from iter_records(stream, strict=False)
+
+    problems: List[Dict[str, Any]] = []
+
+    def tracked(outcomes: Iterable[GameOutcome]) -> Iterator[GameOutcome]:
+        for outcome in outcomes:
+            if not outcome.valid or not outcome.result_matches:
+                problems.append(
+                    {
+                        "game": outcome.index + 1,
+                        "parsed": outcome.parsed,
+                        "illegal_ply": outcome.illegal_ply,
+                        "error": outcome.error,
+                        "result": outcome.result.value,
+                        "declared_result": outcome.declared_result,
+                    }
+                )
+            yield outcome
+
+    start = time.perf_counter()
+    report = summarize(
+        tracked(validate_games(records(), args.workers, args.chunk_size, args.backend))
+    )
+    elapsed = time.perf_counter() - start
+    report["seconds"] = round(elapsed, 6)
+    report["games_per_second"] = round(report["games"] / elapsed) if elapsed > 0 else None
+    report["problems"] = problems
+    print(json.dumps(report, indent=args.indent))
+    return 0 if not problems else 1
+
+
+if __name__ == "__main__":  # pragma: no cover - script entrypoint
+    sys.exit(main())
@@ -0,0 +1,539 @@
+"""Bitboard position representation on 90-bit Python integers.
+
+Bit ``y * 9 + x`` of a mask stands for square ``(x, y)``, the same index used
+everywhere else in the package. :class:`BitboardPosition` keeps one mask per
+piece code (side and piece type), a mask per side and the combined occupancy,
+next to a 90-cell mailbox used only to look up captured pieces.
+
+Geometry is precomputed per square:
+
+* ``RAYS[square][direction]`` for rook and cannon slides; the first blocker
+  on a ray is its lowest set bit going north or east and its highest going
+  south or west.
+* ``HORSE_TARGETS[square][legs]`` and ``ELEPHANT_TARGETS[side][square][eyes]``
+  indexed by the occupancy of the four leg or eye squares.
+* King, advisor and pawn step masks, plus palace, half-board, file and rank
+  masks.
+* ``*_ATTACKERS`` tables, the same geometry seen from the attacked square.
+
+Move generation and attack detection are then a handful of mask operations
+per piece instead of square-by-square probes. The representation is
+optional: convert with :meth:`BitboardPosition.from_position` and back with
+:meth:`BitboardPosition.to_position`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from xiangqi_core.board import Board, Position
+from xiangqi_core.coord import _COORDS
+from xiangqi_core.move import _MOVES, Move
+from xiangqi_core.piece import Piece, decode_piece, encode_piece
+from xiangqi_core.types import PieceType, Side
+
+FULL_MASK = (1 << 90) - 1
+
+# North and east rays run towards higher indices, south and west lower ones.
+_DIRECTIONS: Tuple[Tuple[int, int], ...] = ((0, 1), (1, 0), (0, -1), (-1, 0))
+# (leg, dx, dy): legs 0-3 are the squares north, east, south and west of the horse.
+_HORSE_STEPS: Tuple[Tuple[int, int, int], ...] = (
+    (0, 1, 2),
+    (0, -1, 2),
+    (1, 2, 1),
+    (1, 2, -1),
+    (2, 1, -2),
+    (2, -1, -2),
+    (3, -2, 1),
+    (3, -2, -1),
+)
+_DIAGONALS: Tuple[Tuple[int, int], ...] = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+_SIDES = (Side.RED, Side.BLACK)
+_CODES = {
+    (side, piece_type): encode_piece(Piece.of(side, piece_type))
+    for side in _SIDES
+    for piece_type in PieceType
+}
+_FIRST_BLACK_CODE = min(code for (side, _), code in _CODES.items() if side is Side.BLACK)
+
+
+def _bit(x: int, y: int) -> int:
+    return 1 << (y * 9 + x)
+
+
+def _on_board(x: int, y: int) -> bool:
+    return 0 <= x <= 8 and 0 <= y <= 9
+
+
+def _mask(squares: Iterable[Tuple[int, int]]) -> int:
+    mask = 0
+    for x, y in squares:
+        mask |= _bit(x, y)
+    return mask
+
+
+FILE_MASKS: Tuple[int, ...] = tuple(_mask((x, y) for y in range(10)) for x in range(9))
+RANK_MASKS: Tuple[int, ...] = tuple(_mask((x, y) for x in range(9)) for y in range(10))
+PALACE_MASKS: Tuple[int, int] = (
+    _mask((x, y) for x in range(3, 6) for y in range(0, 3)),
+    _mask((x, y) for x in range(3, 6) for y in range(7, 10)),
+)
+HALF_MASKS: Tuple[int, int] = (
+    _mask((x, y) for x in range(9) for y in range(0, 5)),
+    _mask((x, y) for x in range(9) for y in range(5, 10)),
+)
+"""Each side's own half of the board, up to the river."""
+
+
+def _build_rays() -> Tuple[Tuple[int, ...], ...]:
+    table = []
+    for index in range(90):
+        x0, y0 = index % 9, index // 9
+        rays = []
+        for dx, dy in _DIRECTIONS:
+            ray = 0
+            x, y = x0 + dx, y0 + dy
+            while _on_board(x, y):
+                ray |= _bit(x, y)
+                x += dx
+                y += dy
+            rays.append(ray)
+        table.append(tuple(rays))
+    return tuple(table)
+
+
+def _build_neighbours(offsets: Tuple[Tuple[int, int], ...]) -> Tuple[Tuple[int, ...], ...]:
+    """Square index of each offset neighbour, or -1 off the board."""
+
+    return tuple(
+        tuple(
+            (index // 9 + dy) * 9 + index % 9 + dx if _on_board(index % 9 + dx, index // 9 + dy) else -1
+            for dx, dy in offsets
+        )
+        for index in range(90)
+    )
+
+
+def _build_horse_targets() -> Tuple[Tuple[int, ...], ...]:
+    table = []
+    for index in range(90):
+        x0, y0 = index % 9, index // 9
+        by_legs = []
+        for legs in range(16):
+            mask = 0
+            for leg, dx, dy in _HORSE_STEPS:
+                if not legs >> leg & 1 and _on_board(x0 + dx, y0 + dy):
+                    mask |= _bit(x0 + dx, y0 + dy)
+            by_legs.append(mask)
+        table.append(tuple(by_legs))
+    return tuple(table)
+
+
+def _build_horse_attackers() -> Tuple[Tuple[int, ...], ...]:
+    """Squares a horse attacks ``index`` from, by occupancy of the diagonals."""
+
+    table = []
+    for index in range(90):
+        x0, y0 = index % 9, index // 9
+        by_diagonals = []
+        for diagonals in range(16):
+            mask = 0
+            for slot, (dx, dy) in enumerate(_DIAGONALS):
+                if diagonals >> slot & 1:
+                    continue
+                # The diagonal neighbour is the leg of the two horses beyond it.
+                for hx, hy in ((x0 + 2 * dx, y0 + dy), (x0 + dx, y0 + 2 * dy)):
+                    if _on_board(hx, hy):
+                        mask |= _bit(hx, hy)
+            by_diagonals.append(mask)
+        table.append(tuple(by_diagonals))
+    return tuple(table)
+
+
+def _build_elephant_targets(side_index: int) -> Tuple[Tuple[int, ...], ...]:
+    table = []
+    for index in range(90):
+        x0, y0 = index % 9, index // 9
+        by_eyes = []
+        for eyes in range(16):
+            mask = 0
+            for slot, (dx, dy) in enumerate(_DIAGONALS):
+                x, y = x0 + 2 * dx, y0 + 2 * dy
+                if not eyes >> slot & 1 and _on_board(x, y):
+                    mask |= _bit(x, y)
+            by_eyes.append(mask & HALF_MASKS[side_index])
+        table.append(tuple(by_eyes))
+    return tuple(table)
+
+
+def _build_steps(offsets: Tuple[Tuple[int, int], ...], allowed: int) -> Tuple[int, ...]:
+    return tuple(
+        _mask(
+            (index % 9 + dx, index // 9 + dy)
+            for dx, dy in offsets
+            if _on_board(index % 9 + dx, index // 9 + dy)
+        )
+        & allowed
+        for index in range(90)
+    )
+
+
+def _build_pawn_targets(side_index: int) -> Tuple[int, ...]:
+    forward = 1 if side_index == 0 else -1
+    table = []
+    for index in range(90):
+        x, y = index % 9, index // 9
+        steps = [(x, y + forward)]
+        if not HALF_MASKS[side_index] >> index & 1:
+            steps += [(x - 1, y), (x + 1, y)]
+        table.append(_mask((sx, sy) for sx, sy in steps if _on_board(sx, sy)))
+    return tuple(table)
+
+
+def _build_elephant_attackers(side_index: int) -> Tuple[Tuple[int, ...], ...]:
+    """Squares an elephant attacks ``index`` from, by occupancy of the eyes."""
+
+    table = []
+    for index in range(90):
+        x0, y0 = index % 9, index // 9
+        own_half = HALF_MASKS[side_index] >> index & 1
+        by_eyes = []
+        for eyes in range(16):
+            mask = 0
+            for slot, (dx, dy) in enumerate(_DIAGONALS):
+                x, y = x0 + 2 * dx, y0 + 2 * dy
+                if own_half and not eyes >> slot & 1 and _on_board(x, y):
+                    mask |= _bit(x, y)
+            by_eyes.append(mask)
+        table.append(tuple(by_eyes))
+    return tuple(table)
+
+
+def _reverse(targets: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Turn a from-square target table into a to-square attacker table."""
+
+    return tuple(
+        sum(1 << frm for frm in range(90) if targets[frm] >> index & 1) for index in range(90)
+    )
+
+
+RAYS = _build_rays()
+HORSE_TARGETS = _build_horse_targets()
+HORSE_ATTACKERS = _build_horse_attackers()
+ELEPHANT_TARGETS = (_build_elephant_targets(0), _build_elephant_targets(1))
+KING_TARGETS = tuple(_build_steps(_DIRECTIONS, palace) for palace in PALACE_MASKS)
+ADVISOR_TARGETS = tuple(_build_steps(_DIAGONALS, palace) for palace in PALACE_MASKS)
+PAWN_TARGETS = (_build_pawn_targets(0), _build_pawn_targets(1))
+ELEPHANT_ATTACKERS = (_build_elephant_attackers(0), _build_elephant_attackers(1))
+KING_ATTACKERS = tuple(_reverse(targets) for targets in KING_TARGETS)
+ADVISOR_ATTACKERS = tuple(_reverse(targets) for targets in ADVISOR_TARGETS)
+PAWN_ATTACKERS = tuple(_reverse(targets) for targets in PAWN_TARGETS)
+_LEGS = _build_neighbours(_DIRECTIONS)
+_LINES = tuple(rays[0] | rays[1] | rays[2] | rays[3] for rays in RAYS)
+_EYES = _build_neighbours(_DIAGONALS)
+
+
+def _first_blocker(blockers: int, direction: int) -> int:
+    if direction < 2:
+        return (blockers & -blockers).bit_length() - 1
+    return blockers.bit_length() - 1
+
+
+def _occupancy(occupied: int, squares: Tuple[int, ...]) -> int:
+    bits = 0
+    for slot, square in enumerate(squares):
+        if square >= 0 and occupied >> square & 1:
+            bits |= 1 << slot
+    return bits
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    """Squares a rook on ``square`` reaches, up to and including blockers."""
+
+    attacks = 0
+    rays = RAYS[square]
+    for direction in range(4):
+        ray = rays[direction]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= RAYS[_first_blocker(blockers, direction)][direction]
+        attacks |= ray
+    return attacks
+
+
+def cannon_attacks(square: int, occupied: int) -> int:
+    """Empty squares before a screen plus the first piece behind each screen."""
+
+    attacks = 0
+    rays = RAYS[square]
+    for direction in range(4):
+        ray = rays[direction]
+        blockers = ray & occupied
+        if not blockers:
+            attacks |= ray
+            continue
+        screen = _first_blocker(blockers, direction)
+        beyond = RAYS[screen][direction]
+        attacks |= ray ^ beyond ^ (1 << screen)
+        targets = beyond & occupied
+        if targets:
+            attacks |= 1 << _first_blocker(targets, direction)
+    return attacks
+
+
+def horse_attacks(square: int, occupied: int) -> int:
+    return HORSE_TARGETS[square][_occupancy(occupied, _LEGS[square])]
+
+
+def elephant_attacks(square: int, occupied: int, side_index: int) -> int:
+    return ELEPHANT_TARGETS[side_index][square][_occupancy(occupied, _EYES[square])]
+
+
+def _squares(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+@dataclass(frozen=True, slots=True)
+class BitboardUndo:
+    """State needed to take back a move made on a :class:`BitboardPosition`."""
+
+    move: Move
+    captured: int
+    side_to_move: Side
+
+
+class BitboardPosition:
+    """Pieces as 90-bit masks, indexed by the codes of :func:`encode_piece`."""
+
+    def __init__(self, side_to_move: Side = Side.RED) -> None:
+        self.pieces: List[int] = [0] * 15
+        self.sides: List[int] = [0, 0]
+        self.occupied = 0
+        self.cells = bytearray(90)
+        self.side_to_move = side_to_move
+
+    @classmethod
+    def from_position(cls, position: Position) -> "BitboardPosition":
+        bitboard = cls(position.side_to_move)
+        for coord, piece in position.board:
+            bitboard.place(coord.y * 9 + coord.x, piece)
+        return bitboard
+
+    def to_position(self, backend: Optional[str] = None) -> Position:
+        board = Board(backend=backend)
+        board._load_unchecked(
+            (_COORDS[index], decode_piece(code))  # type: ignore[misc]
+            for index, code in enumerate(self.cells)
+            if code
+        )
+        return Position(board, self.side_to_move)
+
+    def place(self, square: int, piece: Piece) -> None:
+        """Put ``piece`` on an empty ``square``."""
+
+        code = encode_piece(piece)
+        bit = 1 << square
+        self.pieces[code] |= bit
+        self.sides[0 if piece.side is Side.RED else 1] |= bit
+        self.occupied |= bit
+        self.cells[square] = code
+
+    def piece_at(self, square: int) -> Optional[Piece]:
+        return decode_piece(self.cells[square])
+
+    def king_square(self, side: Side) -> int:
+        return self.pieces[_CODES[side, PieceType.KING]].bit_length() - 1
+
+    def make_move(self, move: Move) -> BitboardUndo:
+        code = move.code
+        undo = BitboardUndo(move, self._make(code >> 7, code & 0x7F), self.side_to_move)
+        self.side_to_move = self.side_to_move.opponent()
+        return undo
+
+    def unmake_move(self, undo: BitboardUndo) -> None:
+        code = undo.move.code
+        self._unmake(code >> 7, code & 0x7F, undo.captured)
+        self.side_to_move = undo.side_to_move
+
+    def _make(self, frm: int, to: int) -> int:
+        """Move the piece on ``frm`` to ``to`` and return the captured code."""
+
+        cells = self.cells
+        moving = cells[frm]
+        captured = cells[to]
+        side_index = 0 if moving < _FIRST_BLACK_CODE else 1
+        change = (1 << frm) | (1 << to)
+        self.pieces[moving] ^= change
+        self.sides[side_index] ^= change
+        if captured:
+            self.pieces[captured] ^= 1 << to
+            self.sides[1 - side_index] ^= 1 << to
+            self.occupied ^= 1 << frm
+        else:
+            self.occupied ^= change
+        cells[to] = moving
+        cells[frm] = 0
+        return captured
+
+    def _unmake(self, frm: int, to: int, captured: int) -> None:
+        cells = self.cells
+        moving = cells[to]
+        side_index = 0 if moving < _FIRST_BLACK_CODE else 1
+        change = (1 << frm) | (1 << to)
+        self.pieces[moving] ^= change
+        self.sides[side_index] ^= change
+        if captured:
+            self.pieces[captured] ^= 1 << to
+            self.sides[1 - side_index] ^= 1 << to
+            self.occupied ^= 1 << frm
+        else:
+            self.occupied ^= change
+        cells[frm] = moving
+        cells[to] = captured
+
+    def _target_masks(self, side: Side) -> List[Tuple[int, int]]:
+        """``(from square, target mask)`` for every piece of ``side``."""
+
+        side_index = 0 if side is Side.RED else 1
+        pieces = self.pieces
+        occupied = self.occupied
+        free = FULL_MASK ^ self.sides[side_index]
+        targets: List[Tuple[int, int]] = []
+        for frm in _squares(pieces[_CODES[side, PieceType.ROOK]]):
+            targets.append((frm, rook_attacks(frm, occupied) & free))
+        for frm in _squares(pieces[_CODES[side, PieceType.CANNON]]):
+            targets.append((frm, cannon_attacks(frm, occupied) & free))
+        for frm in _squares(pieces[_CODES[side, PieceType.HORSE]]):
+            targets.append((frm, horse_attacks(frm, occupied) & free))
+        for frm in _squares(pieces[_CODES[side, PieceType.ELEPHANT]]):
+            targets.append((frm, elephant_attacks(frm, occupied, side_index) & free))
+        for frm in _squares(pieces[_CODES[side, PieceType.ADVISOR]]):
+            targets.append((frm, ADVISOR_TARGETS[side_index][frm] & free))
+        for frm in _squares(pieces[_CODES[side, PieceType.KING]]):
+            targets.append((frm, KING_TARGETS[side_index][frm] & free))
+        for frm in _squares(pieces[_CODES[side, PieceType.PAWN]]):
+            targets.append((frm, PAWN_TARGETS[side_index][frm] & free))
+        return targets
+
+    def generate_pseudo_legal_moves(self, side: Side) -> List[Move]:
+        """Same move set as :func:`xiangqi_core.movegen.generate_pseudo_legal_moves`."""
+
+        moves: List[Move] = []
+        for frm, targets in self._target_masks(side):
+            base = frm * 90
+            while targets:
+                low = targets & -targets
+                moves.append(_MOVES[base + low.bit_length() - 1])  # type: ignore[arg-type]
+                targets ^= low
+        return moves
+
+    def is_square_attacked(self, by_side: Side, square: int) -> bool:
+        """``True`` if a move of ``by_side`` could land on ``square``.
+
+        ``square`` should be empty or hold a piece of the other side; a king
+        with an open file to ``square`` counts as attacking it.
+        """
+
+        by = 0 if by_side is Side.RED else 1
+        pieces = self.pieces
+        occupied = self.occupied
+        bit = 1 << square
+
+        rooks = pieces[_CODES[by_side, PieceType.ROOK]]
+        cannons = pieces[_CODES[by_side, PieceType.CANNON]]
+        king = pieces[_CODES[by_side, PieceType.KING]]
+        if _LINES[square] & (rooks | cannons | king):
+            empty = not occupied & bit
+            north, east, south, west = RAYS[square]
+            for direction, ray in ((0, north), (1, east), (2, south), (3, west)):
+                blockers = ray & occupied
+                if not blockers:
+                    continue
+                if direction < 2:
+                    first = (blockers & -blockers).bit_length() - 1
+                else:
+                    first = blockers.bit_length() - 1
+                sliders = rooks | king if direction % 2 == 0 else rooks
+                if empty:
+                    sliders |= cannons
+                if sliders >> first & 1:
+                    return True
+                if not empty and cannons:
+                    beyond = RAYS[first][direction] & occupied
+                    if beyond and cannons >> _first_blocker(beyond, direction) & 1:
+                        return True
+
+        horses = pieces[_CODES[by_side, PieceType.HORSE]]
+        if horses and HORSE_ATTACKERS[square][_occupancy(occupied, _EYES[square])] & horses:
+            return True
+        if PALACE_MASKS[by] & bit:
+            if KING_ATTACKERS[by][square] & king:
+                return True
+            if ADVISOR_ATTACKERS[by][square] & pieces[_CODES[by_side, PieceType.ADVISOR]]:
+                return True
+        elephants = pieces[_CODES[by_side, PieceType.ELEPHANT]]
+        if elephants and (
+            ELEPHANT_ATTACKERS[by][square][_occupancy(occupied, _EYES[square])] & elephants
+        ):
+            return True
+        return bool(PAWN_ATTACKERS[by][square] & pieces[_CODES[by_side, PieceType.PAWN]])
+
+    def is_in_check(self, side: Side) -> bool:
+        return self.is_square_attacked(side.opponent(), self.king_square(side))
+
+    def generate_legal_moves(self, side: Side) -> List[Move]:
+        """Pseudo-legal moves that do not leave ``side``'s king attacked.
+
+        Outside check only moves of the king, moves from or onto a king ray
+        that holds an enemy rook, cannon or king (pins, flying general, new
+        cannon screens) and moves from a square diagonally next to the king
+        (horse legs) are verified.
+        """
+
+        opponent = side.opponent()
+        king_code = _CODES[side, PieceType.KING]
+        king = self.pieces[king_code].bit_length() - 1
+        if self.is_square_attacked(opponent, king):
+            risky_from = risky_to = FULL_MASK
+        else:
+            pieces = self.pieces
+            sliders = pieces[_CODES[opponent, PieceType.ROOK]] | pieces[
+                _CODES[opponent, PieceType.CANNON]
+            ]
+            facing = sliders | pieces[_CODES[opponent, PieceType.KING]]
+            rays = RAYS[king]
+            risky_to = 0
+            for direction in range(4):
+                if rays[direction] & (facing if direction % 2 == 0 else sliders):
+                    risky_to |= rays[direction]
+            risky_from = risky_to | (1 << king)
+            for square in _EYES[king]:
+                if square >= 0:
+                    risky_from |= 1 << square
+
+        legal: List[Move] = []
+        for frm, targets in self._target_masks(side):
+            base = frm * 90
+            if risky_from >> frm & 1:
+                check = targets
+            else:
+                check = targets & risky_to
+            safe = targets ^ check
+            while safe:
+                low = safe & -safe
+                legal.append(_MOVES[base + low.bit_length() - 1])  # type: ignore[arg-type]
+                safe ^= low
+            while check:
+                low = check & -check
+                to = low.bit_length() - 1
+                check ^= low
+                captured = self._make(frm, to)
+                if not self.is_square_attacked(opponent, self.pieces[king_code].bit_length() - 1):
+                    legal.append(_MOVES[base + to])  # type: ignore[arg-type]
+                self._unmake(frm, to, captured)
+        return legal
@@ -5,22 +5,69 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, Iterable, Iterator, Mapping, Optional, Tuple
 
-from xiangqi_core.coord import Coord
+from xiangqi_core import zobrist
+from xiangqi_core.coord import Coord, _COORDS
 from xiangqi_core.errors import IllegalMoveError
+from xiangqi_core.eval import PIECE_SQUARE_SCORES
 from xiangqi_core.move import Move
-from xiangqi_core.piece import Piece
+from xiangqi_core.piece import Piece, decode_piece, encode_piece
 from xiangqi_core.types import PieceType, Side
+from xiangqi_core.zobrist import PIECE_SQUARE_KEYS, SIDE_KEY
+
+BACKENDS: Tuple[str, ...] = ("dict", "array")
+_default_backend = "dict"
+
+_KING_CODES: Dict[int, Side] = {
+    encode_piece(Piece.of(side, PieceType.KING)): side for side in (Side.RED, Side.BLACK)
+}
+
+
+def set_default_backend(backend: str) -> None:
+    """Select the storage used by ``Board()`` when no backend is given."""
+
+    global _default_backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown board backend: {backend}")
+    _default_backend = backend
+
+
+def get_default_backend() -> str:
+    """Return the storage used by ``Board()`` when no backend is given."""
+
+    return _default_backend
 
 
 class Board:
-    """Sparse board representation backed by a dictionary."""
+    """Sparse board representation backed by a dictionary.
+
+    Passing ``backend="array"`` (or selecting it with
+    :func:`set_default_backend`) constructs an :class:`ArrayBoard` instead,
+    which exposes the same API on top of a flat 90-square array.
+    """
 
-    def __init__(self, pieces: Optional[Mapping[Coord, Piece]] = None) -> None:
+    backend = "dict"
+
+    def __new__(
+        cls, pieces: Optional[Mapping[Coord, Piece]] = None, *, backend: Optional[str] = None
+    ) -> "Board":
+        if cls is Board:
+            selected = backend or _default_backend
+            if selected == "array":
+                cls = ArrayBoard
+            elif selected != "dict":
+                raise ValueError(f"Unknown board backend: {selected}")
+        return super().__new__(cls)
+
+    def __init__(
+        self, pieces: Optional[Mapping[Coord, Piece]] = None, *, backend: Optional[str] = None
+    ) -> None:
         self._grid: Dict[Coord, Piece] = {}
+        self._key = 0
+        self._score = 0
+        self._kings: Dict[Side, Coord] = {}
         if pieces:
             for coord, piece in pieces.items():
-                self._validate_coord(coord)
-                self._grid[coord] = piece
+                self.place(coord, piece)
 
     def __len__(self) -> int:  # pragma: no cover - trivial
         return len(self._grid)
@@ -35,23 +82,71 @@ class Board:
         if not coord.in_bounds():
             raise ValueError(f"Coordinate out of bounds: {coord}")
 
+    @property
+    def zobrist_key(self) -> int:
+        """Zobrist key of the pieces on the board, maintained incrementally."""
+
+        return self._key
+
+    @property
+    def psq_score(self) -> int:
+        """Material plus piece-square score from Red's view, maintained incrementally."""
+
+        return self._score
+
+    def king_square(self, side: Side) -> Optional[Coord]:
+        """Return the tracked square of ``side``'s king, if it is on the board."""
+
+        return self._kings.get(side)
+
+    def _track_removed(self, coord: Coord, piece: Piece) -> None:
+        if piece.type is PieceType.KING and self._kings.get(piece.side) == coord:
+            del self._kings[piece.side]
+
+    def _track_added(self, coord: Coord, piece: Piece) -> None:
+        if piece.type is PieceType.KING:
+            self._kings[piece.side] = coord
+
     def get(self, coord: Coord) -> Optional[Piece]:
         """Return the piece at ``coord`` or ``None`` if empty."""
 
         self._validate_coord(coord)
         return self._grid.get(coord)
 
+    def peek(self, coord: Coord) -> Optional[Piece]:
+        """Return the piece at ``coord`` without validating the coordinate.
+
+        Intended for move generation and rule checks that only ever produce
+        on-board coordinates.
+        """
+
+        return self._grid.get(coord)
+
     def place(self, coord: Coord, piece: Piece) -> None:
         """Place ``piece`` on ``coord`` (overwriting any existing piece)."""
 
         self._validate_coord(coord)
+        index = coord.index
+        previous = self._grid.get(coord)
+        if previous is not None:
+            self._key ^= PIECE_SQUARE_KEYS[encode_piece(previous)][index]
+            self._score -= PIECE_SQUARE_SCORES[encode_piece(previous)][index]
+            self._track_removed(coord, previous)
         self._grid[coord] = piece
+        self._key ^= PIECE_SQUARE_KEYS[encode_piece(piece)][index]
+        self._score += PIECE_SQUARE_SCORES[encode_piece(piece)][index]
+        self._track_added(coord, piece)
 
     def remove(self, coord: Coord) -> Optional[Piece]:
         """Remove and return the piece at ``coord`` if present."""
 
         self._validate_coord(coord)
-        return self._grid.pop(coord, None)
+        piece = self._grid.pop(coord, None)
+        if piece is not None:
+            self._key ^= PIECE_SQUARE_KEYS[encode_piece(piece)][coord.index]
+            self._score -= PIECE_SQUARE_SCORES[encode_piece(piece)][coord.index]
+            self._track_removed(coord, piece)
+        return piece
 
     def move_piece(self, move: Move) -> Optional[Piece]:
         """Execute ``move`` on the board and return any captured piece."""
@@ -64,22 +159,307 @@ class Board:
         captured = self._grid.get(move.to)
         self._grid.pop(move.frm)
         self._grid[move.to] = piece
+        code = encode_piece(piece)
+        frm_index, to_index = move.frm.index, move.to.index
+        keys = PIECE_SQUARE_KEYS[code]
+        self._key ^= keys[frm_index] ^ keys[to_index]
+        scores = PIECE_SQUARE_SCORES[code]
+        self._score += scores[to_index] - scores[frm_index]
+        if piece.type is PieceType.KING:
+            self._kings[piece.side] = move.to
+        if captured is not None:
+            captured_code = encode_piece(captured)
+            self._key ^= PIECE_SQUARE_KEYS[captured_code][to_index]
+            self._score -= PIECE_SQUARE_SCORES[captured_code][to_index]
+            self._track_removed(move.to, captured)
         return captured
 
+    def unmove_piece(self, move: Move, captured: Optional[Piece]) -> None:
+        """Revert ``move`` (previously executed by :meth:`move_piece`).
+
+        ``captured`` is the piece returned by :meth:`move_piece` and is put
+        back on the destination square.
+        """
+
+        piece = self._grid.pop(move.to, None)
+        if piece is None:
+            raise IllegalMoveError(f"No piece at destination square {move.to}")
+        self._grid[move.frm] = piece
+        code = encode_piece(piece)
+        frm_index, to_index = move.frm.index, move.to.index
+        keys = PIECE_SQUARE_KEYS[code]
+        self._key ^= keys[frm_index] ^ keys[to_index]
+        scores = PIECE_SQUARE_SCORES[code]
+        self._score += scores[frm_index] - scores[to_index]
+        if piece.type is PieceType.KING:
+            self._kings[piece.side] = move.frm
+        if captured is not None:
+            self._grid[move.to] = captured
+            captured_code = encode_piece(captured)
+            self._key ^= PIECE_SQUARE_KEYS[captured_code][to_index]
+            self._score += PIECE_SQUARE_SCORES[captured_code][to_index]
+            self._track_added(move.to, captured)
+
     def items(self) -> Iterable[Tuple[Coord, Piece]]:  # pragma: no cover
         return self._grid.items()
 
+    def _load_unchecked(self, pieces: Iterable[Tuple[Coord, Piece]]) -> None:
+        """Fill an empty board from trusted on-board squares (used by parsers)."""
+
+        grid = self._grid
+        key = self._key
+        score = self._score
+        for coord, piece in pieces:
+            grid[coord] = piece
+            code = encode_piece(piece)
+            index = coord.y * 9 + coord.x
+            key ^= PIECE_SQUARE_KEYS[code][index]
+            score += PIECE_SQUARE_SCORES[code][index]
+            if piece.type is PieceType.KING:
+                self._kings[piece.side] = coord
+        self._key = key
+        self._score = score
+
+
+class ArrayBoard(Board):
+    """Board backed by a flat ``bytearray`` of 90 squares.
+
+    Each cell holds the small-integer piece code from
+    :func:`xiangqi_core.piece.encode_piece`; iteration decodes the occupied
+    cells back into ``(Coord, Piece)`` pairs in square order.
+    """
+
+    backend = "array"
+
+    def __init__(
+        self, pieces: Optional[Mapping[Coord, Piece]] = None, *, backend: Optional[str] = None
+    ) -> None:
+        self._cells = bytearray(90)
+        self._count = 0
+        self._key = 0
+        self._score = 0
+        self._kings: Dict[Side, Coord] = {}
+        if pieces:
+            for coord, piece in pieces.items():
+                self.place(coord, piece)
+
+    def __len__(self) -> int:  # pragma: no cover - trivial
+        return self._count
+
+    def __iter__(self) -> Iterator[Tuple[Coord, Piece]]:
+        cells = self._cells
+        return (
+            (_COORDS[index], decode_piece(code))  # type: ignore[misc]
+            for index, code in enumerate(cells)
+            if code
+        )
+
+    def get(self, coord: Coord) -> Optional[Piece]:
+        """Return the piece at ``coord`` or ``None`` if empty."""
+
+        self._validate_coord(coord)
+        return decode_piece(self._cells[coord.y * 9 + coord.x])
+
+    def peek(self, coord: Coord) -> Optional[Piece]:
+        """Return the piece at ``coord`` without validating the coordinate."""
+
+        return decode_piece(self._cells[coord.y * 9 + coord.x])
+
+    def place(self, coord: Coord, piece: Piece) -> None:
+        """Place ``piece`` on ``coord`` (overwriting any existing piece)."""
+
+        self._validate_coord(coord)
+        index = coord.y * 9 + coord.x
+        previous = self._cells[index]
+        if previous:
+            self._key ^= PIECE_SQUARE_KEYS[previous][index]
+            self._score -= PIECE_SQUARE_SCORES[previous][index]
+            self._track_removed(coord, decode_piece(previous))  # type: ignore[arg-type]
+        else:
+            self._count += 1
+        code = encode_piece(piece)
+        self._cells[index] = code
+        self._key ^= PIECE_SQUARE_KEYS[code][index]
+        self._score += PIECE_SQUARE_SCORES[code][index]
+        self._track_added(coord, piece)
+
+    def remove(self, coord: Coord) -> Optional[Piece]:
+        """Remove and return the piece at ``coord`` if present."""
+
+        self._validate_coord(coord)
+        index = coord.y * 9 + coord.x
+        code = self._cells[index]
+        piece = decode_piece(code)
+        if piece is not None:
+            self._count -= 1
+            self._cells[index] = 0
+            self._key ^= PIECE_SQUARE_KEYS[code][index]
+            self._score -= PIECE_SQUARE_SCORES[code][index]
+            self._track_removed(coord, piece)
+        return piece
+
+    def move_piece(self, move: Move) -> Optional[Piece]:
+        """Execute ``move`` on the board and return any captured piece."""
+
+        self._validate_coord(move.frm)
+        self._validate_coord(move.to)
+        cells = self._cells
+        frm_index = move.frm.y * 9 + move.frm.x
+        to_index = move.to.y * 9 + move.to.x
+        code = cells[frm_index]
+        if not code:
+            raise IllegalMoveError(f"No piece at source square {move.frm}")
+        captured_code = cells[to_index]
+        captured = decode_piece(captured_code)
+        if captured is not None:
+            self._count -= 1
+            self._key ^= PIECE_SQUARE_KEYS[captured_code][to_index]
+            self._score -= PIECE_SQUARE_SCORES[captured_code][to_index]
+            self._track_removed(move.to, captured)
+        cells[frm_index] = 0
+        cells[to_index] = code
+        keys = PIECE_SQUARE_KEYS[code]
+        self._key ^= keys[frm_index] ^ keys[to_index]
+        scores = PIECE_SQUARE_SCORES[code]
+        self._score += scores[to_index] - scores[frm_index]
+        if code in _KING_CODES:
+            self._kings[_KING_CODES[code]] = move.to
+        return captured
+
+    def unmove_piece(self, move: Move, captured: Optional[Piece]) -> None:
+        """Revert ``move`` (previously executed by :meth:`move_piece`)."""
+
+        cells = self._cells
+        frm_index = move.frm.y * 9 + move.frm.x
+        to_index = move.to.y * 9 + move.to.x
+        code = cells[to_index]
+        if not code:
+            raise IllegalMoveError(f"No piece at destination square {move.to}")
+        captured_code = encode_piece(captured)
+        cells[frm_index] = code
+        cells[to_index] = captured_code
+        keys = PIECE_SQUARE_KEYS[code]
+        self._key ^= keys[frm_index] ^ keys[to_index]
+        scores = PIECE_SQUARE_SCORES[code]
+        self._score += scores[frm_index] - scores[to_index]
+        if code in _KING_CODES:
+            self._kings[_KING_CODES[code]] = move.frm
+        if captured is not None:
+            self._count += 1
+            self._key ^= PIECE_SQUARE_KEYS[captured_code][to_index]
+            self._score += PIECE_SQUARE_SCORES[captured_code][to_index]
+            self._track_added(move.to, captured)
+
+    def items(self) -> Iterable[Tuple[Coord, Piece]]:  # pragma: no cover
+        return iter(self)
+
+    def _load_unchecked(self, pieces: Iterable[Tuple[Coord, Piece]]) -> None:
+        """Fill an empty board from trusted on-board squares (used by parsers)."""
+
+        cells = self._cells
+        key = self._key
+        score = self._score
+        for coord, piece in pieces:
+            index = coord.y * 9 + coord.x
+            code = encode_piece(piece)
+            cells[index] = code
+            key ^= PIECE_SQUARE_KEYS[code][index]
+            score += PIECE_SQUARE_SCORES[code][index]
+            self._count += 1
+            if code in _KING_CODES:
+                self._kings[piece.side] = coord
+        self._key = key
+        self._score = score
+
+
+@dataclass(frozen=True, slots=True)
+class UndoInfo:
+    """State needed to take back a move made with :meth:`Position.make_move`."""
+
+    move: Move
+    captured: Optional[Piece]
+    side_to_move: Side
+    halfmove_clock: int
+    fullmove_number: int
+
 
 @dataclass
 class Position:
+    """Board, side to move and the FEN move counters.
+
+    ``halfmove_clock`` counts plies since the last capture and
+    ``fullmove_number`` starts at 1 and increments after each Black move.
+    """
+
     board: Board
     side_to_move: Side
+    halfmove_clock: int = 0
+    fullmove_number: int = 1
+
+    @classmethod
+    def from_fen(cls, fen: str, backend: Optional[str] = None) -> "Position":
+        """Parse a standard Xiangqi FEN string (see :mod:`xiangqi_core.fen`)."""
+
+        from xiangqi_core.fen import parse_fen  # local import: fen depends on board
+
+        return parse_fen(fen, backend=backend)
+
+    def to_fen(self) -> str:
+        """Serialize the position as a standard Xiangqi FEN string."""
+
+        from xiangqi_core.fen import format_fen  # local import: fen depends on board
+
+        return format_fen(self)
+
+    @property
+    def key(self) -> int:
+        """64-bit Zobrist key identifying the board and side to move."""
+
+        if self.side_to_move is Side.BLACK:
+            return self.board.zobrist_key ^ SIDE_KEY
+        return self.board.zobrist_key
+
+    def make_move(self, move: Move) -> UndoInfo:
+        """Play ``move`` in place and return the information needed to undo it.
+
+        No legality checks are performed beyond requiring a piece on the source
+        square; callers are expected to validate ``move`` first.
+        """
+
+        side = self.side_to_move
+        captured = self.board.move_piece(move)
+        undo = UndoInfo(move, captured, side, self.halfmove_clock, self.fullmove_number)
+        self.halfmove_clock = 0 if captured is not None else self.halfmove_clock + 1
+        if side is Side.BLACK:
+            self.fullmove_number += 1
+        self.side_to_move = side.opponent()
+        if zobrist.debug_verification_enabled():
+            zobrist.verify_key(self)
+        return undo
+
+    def unmake_move(self, undo: UndoInfo) -> None:
+        """Restore the position as it was before ``undo.move`` was made."""
+
+        self.board.unmove_piece(undo.move, undo.captured)
+        self.side_to_move = undo.side_to_move
+        self.halfmove_clock = undo.halfmove_clock
+        self.fullmove_number = undo.fullmove_number
+        if zobrist.debug_verification_enabled():
+            zobrist.verify_key(self)
+
+    def king_square(self, side: Side) -> Optional[Coord]:
+        """Return the square of ``side``'s king in O(1), or ``None`` if absent."""
+
+        return self.board.king_square(side)
+
 
+def initial_position(backend: Optional[str] = None) -> Position:
+    """Return the standard Xiangqi starting position.
 
-def initial_position() -> Position:
-    """Return the standard Xiangqi starting position."""
+    ``backend`` selects the board storage (see :data:`BACKENDS`).
+    """
 
-    board = Board()
+    board = Board(backend=backend)
 
     def _place_back_rank(side: Side, y: int) -> None:
         pieces = [
@@ -94,15 +474,15 @@ def initial_position() -> Position:
             PieceType.ROOK,
         ]
         for x, piece_type in enumerate(pieces):
-            board.place(Coord(x, y), Piece(side=side, type=piece_type))
+            board.place(Coord.at(x, y), Piece.of(side, piece_type))
 
     def _place_cannons(side: Side, y: int) -> None:
         for x in (1, 7):
-            board.place(Coord(x, y), Piece(side=side, type=PieceType.CANNON))
+            board.place(Coord.at(x, y), Piece.of(side, PieceType.CANNON))
 
     def _place_pawns(side: Side, y: int) -> None:
         for x in (0, 2, 4, 6, 8):
-            board.place(Coord(x, y), Piece(side=side, type=PieceType.PAWN))
+            board.place(Coord.at(x, y), Piece.of(side, PieceType.PAWN))
 
     _place_back_rank(Side.RED, 0)
     _place_cannons(Side.RED, 2)
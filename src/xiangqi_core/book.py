@@ -0,0 +1,233 @@
+"""Opening book compiled from game archives and read through ``mmap``.
+
+A book file is a 16-byte header followed by fixed-size little-endian records
+sorted by position key::
+
+    key: u64 | move code: u16 | weight: u32 | games: u32 | wins: u32 | draws: u32
+
+``key`` is ``Position.key`` before the move, the move uses the 16-bit code of
+:attr:`Move.code`, and ``wins``/``draws`` are counted for the side making the
+move. ``weight`` is the half-point score ``2 * wins + draws``. Within a key
+records are ordered by descending weight.
+
+:class:`OpeningBook` maps the file and binary-searches it in place, so a
+lookup reads a handful of records and never loads the book into memory.
+
+Command line::
+
+    python -m xiangqi_core.book build archive.pgn book.bin --max-ply 24
+    python -m xiangqi_core.book probe book.bin --fen "<FEN>"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import random
+import struct
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import DefaultDict, Dict, Iterable, List, Optional, Tuple
+
+from xiangqi_core.board import Position, initial_position
+from xiangqi_core.errors import XiangqiError
+from xiangqi_core.game import GameResult
+from xiangqi_core.move import Move
+from xiangqi_core.pgn import RESULT_TOKENS, GameRecord, iter_records
+from xiangqi_core.types import Side
+
+MAGIC = b"XQBOOK1\0"
+_HEADER = struct.Struct("<8sQ")
+_RECORD = struct.Struct("<QHIIII")
+_KEY = struct.Struct("<Q")
+
+DEFAULT_MAX_PLY = 30
+
+
+@dataclass(frozen=True)
+class BookEntry:
+    """A book move for one position with its statistics."""
+
+    move: Move
+    weight: int
+    games: int
+    wins: int
+    draws: int
+
+    @property
+    def losses(self) -> int:
+        """Games neither won nor drawn, unfinished ones included."""
+
+        return self.games - self.wins - self.draws
+
+    @property
+    def score(self) -> float:
+        """Average score for the side making the move (1 win, 0.5 draw)."""
+
+        return self.weight / (2 * self.games) if self.games else 0.0
+
+
+def build_book(
+    records: Iterable[GameRecord],
+    path: str,
+    max_ply: int = DEFAULT_MAX_PLY,
+    min_games: int = 1,
+) -> int:
+    """Compile the first ``max_ply`` plies of ``records`` into a book at ``path``.
+
+    Moves seen in fewer than ``min_games`` games are dropped. Replay stops at
+    the first move without a piece on its source square. Returns the number of
+    records written.
+    """
+
+    # (key, move code) -> [games, wins, draws]
+    stats: DefaultDict[Tuple[int, int], List[int]] = defaultdict(lambda: [0, 0, 0])
+    for record in records:
+        result = RESULT_TOKENS.get(record.result, GameResult.ONGOING)
+        position = record.start_position()
+        for move in record.moves[:max_ply]:
+            if position.board.peek(move.frm) is None:
+                break
+            side = position.side_to_move
+            entry = stats[(position.key, move.code)]
+            entry[0] += 1
+            if result is GameResult.DRAW:
+                entry[2] += 1
+            elif result is (GameResult.RED_WIN if side is Side.RED else GameResult.BLACK_WIN):
+                entry[1] += 1
+            position.make_move(move)
+
+    rows = [
+        (key, code, 2 * wins + draws, games, wins, draws)
+        for (key, code), (games, wins, draws) in stats.items()
+        if games >= min_games
+    ]
+    rows.sort(key=lambda row: (row[0], -row[2]))
+    with open(path, "wb") as stream:
+        stream.write(_HEADER.pack(MAGIC, len(rows)))
+        for row in rows:
+            stream.write(_RECORD.pack(*row))
+    return len(rows)
+
+
+class OpeningBook:
+    """Read-only view of a compiled book file through ``mmap``."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as stream:
+            try:
+                self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:  # empty file
+                raise XiangqiError(f"Not an opening book: {path}") from exc
+        if len(self._map) < _HEADER.size:
+            self._map.close()
+            raise XiangqiError(f"Not an opening book: {path}")
+        magic, count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or len(self._map) != _HEADER.size + count * _RECORD.size:
+            self._map.close()
+            raise XiangqiError(f"Not an opening book: {path}")
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    def lookup(self, key: int) -> List[BookEntry]:
+        """Return the entries stored for a position key, best first."""
+
+        data = self._map
+        size = _RECORD.size
+        base = _HEADER.size
+        unpack_key = _KEY.unpack_from
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if unpack_key(data, base + middle * size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        entries: List[BookEntry] = []
+        unpack = _RECORD.unpack_from
+        for index in range(low, self._count):
+            found, code, weight, games, wins, draws = unpack(data, base + index * size)
+            if found != key:
+                break
+            entries.append(BookEntry(Move.from_code(code), weight, games, wins, draws))
+        return entries
+
+    def moves(self, position: Position) -> List[BookEntry]:
+        """Return the book entries for ``position``, best first."""
+
+        return self.lookup(position.key)
+
+    def choose(
+        self, position: Position, rng: Optional[random.Random] = None
+    ) -> Optional[Move]:
+        """Pick a book move for ``position``, or ``None`` when out of book.
+
+        Without ``rng`` the highest-weighted move is returned; with one, moves
+        are drawn in proportion to their weight.
+        """
+
+        entries = self.moves(position)
+        if not entries:
+            return None
+        if rng is None or sum(entry.weight for entry in entries) == 0:
+            return entries[0].move
+        weights = [entry.weight for entry in entries]
+        return rng.choices([entry.move for entry in entries], weights)[0]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m xiangqi_core.book", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="compile game records into a book")
+    build.add_argument("archives", nargs="+")
+    build.add_argument("output")
+    build.add_argument("--max-ply", type=int, default=DEFAULT_MAX_PLY)
+    build.add_argument("--min-games", type=int, default=1)
+    probe = commands.add_parser("probe", help="list the book moves for a position")
+    probe.add_argument("book")
+    probe.add_argument("--fen", default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+
+        def records() -> Iterable[GameRecord]:
+            for archive in args.archives:
+                with open(archive, encoding="utf-8") as stream:
+                    yield from iter_records(stream)
+
+        count = build_book(records(), args.output, args.max_ply, args.min_games)
+        print(json.dumps({"output": args.output, "records": count}))
+        return 0
+
+    position = Position.from_fen(args.fen) if args.fen else initial_position()
+    with OpeningBook(args.book) as book:
+        entries: List[Dict[str, object]] = [
+            {
+                "move": entry.move.to_str(),
+                "weight": entry.weight,
+                "games": entry.games,
+                "score": round(entry.score, 3),
+            }
+            for entry in book.moves(position)
+        ]
+    print(json.dumps(entries, indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - script entrypoint
+    sys.exit(main())
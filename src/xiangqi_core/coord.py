@@ -33,6 +33,31 @@ class Coord:
 
         return 0 <= self.x <= 8 and 0 <= self.y <= 9
 
+    @property
+    def index(self) -> int:
+        """Return the row-major square index (``a0`` is 0, ``i9`` is 89)."""
+
+        return self.y * 9 + self.x
+
+    @classmethod
+    def at(cls, x: int, y: int) -> "Coord":
+        """Return the shared instance for ``(x, y)``.
+
+        On-board coordinates come from a precomputed table, so hot loops can
+        look squares up without allocating; off-board values fall back to a
+        fresh instance.
+        """
+
+        if 0 <= x <= 8 and 0 <= y <= 9:
+            return _COORDS[y * 9 + x]
+        return cls(x, y)
+
+    @classmethod
+    def from_index(cls, index: int) -> "Coord":
+        """Return the shared instance for a square index in ``0..89``."""
+
+        return _COORDS[index]
+
     @classmethod
     def from_str(cls, value: str) -> "Coord":
         """Parse a coordinate from a string like ``\"a0\"`` or ``\"i9\"``."""
@@ -49,7 +74,10 @@ class Coord:
             raise ParseCoordError(f"Invalid rank in coordinate: {value}")
         x = _FILE_TO_INDEX[file_char]
         y = int(rank_char)
-        coord = cls(x=x, y=y)
+        coord = cls.at(x, y)
         if not coord.in_bounds():
             raise ParseCoordError(f"Coordinate out of bounds: {value}")
         return coord
+
+
+_COORDS = tuple(Coord(index % 9, index // 9) for index in range(90))
@@ -13,6 +13,14 @@ class ParseMoveError(ValueError, XiangqiError):
     """Raised when a move string cannot be parsed."""
 
 
+class ParseFenError(ValueError, XiangqiError):
+    """Raised when a FEN string cannot be parsed."""
+
+
+class ParseGameError(ValueError, XiangqiError):
+    """Raised when a game record cannot be parsed or replayed."""
+
+
 class IllegalMoveError(ValueError, XiangqiError):
     """Raised when a move violates Xiangqi rules."""
 
@@ -0,0 +1,218 @@
+"""Static evaluation: material plus piece-square tables.
+
+``PIECE_SQUARE_SCORES[piece_code][square_index]`` holds the material value of
+a piece plus its square bonus, positive for Red and negative for Black.
+:class:`~xiangqi_core.board.Board` keeps the sum of these entries up to date
+as pieces are placed, removed and moved (the same way it maintains the
+Zobrist key), so :func:`evaluate` with its default options is a single
+attribute read.
+
+The mobility and king-safety terms are not incremental. They cost a move
+generation or a board scan per call and are off by default.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+from xiangqi_core.coord import Coord
+from xiangqi_core.piece import Piece, decode_piece, encode_piece
+from xiangqi_core.types import PieceType, Side
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from xiangqi_core.board import Position
+
+PIECE_VALUES: Dict[PieceType, int] = {
+    PieceType.KING: 0,
+    PieceType.ADVISOR: 120,
+    PieceType.ELEPHANT: 120,
+    PieceType.HORSE: 270,
+    PieceType.ROOK: 600,
+    PieceType.CANNON: 285,
+    PieceType.PAWN: 30,
+}
+
+# Square bonuses from Red's side, written as a board diagram: the first row is
+# rank 9 (Black's back rank) and the last is rank 0 (Red's back rank).
+_TABLES: Dict[PieceType, Tuple[Tuple[int, ...], ...]] = {
+    PieceType.KING: (
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, -15, -15, -15, 0, 0, 0),
+        (0, 0, 0, -8, -8, -8, 0, 0, 0),
+        (0, 0, 0, 1, 5, 1, 0, 0, 0),
+    ),
+    PieceType.ADVISOR: (
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, -1, 0, -1, 0, 0, 0),
+        (0, 0, 0, 0, 3, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+    ),
+    PieceType.ELEPHANT: (
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, -2, 0, 0, 0, -2, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (-2, 0, 0, 0, 3, 0, 0, 0, -2),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+    ),
+    PieceType.HORSE: (
+        (4, 8, 16, 12, 4, 12, 16, 8, 4),
+        (4, 10, 28, 16, 8, 16, 28, 10, 4),
+        (12, 14, 16, 20, 18, 20, 16, 14, 12),
+        (8, 24, 18, 24, 20, 24, 18, 24, 8),
+        (6, 16, 14, 18, 16, 18, 14, 16, 6),
+        (4, 12, 16, 14, 12, 14, 16, 12, 4),
+        (2, 6, 8, 6, 10, 6, 8, 6, 2),
+        (4, 2, 8, 8, 4, 8, 8, 2, 4),
+        (0, 2, 4, 4, -2, 4, 4, 2, 0),
+        (0, -4, 0, 0, 0, 0, 0, -4, 0),
+    ),
+    PieceType.ROOK: (
+        (6, 8, 6, 14, 12, 14, 6, 8, 6),
+        (6, 12, 8, 16, 33, 16, 8, 12, 6),
+        (6, 8, 7, 14, 16, 14, 7, 8, 6),
+        (6, 13, 13, 16, 16, 16, 13, 13, 6),
+        (8, 11, 11, 14, 15, 14, 11, 11, 8),
+        (8, 12, 12, 14, 15, 14, 12, 12, 8),
+        (4, 9, 4, 12, 14, 12, 4, 9, 4),
+        (-2, 8, 4, 12, 12, 12, 4, 8, -2),
+        (5, 8, 6, 12, 0, 12, 6, 8, 5),
+        (-6, 6, 4, 12, 0, 12, 4, 6, -6),
+    ),
+    PieceType.CANNON: (
+        (6, 4, 0, -10, -12, -10, 0, 4, 6),
+        (2, 2, 0, -4, -14, -4, 0, 2, 2),
+        (2, 2, 0, -10, -8, -10, 0, 2, 2),
+        (0, 0, -2, 4, 10, 4, -2, 0, 0),
+        (0, 0, 0, 2, 8, 2, 0, 0, 0),
+        (-2, 0, 4, 2, 6, 2, 4, 0, -2),
+        (0, 0, 0, 2, 4, 2, 0, 0, 0),
+        (4, 0, 8, 6, 10, 6, 8, 0, 4),
+        (0, 2, 4, 6, 6, 6, 4, 2, 0),
+        (0, 0, 2, 6, 6, 6, 2, 0, 0),
+    ),
+    PieceType.PAWN: (
+        (0, 3, 6, 9, 12, 9, 6, 3, 0),
+        (18, 36, 56, 80, 120, 80, 56, 36, 18),
+        (14, 26, 42, 60, 80, 60, 42, 26, 14),
+        (10, 20, 30, 34, 40, 34, 30, 20, 10),
+        (6, 12, 18, 18, 20, 18, 18, 12, 6),
+        (2, 0, 8, 0, 8, 0, 8, 0, 2),
+        (0, 0, -2, 0, 4, 0, -2, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (0, 0, 0, 0, 0, 0, 0, 0, 0),
+    ),
+}
+
+# Mobility counts pseudo-legal moves of the long-range pieces.
+MOBILITY_WEIGHTS: Dict[PieceType, int] = {
+    PieceType.ROOK: 2,
+    PieceType.HORSE: 4,
+    PieceType.CANNON: 1,
+}
+
+# King safety weighs the opponent's pieces across the river against the
+# advisors and elephants left at home.
+_ATTACKER_WEIGHTS: Dict[PieceType, int] = {
+    PieceType.ROOK: 3,
+    PieceType.HORSE: 2,
+    PieceType.CANNON: 2,
+    PieceType.PAWN: 1,
+}
+_FULL_DEFENCE = 4
+_KING_SAFETY_WEIGHT = 6
+
+
+def _build_scores() -> Tuple[Tuple[int, ...], ...]:
+    # Row 0 belongs to the "empty" piece code and stays all zeros, matching
+    # the layout of ``zobrist.PIECE_SQUARE_KEYS``.
+    rows: List[Tuple[int, ...]] = [(0,) * 90]
+    for code in range(1, 15):
+        piece = decode_piece(code)
+        assert piece is not None
+        diagram = _TABLES[piece.type]
+        value = PIECE_VALUES[piece.type]
+        if piece.side is Side.RED:
+            rows.append(tuple(value + diagram[9 - index // 9][index % 9] for index in range(90)))
+        else:
+            rows.append(tuple(-value - diagram[index // 9][index % 9] for index in range(90)))
+    return tuple(rows)
+
+
+PIECE_SQUARE_SCORES = _build_scores()
+"""``PIECE_SQUARE_SCORES[piece_code][square_index]``, positive for Red."""
+
+
+def piece_square_score(piece: Piece, coord: Coord) -> int:
+    """Return the score contribution of ``piece`` standing on ``coord``."""
+
+    return PIECE_SQUARE_SCORES[encode_piece(piece)][coord.y * 9 + coord.x]
+
+
+def compute_score(pieces: Iterable[Tuple[Coord, Piece]]) -> int:
+    """Compute the material and piece-square score from scratch (Red's view)."""
+
+    return sum(piece_square_score(piece, coord) for coord, piece in pieces)
+
+
+def mobility(position: "Position") -> int:
+    """Return Red's weighted mobility minus Black's."""
+
+    from xiangqi_core.movegen import generate_pseudo_legal_moves  # movegen imports board
+
+    peek = position.board.peek
+    score = 0
+    for side, sign in ((Side.RED, 1), (Side.BLACK, -1)):
+        for move in generate_pseudo_legal_moves(position, side):
+            piece = peek(move.frm)
+            score += sign * MOBILITY_WEIGHTS.get(piece.type, 0)  # type: ignore[union-attr]
+    return score
+
+
+def king_safety(position: "Position") -> int:
+    """Return Red's king-safety score minus Black's (both are penalties)."""
+
+    defenders = {Side.RED: 0, Side.BLACK: 0}
+    attackers = {Side.RED: 0, Side.BLACK: 0}
+    for coord, piece in position.board:
+        piece_type = piece.type
+        if piece_type is PieceType.ADVISOR or piece_type is PieceType.ELEPHANT:
+            defenders[piece.side] += 1
+        elif piece_type in _ATTACKER_WEIGHTS and (
+            coord.y >= 5 if piece.side is Side.RED else coord.y <= 4
+        ):
+            attackers[piece.side] += _ATTACKER_WEIGHTS[piece_type]
+    red = attackers[Side.BLACK] * max(_FULL_DEFENCE - defenders[Side.RED], 0)
+    black = attackers[Side.RED] * max(_FULL_DEFENCE - defenders[Side.BLACK], 0)
+    return (black - red) * _KING_SAFETY_WEIGHT
+
+
+def evaluate(
+    position: "Position", mobility_term: bool = False, king_safety_term: bool = False
+) -> int:
+    """Return the static score of ``position`` from the side to move's view."""
+
+    score = position.board.psq_score
+    if mobility_term:
+        score += mobility(position)
+    if king_safety_term:
+        score += king_safety(position)
+    return score if position.side_to_move is Side.RED else -score
+
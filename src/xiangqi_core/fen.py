@@ -0,0 +1,138 @@
+"""Xiangqi FEN import and export.
+
+The format follows the common Xiangqi convention::
+
+    rnbakabnr/9/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/9/RNBAKABNR w - - 0 1
+
+Ranks are listed from Black's back rank (``y = 9``) down to Red's
+(``y = 0``); uppercase letters are Red. ``K A B N R C P`` denote king,
+advisor, elephant, horse, rook, cannon and pawn (``E`` and ``H`` are accepted
+as aliases). The side to move is ``w``/``r`` for Red and ``b`` for Black,
+followed by two unused ``-`` fields and the halfmove/fullmove counters.
+
+The parser is a single pass over the placement field that places interned
+``Coord``/``Piece`` objects directly, skipping per-square validation.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+from xiangqi_core.board import Board, Position
+from xiangqi_core.coord import Coord, _COORDS
+from xiangqi_core.errors import ParseFenError
+from xiangqi_core.piece import Piece
+from xiangqi_core.types import PieceType, Side
+
+START_FEN = "rnbakabnr/9/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/9/RNBAKABNR w - - 0 1"
+
+_LETTERS: Dict[PieceType, str] = {
+    PieceType.KING: "k",
+    PieceType.ADVISOR: "a",
+    PieceType.ELEPHANT: "b",
+    PieceType.HORSE: "n",
+    PieceType.ROOK: "r",
+    PieceType.CANNON: "c",
+    PieceType.PAWN: "p",
+}
+_ALIASES: Dict[str, PieceType] = {"e": PieceType.ELEPHANT, "h": PieceType.HORSE}
+
+_PIECES_BY_CHAR: Dict[str, Piece] = {}
+for _letter, _piece_type in (*((v, k) for k, v in _LETTERS.items()), *_ALIASES.items()):
+    _PIECES_BY_CHAR[_letter.upper()] = Piece.of(Side.RED, _piece_type)
+    _PIECES_BY_CHAR[_letter] = Piece.of(Side.BLACK, _piece_type)
+
+_CHARS_BY_PIECE: Dict[Piece, str] = {
+    piece: char for char, piece in _PIECES_BY_CHAR.items() if char.lower() not in _ALIASES
+}
+_SIDES: Dict[str, Side] = {"w": Side.RED, "r": Side.RED, "b": Side.BLACK}
+
+
+def parse_fen(fen: str, backend: Optional[str] = None) -> Position:
+    """Parse ``fen`` into a new :class:`Position`.
+
+    Only the placement field is required; a missing side defaults to Red and
+    missing counters default to ``0`` and ``1``.
+    """
+
+    if not isinstance(fen, str):
+        raise ParseFenError("FEN must be a string")
+    fields = fen.split()
+    if not fields:
+        raise ParseFenError("Empty FEN string")
+
+    squares: List[Tuple[Coord, Piece]] = []
+    y = 9
+    x = 0
+    pieces_by_char = _PIECES_BY_CHAR
+    for char in fields[0]:
+        if char == "/":
+            if x != 9:
+                raise ParseFenError(f"Rank {y} does not have 9 files: {fen}")
+            y -= 1
+            x = 0
+            if y < 0:
+                raise ParseFenError(f"Too many ranks in FEN: {fen}")
+        elif "1" <= char <= "9":
+            x += ord(char) - 48
+        else:
+            piece = pieces_by_char.get(char)
+            if piece is None:
+                raise ParseFenError(f"Invalid piece character {char!r} in FEN: {fen}")
+            if x > 8:
+                raise ParseFenError(f"Rank {y} does not have 9 files: {fen}")
+            squares.append((_COORDS[y * 9 + x], piece))
+            x += 1
+        if x > 9:
+            raise ParseFenError(f"Rank {y} does not have 9 files: {fen}")
+    if y != 0 or x != 9:
+        raise ParseFenError(f"FEN placement must describe 10 ranks of 9 files: {fen}")
+
+    side_to_move = Side.RED
+    if len(fields) > 1:
+        side = _SIDES.get(fields[1].lower())
+        if side is None:
+            raise ParseFenError(f"Invalid side to move {fields[1]!r} in FEN: {fen}")
+        side_to_move = side
+
+    try:
+        halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+        fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+    except ValueError as exc:
+        raise ParseFenError(f"Invalid move counters in FEN: {fen}") from exc
+
+    board = Board(backend=backend)
+    board._load_unchecked(squares)
+    return Position(
+        board=board,
+        side_to_move=side_to_move,
+        halfmove_clock=halfmove_clock,
+        fullmove_number=fullmove_number,
+    )
+
+
+def format_fen(position: Position) -> str:
+    """Serialize ``position`` as a FEN string."""
+
+    cells: List[Optional[Piece]] = [None] * 90
+    for coord, piece in position.board:
+        cells[coord.y * 9 + coord.x] = piece
+
+    ranks = []
+    for y in range(9, -1, -1):
+        rank = []
+        empty = 0
+        for piece in cells[y * 9 : y * 9 + 9]:
+            if piece is None:
+                empty += 1
+                continue
+            if empty:
+                rank.append(str(empty))
+                empty = 0
+            rank.append(_CHARS_BY_PIECE[piece])
+        if empty:
+            rank.append(str(empty))
+        ranks.append("".join(rank))
+
+    side = "w" if position.side_to_move is Side.RED else "b"
+    return f"{'/'.join(ranks)} {side} - - {position.halfmove_clock} {position.fullmove_number}"
@@ -1,16 +1,48 @@
-"""Game state machine coordinating move application and results."""
+"""Game state machine coordinating move application and results.
+
+Besides checkmate and stalemate, a game ends when:
+
+* a position occurs for the third time. Under Asian rules, a side whose every
+  move in the repeated cycle gave check (perpetual check) or chased an
+  unprotected piece (perpetual chase) loses; otherwise the game is drawn.
+  Check ranks above chase, so a perpetual checker loses to a perpetual
+  chaser.
+* ``NATURAL_MOVE_LIMIT`` plies pass without a capture, which is a draw.
+
+Each move costs O(1) bookkeeping: one position-key counter update. The
+moves are only replayed when a position reaches its third occurrence, and
+then only the cycle since its previous occurrence.
+"""
 
 from __future__ import annotations
 
+from array import array
+from collections import Counter
+from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
-from xiangqi_core.board import Position, initial_position
+from xiangqi_core.attack import is_in_check, is_square_attacked
+from xiangqi_core.board import Board, Position, UndoInfo, initial_position
+from xiangqi_core.coord import Coord
 from xiangqi_core.errors import GameOverError, IllegalMoveError
-from xiangqi_core.legality import generate_legal_moves, is_checkmate, is_legal_move
-from xiangqi_core.move import Move
+from xiangqi_core.legality import generate_legal_moves, has_legal_move, is_legal_move
+from xiangqi_core.move import Move, encode_moves
+from xiangqi_core.movegen import _append_piece_moves
+from xiangqi_core.piece import Piece
 from xiangqi_core.types import PieceType, Side
 
+NATURAL_MOVE_LIMIT = 120
+"""Plies without a capture after which the game is drawn."""
+
+REPETITION_LIMIT = 3
+
+KEYFRAME_INTERVAL = 32
+"""Default number of plies between board snapshots used by ``Game.goto``."""
+
+# Restoring a keyframe costs roughly this many make/unmake steps.
+_KEYFRAME_RESTORE_COST = 8
+
 
 class GameResult(str, Enum):
     """Represents the end state of a game."""
@@ -18,18 +50,84 @@ class GameResult(str, Enum):
     ONGOING = "ongoing"
     RED_WIN = "red_win"
     BLACK_WIN = "black_win"
+    DRAW = "draw"
+
+
+class Termination(str, Enum):
+    """Explains why a finished game ended."""
+
+    CHECKMATE = "checkmate"
+    STALEMATE = "stalemate"
+    KING_CAPTURED = "king_captured"
+    REPETITION = "repetition"
+    PERPETUAL_CHECK = "perpetual_check"
+    PERPETUAL_CHASE = "perpetual_chase"
+    MOVE_LIMIT = "move_limit"
+
+
+@dataclass(frozen=True, slots=True)
+class PlyRecord:
+    """Everything needed to take back or replay one ply of a game.
+
+    ``prev_seen`` is the ply at which ``key`` had last occurred before this
+    move, and ``result``/``termination`` are the game state after it.
+    """
+
+    undo: UndoInfo
+    key: int
+    prev_seen: Optional[int]
+    result: GameResult
+    termination: Optional[Termination]
+
+
+# A keyframe is the board contents and counters at a ply that is a multiple of
+# the keyframe interval.
+_Keyframe = Tuple[Tuple[Tuple[Coord, Piece], ...], Side, int, int]
 
 
 class Game:
-    """Encapsulates an in-progress Xiangqi game."""
+    """Encapsulates an in-progress Xiangqi game.
 
-    def __init__(self, position: Optional[Position] = None) -> None:
+    Every ply is kept as a :class:`PlyRecord`, so :meth:`undo`, :meth:`redo`
+    and :meth:`goto` step through the game with make/unmake instead of
+    replaying it from the start. Every ``keyframe_interval`` plies the board
+    is snapshotted so long jumps can restart from the nearest snapshot; pass
+    ``0`` to disable keyframes. ``start_fen`` is the FEN the game began from.
+    """
+
+    def __init__(
+        self, position: Optional[Position] = None, keyframe_interval: int = KEYFRAME_INTERVAL
+    ) -> None:
         self.position: Position = position or initial_position()
+        self.start_fen: str = self.position.to_fen()
         self.history: List[Move] = []
         self.result: GameResult = GameResult.ONGOING
+        self.termination: Optional[Termination] = None
+        self.headers: Dict[str, str] = {}
+        self.keys: List[int] = [self.position.key]
+        self.keyframe_interval = keyframe_interval
+        self._plies: List[PlyRecord] = []
+        self._keyframes: List[_Keyframe] = [self._snapshot()] if keyframe_interval > 0 else []
+        self._key_counts: Counter[int] = Counter(self.keys)
+        self._last_seen: Dict[int, int] = {self.keys[0]: 0}
+
+    @property
+    def ply(self) -> int:
+        """Number of plies played to reach the current position."""
+
+        return len(self.history)
+
+    @property
+    def length(self) -> int:
+        """Number of recorded plies, including ones that can be redone."""
+
+        return len(self._plies)
 
     def apply_move(self, move: Move) -> None:
-        """Apply ``move`` if legal, updating game state and result."""
+        """Apply ``move`` if legal, updating game state and result.
+
+        Any plies that had been undone are discarded.
+        """
 
         if self.result is not GameResult.ONGOING:
             raise GameOverError("Game is already finished")
@@ -37,19 +135,226 @@ class Game:
         if not is_legal_move(self, move):
             raise IllegalMoveError(f"Illegal move: {move.to_str()}")
 
-        captured = self.position.board.move_piece(move)
+        ply = self.ply
+        if ply < len(self._plies):
+            del self._plies[ply:]
+            if self.keyframe_interval > 0:
+                del self._keyframes[ply // self.keyframe_interval + 1 :]
+
+        undo = self.position.make_move(move)
+        key = self.position.key
+        prev_seen = self._last_seen.get(key)
+        self._push(move, key)
+        self._update_result(undo, prev_seen)
+        self._plies.append(PlyRecord(undo, key, prev_seen, self.result, self.termination))
+        if self.keyframe_interval > 0 and self.ply % self.keyframe_interval == 0:
+            self._keyframes.append(self._snapshot())
+
+    def undo(self) -> Optional[Move]:
+        """Take back the last ply and return its move, or ``None`` at the start."""
+
+        if not self.history:
+            return None
+        record = self._plies[self.ply - 1]
+        self.position.unmake_move(record.undo)
+        self._pop(record)
+        self._restore_result()
+        return record.undo.move
+
+    def redo(self) -> Optional[Move]:
+        """Replay the next undone ply and return its move, or ``None`` if none."""
+
+        if self.ply >= len(self._plies):
+            return None
+        record = self._plies[self.ply]
+        self.position.make_move(record.undo.move)
+        self._push(record.undo.move, record.key)
+        self.result = record.result
+        self.termination = record.termination
+        return record.undo.move
+
+    def goto(self, ply: int) -> None:
+        """Move to the position after ``ply`` plies of the recorded game."""
+
+        if not 0 <= ply <= len(self._plies):
+            raise ValueError(f"Ply {ply} is outside 0..{len(self._plies)}")
+        distance = abs(ply - self.ply)
+        if self.keyframe_interval > 0:
+            frame = ply // self.keyframe_interval
+            if ply - frame * self.keyframe_interval < distance - _KEYFRAME_RESTORE_COST:
+                self._restore_keyframe(frame)
+        while self.ply > ply:
+            self.undo()
+        while self.ply < ply:
+            self.redo()
+
+    def move_codes(self) -> "array[int]":
+        """Return the moves played so far as an ``array('H')`` of move codes."""
+
+        return encode_moves(self.history)
+
+    def repetition_count(self) -> int:
+        """Return how many times the current position has occurred."""
+
+        return self._key_counts[self.keys[-1]]
+
+    def legal_moves(self) -> List[Move]:
+        """Convenience wrapper for legal move generation for the side to move."""
+
+        return generate_legal_moves(self.position, self.position.side_to_move)
+
+    def _push(self, move: Move, key: int) -> None:
         self.history.append(move)
-        self.position.side_to_move = self.position.side_to_move.opponent()
+        self._last_seen[key] = len(self.keys)
+        self._key_counts[key] += 1
+        self.keys.append(key)
 
+    def _pop(self, record: PlyRecord) -> None:
+        self.history.pop()
+        key = self.keys.pop()
+        self._key_counts[key] -= 1
+        if record.prev_seen is None:
+            del self._last_seen[key]
+            del self._key_counts[key]
+        else:
+            self._last_seen[key] = record.prev_seen
+
+    def _restore_result(self) -> None:
+        if self.history:
+            previous = self._plies[self.ply - 1]
+            self.result, self.termination = previous.result, previous.termination
+        else:
+            self.result, self.termination = GameResult.ONGOING, None
+
+    def _snapshot(self) -> _Keyframe:
+        position = self.position
+        return (
+            tuple(position.board),
+            position.side_to_move,
+            position.halfmove_clock,
+            position.fullmove_number,
+        )
+
+    def _restore_keyframe(self, frame: int) -> None:
+        """Reset the position and bookkeeping to keyframe ``frame``."""
+
+        pieces, side, halfmove_clock, fullmove_number = self._keyframes[frame]
+        position = self.position
+        board = Board(backend=position.board.backend)
+        board._load_unchecked(pieces)
+        position.board = board
+        position.side_to_move = side
+        position.halfmove_clock = halfmove_clock
+        position.fullmove_number = fullmove_number
+
+        ply = frame * self.keyframe_interval
+        records = self._plies[:ply]
+        self.history = [record.undo.move for record in records]
+        self.keys = self.keys[:1] + [record.key for record in records]
+        self._key_counts = Counter(self.keys)
+        self._last_seen = {key: index for index, key in enumerate(self.keys)}
+        self._restore_result()
+
+    def _update_result(self, undo: UndoInfo, cycle_start: Optional[int]) -> None:
+        captured = undo.captured
         if captured is not None and captured.type is PieceType.KING:
             self.result = GameResult.RED_WIN if captured.side is Side.BLACK else GameResult.BLACK_WIN
+            self.termination = Termination.KING_CAPTURED
             return
 
+        # A side left without a legal move loses, whether or not it is in check.
         opponent = self.position.side_to_move
-        if is_checkmate(self.position, opponent):
+        if not has_legal_move(self.position, opponent):
             self.result = GameResult.RED_WIN if opponent is Side.BLACK else GameResult.BLACK_WIN
+            if is_in_check(self.position, opponent):
+                self.termination = Termination.CHECKMATE
+            else:
+                self.termination = Termination.STALEMATE
+            return
 
-    def legal_moves(self) -> List[Move]:
-        """Convenience wrapper for legal move generation for the side to move."""
+        # A key seen REPETITION_LIMIT times was seen before, so cycle_start is set.
+        if cycle_start is not None and self._key_counts[self.keys[-1]] >= REPETITION_LIMIT:
+            self._rule_repetition(cycle_start, undo)
+        elif self.position.halfmove_clock >= NATURAL_MOVE_LIMIT:
+            self.result = GameResult.DRAW
+            self.termination = Termination.MOVE_LIMIT
 
-        return generate_legal_moves(self.position, self.position.side_to_move)
+    def _rule_repetition(self, start: int, latest: UndoInfo) -> None:
+        """Decide a threefold repetition from the moves since ply ``start``."""
+
+        # The latest ply has no record yet.
+        undos = [record.undo for record in self._plies[start:]] + [latest]
+        position = self.position
+        for undo in reversed(undos):
+            position.unmake_move(undo)
+
+        checks = {Side.RED: True, Side.BLACK: True}
+        forcing = {Side.RED: True, Side.BLACK: True}
+        for undo in undos:
+            side = position.side_to_move
+            gave_check, chased = _classify_move(position, undo.move)
+            checks[side] = checks[side] and gave_check
+            forcing[side] = forcing[side] and (gave_check or chased)
+
+        def rank(side: Side) -> int:
+            return 2 if checks[side] else 1 if forcing[side] else 0
+
+        red, black = rank(Side.RED), rank(Side.BLACK)
+        if red == black:
+            self.result = GameResult.DRAW
+            self.termination = Termination.REPETITION
+            return
+        loser = Side.RED if red > black else Side.BLACK
+        self.result = GameResult.BLACK_WIN if loser is Side.RED else GameResult.RED_WIN
+        self.termination = (
+            Termination.PERPETUAL_CHECK if max(red, black) == 2 else Termination.PERPETUAL_CHASE
+        )
+
+
+def _classify_move(position: Position, move: Move) -> Tuple[bool, bool]:
+    """Play ``move`` and report whether it gave check and whether it chased.
+
+    A chase newly attacks an enemy piece other than the king (or a pawn that
+    has not crossed the river) which the opponent could not recapture.
+    ``move`` stays on the board when this returns.
+    """
+
+    board = position.board
+    piece = board.peek(move.frm)
+    assert piece is not None
+    before = _targets(position, move.frm)
+    position.make_move(move)
+    side = piece.side
+    opponent = side.opponent()
+    gave_check = is_in_check(position, opponent)
+
+    chased = False
+    for target in _targets(position, move.to) - before:
+        capture = position.make_move(Move.between(move.to, target))
+        protected = is_square_attacked(position, opponent, target)
+        position.unmake_move(capture)
+        if not protected:
+            chased = True
+            break
+    return gave_check, chased
+
+
+def _targets(position: Position, square: Coord) -> Set[Coord]:
+    """Enemy pieces the piece on ``square`` could capture and that can be chased."""
+
+    board = position.board
+    piece = board.peek(square)
+    assert piece is not None
+    moves: List[Move] = []
+    _append_piece_moves(board, square, piece, moves)
+    targets = set()
+    for move in moves:
+        victim = board.peek(move.to)
+        if victim is None or victim.type is PieceType.KING:
+            continue
+        if victim.type is PieceType.PAWN and (
+            move.to.y <= 4 if victim.side is Side.RED else move.to.y >= 5
+        ):
+            continue
+        targets.add(move.to)
+    return targets
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List
+from array import array
+from typing import TYPE_CHECKING, Iterator, List
 
-from xiangqi_core.attack import is_in_check
-from xiangqi_core.board import Board, Position
-from xiangqi_core.coord import Coord
-from xiangqi_core.move import Move
+from xiangqi_core.attack import check_info, is_in_check
+from xiangqi_core.board import Position
+from xiangqi_core.move import Move, encode_moves
+from xiangqi_core.movegen import _append_piece_moves, generate_pseudo_legal_moves
 from xiangqi_core.rules import is_pseudo_legal_move
 from xiangqi_core.types import Side
 
@@ -26,42 +27,85 @@ def is_legal_move(game: "Game", move: Move) -> bool:
     if not is_pseudo_legal_move(position, move):
         return False
 
-    next_position = _apply_move(position, move)
-    return not is_in_check(next_position, piece.side)
+    return not _leaves_king_in_check(position, move, piece.side)
 
 
 def generate_legal_moves(position: Position, side: Side) -> List[Move]:
-    """Enumerate all legal moves for ``side`` in ``position``."""
+    """Enumerate all legal moves for ``side`` in ``position``.
 
+    Only the moves flagged by :func:`~xiangqi_core.attack.check_info` are
+    played out to test king safety; the rest are legal as generated.
+    """
+
+    info = check_info(position, side)
+    needs_verification = info.needs_verification
     legal_moves: List[Move] = []
-    for coord, piece in position.board:
+    for move in generate_pseudo_legal_moves(position, side):
+        if not needs_verification(move) or not _leaves_king_in_check(position, move, side):
+            legal_moves.append(move)
+    return legal_moves
+
+
+def generate_legal_move_codes(position: Position, side: Side) -> "array[int]":
+    """Like :func:`generate_legal_moves`, packed into an ``array('H')`` of move codes."""
+
+    return encode_moves(generate_legal_moves(position, side))
+
+
+def iter_legal_moves(position: Position, side: Side) -> Iterator[Move]:
+    """Lazily yield the legal moves for ``side`` in ``position``.
+
+    Moves are generated one piece at a time and verified only when
+    requested, so callers that need a single legal move can stop early.
+    ``position`` must not be changed while the iterator is in use.
+    """
+
+    info = check_info(position, side)
+    board = position.board
+    moves: List[Move] = []
+    # Snapshot the squares: verifying a move makes and unmakes it in place.
+    for coord, piece in list(board):
         if piece.side is not side:
             continue
-        for x in range(9):
-            for y in range(10):
-                dest = Coord(x, y)
-                move = Move(coord, dest)
-                if not is_pseudo_legal_move(position, move):
-                    continue
-                next_position = _apply_move(position, move, next_to_move=side.opponent())
-                if is_in_check(next_position, side):
-                    continue
-                legal_moves.append(move)
-    return legal_moves
+        moves.clear()
+        _append_piece_moves(board, coord, piece, moves)
+        for move in moves:
+            if not info.needs_verification(move) or not _leaves_king_in_check(
+                position, move, side
+            ):
+                yield move
+
+
+def has_legal_move(position: Position, side: Side) -> bool:
+    """Return ``True`` if ``side`` has at least one legal move."""
+
+    return next(iter_legal_moves(position, side), None) is not None
 
 
 def is_checkmate(position: Position, side: Side) -> bool:
     """Return ``True`` if ``side`` is checkmated."""
 
-    if not is_in_check(position, side):
-        return False
-    return len(generate_legal_moves(position, side)) == 0
+    return is_in_check(position, side) and not has_legal_move(position, side)
+
+
+def is_stalemate(position: Position, side: Side) -> bool:
+    """Return ``True`` if ``side`` is not in check but has no legal move.
+
+    Unlike in chess, a stalemated side loses in Xiangqi.
+    """
+
+    return not is_in_check(position, side) and not has_legal_move(position, side)
+
 
+def _leaves_king_in_check(position: Position, move: Move, side: Side) -> bool:
+    """Return ``True`` if playing ``move`` would leave ``side``'s king attacked.
 
-def _apply_move(position: Position, move: Move, next_to_move: Side | None = None) -> Position:
-    """Return a new ``Position`` representing ``move`` applied to ``position``."""
+    The move is made and taken back in place, so ``position`` is unchanged when
+    this returns.
+    """
 
-    board_copy = Board({coord: piece for coord, piece in position.board})
-    board_copy.move_piece(move)
-    side_to_move = next_to_move if next_to_move is not None else position.side_to_move.opponent()
-    return Position(board=board_copy, side_to_move=side_to_move)
+    undo = position.make_move(move)
+    try:
+        return is_in_check(position, side)
+    finally:
+        position.unmake_move(undo)
@@ -1,10 +1,18 @@
-"""Move representation for Xiangqi."""
+"""Move representation for Xiangqi.
+
+Besides the :class:`Move` objects, a move can be stored as a 16-bit code
+``(from_index << 7) | to_index``, using the square indexes of
+:attr:`Coord.index`. Codes fit an ``array('H')`` at two bytes per move and
+never collide with ``0``, which no real move encodes to.
+"""
 
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
+from typing import Iterable, List, Optional
 
-from xiangqi_core.coord import Coord
+from xiangqi_core.coord import Coord, _COORDS
 from xiangqi_core.errors import ParseCoordError, ParseMoveError
 
 
@@ -24,6 +32,37 @@ class Move:
 
         return f"{self.frm.to_str()}{self.to.to_str()}"
 
+    @property
+    def code(self) -> int:
+        """Return the 16-bit code ``(from_index << 7) | to_index``."""
+
+        return ((self.frm.y * 9 + self.frm.x) << 7) | (self.to.y * 9 + self.to.x)
+
+    @classmethod
+    def from_code(cls, code: int) -> "Move":
+        """Return the move for a code produced by :attr:`code`."""
+
+        frm, to = code >> 7, code & 0x7F
+        if frm > 89 or to > 89:
+            raise ParseMoveError(f"Invalid move code: {code}")
+        move = _MOVES[frm * 90 + to]
+        return move if move is not None else cls(_COORDS[frm], _COORDS[to])
+
+    @classmethod
+    def between(cls, frm: Coord, to: Coord) -> "Move":
+        """Return the shared instance for ``frm -> to``.
+
+        Every move some piece could make on an empty board (file/rank slides,
+        horse jumps and one- or two-step diagonals) is precomputed; any other
+        pair, including off-board coordinates, gets a fresh instance.
+        """
+
+        if frm.in_bounds() and to.in_bounds():
+            move = _MOVES[(frm.y * 9 + frm.x) * 90 + to.y * 9 + to.x]
+            if move is not None:
+                return move
+        return cls(frm, to)
+
     @classmethod
     def from_str(cls, value: str) -> "Move":
         """Parse a ``Move`` from a string containing two coordinates."""
@@ -41,4 +80,41 @@ class Move:
         except ParseCoordError as exc:
             raise ParseMoveError(f"Invalid move coordinates: {value}") from exc
 
-        return cls(frm=frm, to=to)
+        return cls.between(frm, to)
+
+
+def _is_geometric(frm: Coord, to: Coord) -> bool:
+    dx = abs(to.x - frm.x)
+    dy = abs(to.y - frm.y)
+    if dx == 0 and dy == 0:
+        return False
+    return dx == 0 or dy == 0 or (dx, dy) in {(1, 2), (2, 1), (1, 1), (2, 2)}
+
+
+_MOVES: List[Optional[Move]] = [
+    Move(frm, to) if _is_geometric(frm, to) else None for frm in _COORDS for to in _COORDS
+]
+
+
+def encode_moves(moves: Iterable[Move]) -> "array[int]":
+    """Pack ``moves`` into an ``array('H')`` of move codes."""
+
+    return array("H", [move.code for move in moves])
+
+
+def decode_moves(codes: Iterable[int]) -> List[Move]:
+    """Return the moves for an iterable of move codes."""
+
+    return [Move.from_code(code) for code in codes]
+
+
+def move_code_from_str(value: str) -> int:
+    """Parse an ICCS move string such as ``"h2e2"`` straight to its code."""
+
+    return Move.from_str(value).code
+
+
+def move_code_to_str(code: int) -> str:
+    """Return the ICCS string for a move code."""
+
+    return Move.from_code(code).to_str()
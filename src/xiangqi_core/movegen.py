@@ -0,0 +1,197 @@
+"""Direct pseudo-legal move generation for Xiangqi pieces.
+
+Instead of probing every destination square with
+:func:`xiangqi_core.rules.is_pseudo_legal_move`, the generator enumerates only
+the squares each piece type can actually reach: ray walks for rooks and
+cannons and fixed offset tables for the remaining pieces. The resulting move
+set is identical to the one accepted by the rules module.
+
+The tables are indexed by square and hold the shared :class:`Coord` and
+:class:`Move` instances from ``Coord.at``/``Move.between``, so generating
+moves allocates nothing but the result list.
+"""
+
+from __future__ import annotations
+
+from typing import List, Tuple
+
+from xiangqi_core.board import Board, Position
+from xiangqi_core.coord import Coord, _COORDS
+from xiangqi_core.move import Move
+from xiangqi_core.piece import Piece
+from xiangqi_core.types import PieceType, Side
+
+_ORTHOGONAL: Tuple[Tuple[int, int], ...] = ((0, 1), (0, -1), (1, 0), (-1, 0))
+_DIAGONAL: Tuple[Tuple[int, int], ...] = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+# (dx, dy, leg_dx, leg_dy): the leg square must be empty for the horse to move.
+_HORSE_STEPS: Tuple[Tuple[int, int, int, int], ...] = (
+    (1, 2, 0, 1),
+    (-1, 2, 0, 1),
+    (1, -2, 0, -1),
+    (-1, -2, 0, -1),
+    (2, 1, 1, 0),
+    (2, -1, 1, 0),
+    (-2, 1, -1, 0),
+    (-2, -1, -1, 0),
+)
+
+MoveTable = Tuple[Tuple[Move, ...], ...]
+BlockableTable = Tuple[Tuple[Tuple[Move, Coord], ...], ...]
+
+
+def _on_board(x: int, y: int) -> bool:
+    return 0 <= x <= 8 and 0 <= y <= 9
+
+
+def _in_palace(x: int, y: int, side: Side) -> bool:
+    return 3 <= x <= 5 and (0 <= y <= 2 if side is Side.RED else 7 <= y <= 9)
+
+
+def _build_rays() -> Tuple[MoveTable, ...]:
+    table = []
+    for frm in _COORDS:
+        rays = []
+        for step_x, step_y in _ORTHOGONAL:
+            ray = []
+            x, y = frm.x + step_x, frm.y + step_y
+            while _on_board(x, y):
+                ray.append(Move.between(frm, Coord.at(x, y)))
+                x += step_x
+                y += step_y
+            rays.append(tuple(ray))
+        table.append(tuple(rays))
+    return tuple(table)
+
+
+def _build_horse_jumps() -> BlockableTable:
+    table = []
+    for frm in _COORDS:
+        jumps = []
+        for dx, dy, leg_dx, leg_dy in _HORSE_STEPS:
+            if _on_board(frm.x + dx, frm.y + dy):
+                move = Move.between(frm, Coord.at(frm.x + dx, frm.y + dy))
+                jumps.append((move, Coord.at(frm.x + leg_dx, frm.y + leg_dy)))
+        table.append(tuple(jumps))
+    return tuple(table)
+
+
+def _build_elephant_jumps(side: Side) -> BlockableTable:
+    table = []
+    for frm in _COORDS:
+        jumps = []
+        for dx, dy in _DIAGONAL:
+            x, y = frm.x + 2 * dx, frm.y + 2 * dy
+            if not _on_board(x, y):
+                continue
+            if (side is Side.RED and y > 4) or (side is Side.BLACK and y < 5):
+                continue
+            jumps.append((Move.between(frm, Coord.at(x, y)), Coord.at(frm.x + dx, frm.y + dy)))
+        table.append(tuple(jumps))
+    return tuple(table)
+
+
+def _build_palace_steps(side: Side, steps: Tuple[Tuple[int, int], ...]) -> MoveTable:
+    """Single-step moves confined to ``side``'s palace (king and advisor)."""
+
+    return tuple(
+        tuple(
+            Move.between(frm, Coord.at(frm.x + dx, frm.y + dy))
+            for dx, dy in steps
+            if _in_palace(frm.x + dx, frm.y + dy, side)
+        )
+        for frm in _COORDS
+    )
+
+
+def _build_pawn_steps(side: Side) -> MoveTable:
+    forward = 1 if side is Side.RED else -1
+    table = []
+    for frm in _COORDS:
+        crossed_river = frm.y >= 5 if side is Side.RED else frm.y <= 4
+        candidates = [(frm.x, frm.y + forward)]
+        if crossed_river:
+            candidates.extend(((frm.x - 1, frm.y), (frm.x + 1, frm.y)))
+        table.append(
+            tuple(Move.between(frm, Coord.at(x, y)) for x, y in candidates if _on_board(x, y))
+        )
+    return tuple(table)
+
+
+# Side-dependent tables are pairs indexed by ``0`` for Red and ``1`` for Black.
+_RAYS = _build_rays()
+_HORSE_JUMPS = _build_horse_jumps()
+_ELEPHANT_JUMPS = (_build_elephant_jumps(Side.RED), _build_elephant_jumps(Side.BLACK))
+_ADVISOR_STEPS = (
+    _build_palace_steps(Side.RED, _DIAGONAL),
+    _build_palace_steps(Side.BLACK, _DIAGONAL),
+)
+_KING_STEPS = (
+    _build_palace_steps(Side.RED, _ORTHOGONAL),
+    _build_palace_steps(Side.BLACK, _ORTHOGONAL),
+)
+_PAWN_STEPS = (_build_pawn_steps(Side.RED), _build_pawn_steps(Side.BLACK))
+
+
+def generate_pseudo_legal_moves(position: Position, side: Side) -> List[Move]:
+    """Enumerate every pseudo-legal move for ``side`` in ``position``.
+
+    Turn order and king safety are ignored, mirroring
+    :func:`xiangqi_core.rules.is_pseudo_legal_move`.
+    """
+
+    board = position.board
+    moves: List[Move] = []
+    for coord, piece in board:
+        if piece.side is side:
+            _append_piece_moves(board, coord, piece, moves)
+    return moves
+
+
+def _append_piece_moves(board: Board, frm: Coord, piece: Piece, moves: List[Move]) -> None:
+    peek = board.peek
+    side = piece.side
+    index = frm.y * 9 + frm.x
+    piece_type = piece.type
+
+    if piece_type is PieceType.ROOK or piece_type is PieceType.CANNON:
+        cannon = piece_type is PieceType.CANNON
+        for ray in _RAYS[index]:
+            screened = False
+            for move in ray:
+                occupant = peek(move.to)
+                if occupant is None:
+                    if not screened:
+                        moves.append(move)
+                elif cannon and not screened:
+                    screened = True
+                else:
+                    if occupant.side is not side:
+                        moves.append(move)
+                    break
+        return
+
+    side_index = 0 if side is Side.RED else 1
+    if piece_type is PieceType.HORSE or piece_type is PieceType.ELEPHANT:
+        if piece_type is PieceType.HORSE:
+            jumps = _HORSE_JUMPS[index]
+        else:
+            jumps = _ELEPHANT_JUMPS[side_index][index]
+        for move, block in jumps:
+            if peek(block) is not None:
+                continue
+            occupant = peek(move.to)
+            if occupant is None or occupant.side is not side:
+                moves.append(move)
+        return
+
+    if piece_type is PieceType.ADVISOR:
+        steps = _ADVISOR_STEPS[side_index][index]
+    elif piece_type is PieceType.KING:
+        steps = _KING_STEPS[side_index][index]
+    else:
+        steps = _PAWN_STEPS[side_index][index]
+    for move in steps:
+        occupant = peek(move.to)
+        if occupant is None or occupant.side is not side:
+            moves.append(move)
@@ -0,0 +1,186 @@
+"""Move ordering for alpha-beta search.
+
+Alpha-beta cuts off sooner the earlier it meets the best move. A
+:class:`MoveOrderer` therefore hands moves to the search in stages:
+
+1. the hash move from the transposition table, checked on its own before
+   any move generation;
+2. captures, most valuable victim first and least valuable attacker second
+   (MVV-LVA);
+3. the killer moves of the current ply, which are quiet moves that caused a
+   cutoff in a sibling node;
+4. the remaining quiet moves, by history score.
+
+Each stage is produced only when the previous one failed to cut off, and
+king safety is verified one move at a time as it is yielded. A node that
+cuts off on the hash move generates nothing. A node that cuts off on a
+capture never sorts or verifies its quiet moves.
+
+The history table is indexed by piece code and destination square. It
+gains ``depth * depth`` whenever a quiet move causes a cutoff, and is halved
+between searches so that old games fade.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Optional
+
+from xiangqi_core.attack import check_info
+from xiangqi_core.board import Position
+from xiangqi_core.legality import _leaves_king_in_check
+from xiangqi_core.move import Move
+from xiangqi_core.movegen import generate_pseudo_legal_moves
+from xiangqi_core.piece import Piece, encode_piece
+from xiangqi_core.rules import is_pseudo_legal_move
+from xiangqi_core.types import PieceType
+
+DEFAULT_MAX_PLY = 64
+KILLER_SLOTS = 2
+
+# History scores are halved once any entry passes this value.
+_HISTORY_LIMIT = 1 << 20
+
+# Ordering ranks, not evaluation values: only their order matters here.
+_RANKS: Dict[PieceType, int] = {
+    PieceType.PAWN: 1,
+    PieceType.ADVISOR: 2,
+    PieceType.ELEPHANT: 2,
+    PieceType.HORSE: 4,
+    PieceType.CANNON: 4,
+    PieceType.ROOK: 6,
+    PieceType.KING: 7,
+}
+
+MVV_LVA: Dict[PieceType, Dict[PieceType, int]] = {
+    victim: {attacker: _RANKS[victim] * 8 + 7 - _RANKS[attacker] for attacker in PieceType}
+    for victim in PieceType
+}
+"""``MVV_LVA[victim][attacker]``: higher scores are searched first."""
+
+
+def mvv_lva(victim: Piece, attacker: Piece) -> int:
+    """Return the capture ordering score of ``attacker`` taking ``victim``."""
+
+    return MVV_LVA[victim.type][attacker.type]
+
+
+class MoveOrderer:
+    """Killer slots per ply and a history table shared by one searcher."""
+
+    def __init__(self, max_ply: int = DEFAULT_MAX_PLY) -> None:
+        self.killers: List[List[Optional[Move]]] = [
+            [None] * KILLER_SLOTS for _ in range(max_ply + 1)
+        ]
+        self.history: List[List[int]] = [[0] * 90 for _ in range(15)]
+
+    def new_search(self) -> None:
+        """Forget the killers and halve the history scores."""
+
+        for slots in self.killers:
+            slots[:] = [None] * KILLER_SLOTS
+        self._age_history()
+
+    def record_cutoff(self, position: Position, move: Move, depth: int, ply: int) -> None:
+        """Credit a quiet ``move`` that failed high; captures are left alone."""
+
+        board = position.board
+        if board.peek(move.to) is not None:
+            return
+        slots = self.killers[ply]
+        if slots[0] != move:
+            slots[1:] = slots[:-1]
+            slots[0] = move
+        row = self.history[encode_piece(board.peek(move.frm))]
+        row[move.to.index] += depth * depth
+        if row[move.to.index] > _HISTORY_LIMIT:
+            self._age_history()
+
+    def order(
+        self, position: Position, moves: List[Move], hash_move: Optional[Move] = None, ply: int = 0
+    ) -> List[Move]:
+        """Return legal ``moves`` sorted in stage order without staging them."""
+
+        peek = position.board.peek
+        killers = self.killers[ply]
+        history = self.history
+
+        def key(move: Move) -> int:
+            if move == hash_move:
+                return 1 << 30
+            attacker = peek(move.frm)
+            victim = peek(move.to)
+            if victim is not None:
+                return (1 << 29) + MVV_LVA[victim.type][attacker.type]  # type: ignore[union-attr]
+            if move in killers:
+                return (1 << 28) - killers.index(move)
+            return history[encode_piece(attacker)][move.to.index]
+
+        return sorted(moves, key=key, reverse=True)
+
+    def staged_moves(
+        self, position: Position, hash_move: Optional[Move] = None, ply: int = 0
+    ) -> Iterator[Move]:
+        """Lazily yield the legal moves of the side to move in stage order.
+
+        ``position`` may be changed between items as long as it is restored
+        before the next one is requested, as a search does with make/unmake.
+        """
+
+        side = position.side_to_move
+        board = position.board
+        peek = board.peek
+        info = check_info(position, side)
+        needs_verification = info.needs_verification
+
+        if hash_move is not None:
+            piece = peek(hash_move.frm)
+            if (
+                piece is not None
+                and piece.side is side
+                and is_pseudo_legal_move(position, hash_move)
+                and not (
+                    needs_verification(hash_move)
+                    and _leaves_king_in_check(position, hash_move, side)
+                )
+            ):
+                yield hash_move
+            else:
+                hash_move = None
+
+        captures: List[Move] = []
+        quiets: List[Move] = []
+        for move in generate_pseudo_legal_moves(position, side):
+            if move == hash_move:
+                continue
+            if peek(move.to) is None:
+                quiets.append(move)
+            else:
+                captures.append(move)
+
+        captures.sort(
+            key=lambda move: mvv_lva(peek(move.to), peek(move.frm)),  # type: ignore[arg-type]
+            reverse=True,
+        )
+        for move in captures:
+            if not needs_verification(move) or not _leaves_king_in_check(position, move, side):
+                yield move
+
+        killers = [move for move in self.killers[ply] if move is not None and move in quiets]
+        for move in killers:
+            if not needs_verification(move) or not _leaves_king_in_check(position, move, side):
+                yield move
+
+        history = self.history
+        if killers:
+            quiets = [move for move in quiets if move not in killers]
+        quiets.sort(
+            key=lambda move: history[encode_piece(peek(move.frm))][move.to.index],
+            reverse=True,
+        )
+        for move in quiets:
+            if not needs_verification(move) or not _leaves_king_in_check(position, move, side):
+                yield move
+
+    def _age_history(self) -> None:
+        for row in self.history:
+            row[:] = [score >> 1 for score in row]
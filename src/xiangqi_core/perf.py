@@ -0,0 +1,127 @@
+"""Perft node counting and a reference suite for the move generator.
+
+``perft`` counts the leaf nodes of the legal-move tree to a fixed depth. The
+counts are a precise fingerprint of the generator: any rules regression
+changes them, and timing the walk gives a throughput figure that can be
+compared between releases.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from xiangqi_core.board import Position
+from xiangqi_core.fen import START_FEN
+from xiangqi_core.legality import generate_legal_moves
+
+
+@dataclass(frozen=True)
+class PerftCase:
+    """A named position with known node counts for depths ``1..len(expected)``."""
+
+    name: str
+    fen: str
+    expected: Tuple[int, ...]
+
+
+# Node counts for the start position match the published Xiangqi perft values;
+# the others were cross-checked against the original brute-force generator.
+REFERENCE_SUITE: Tuple[PerftCase, ...] = (
+    PerftCase("start", START_FEN, (44, 1920, 79666)),
+    PerftCase(
+        "developed-middlegame",
+        "r1bakab1r/9/1cn4c1/p1p1p1p1p/9/2P3n2/P3P1P1P/1CN1B1NC1/9/R2AKAB1R w - - 0 1",
+        (38, 1653, 64024),
+    ),
+    PerftCase("rook-check-evasion", "4k4/9/9/9/9/9/9/9/4R4/3K5 b - - 0 1", (1, 19, 26)),
+    PerftCase(
+        "cannon-horse-screens",
+        "2bak4/4a4/4b1n2/4C4/2n6/9/4c4/4B4/4A4/2BAK1R2 w - - 0 1",
+        (23, 677, 17779),
+    ),
+    PerftCase(
+        "pinned-rook-endgame",
+        "3a1k3/4a4/9/9/2r1p4/9/2C6/3R5/4Kn3/5A3 w - - 0 1",
+        (32, 578, 16880),
+    ),
+    PerftCase(
+        "black-counterattack",
+        "r3kab2/4a4/2c1b1n2/p3C3p/2p3p2/6R2/P1P3P1P/4B1N2/4A4/2B1KA3 b - - 0 1",
+        (23, 715, 17316),
+    ),
+)
+
+
+def perft(position: Position, depth: int) -> int:
+    """Return the number of leaf nodes ``depth`` plies below ``position``."""
+
+    if depth <= 0:
+        return 1
+    moves = generate_legal_moves(position, position.side_to_move)
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        undo = position.make_move(move)
+        nodes += perft(position, depth - 1)
+        position.unmake_move(undo)
+    return nodes
+
+
+def divide(position: Position, depth: int) -> Dict[str, int]:
+    """Return ``perft(depth - 1)`` below each root move, keyed by ICCS string."""
+
+    counts: Dict[str, int] = {}
+    for move in generate_legal_moves(position, position.side_to_move):
+        undo = position.make_move(move)
+        counts[move.to_str()] = perft(position, depth - 1)
+        position.unmake_move(undo)
+    return dict(sorted(counts.items()))
+
+
+def run_case(
+    case: PerftCase, max_depth: Optional[int] = None, backend: Optional[str] = None
+) -> Dict[str, Any]:
+    """Run ``case`` up to ``max_depth`` and return a JSON-serializable report."""
+
+    position = Position.from_fen(case.fen, backend=backend)
+    depth_limit = len(case.expected) if max_depth is None else min(max_depth, len(case.expected))
+    depths: List[Dict[str, Any]] = []
+    for depth in range(1, depth_limit + 1):
+        start = time.perf_counter()
+        nodes = perft(position, depth)
+        elapsed = time.perf_counter() - start
+        depths.append(
+            {
+                "depth": depth,
+                "nodes": nodes,
+                "expected": case.expected[depth - 1],
+                "ok": nodes == case.expected[depth - 1],
+                "seconds": round(elapsed, 6),
+                "nodes_per_second": round(nodes / elapsed) if elapsed > 0 else None,
+            }
+        )
+    return {"name": case.name, "fen": case.fen, "depths": depths}
+
+
+def run_suite(
+    cases: Sequence[PerftCase] = REFERENCE_SUITE,
+    max_depth: Optional[int] = None,
+    backend: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run every case and aggregate node counts, timing and correctness."""
+
+    reports = [run_case(case, max_depth, backend) for case in cases]
+    total_nodes = sum(entry["nodes"] for report in reports for entry in report["depths"])
+    total_seconds = sum(entry["seconds"] for report in reports for entry in report["depths"])
+    return {
+        "backend": backend,
+        "cases": reports,
+        "ok": all(entry["ok"] for report in reports for entry in report["depths"]),
+        "total_nodes": total_nodes,
+        "total_seconds": round(total_seconds, 6),
+        "nodes_per_second": round(total_nodes / total_seconds) if total_seconds > 0 else None,
+    }
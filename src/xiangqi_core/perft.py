@@ -0,0 +1,65 @@
+"""Command-line perft runner: ``python -m xiangqi_core.perft``.
+
+Without arguments the reference suite is run and a JSON report with node
+counts, per-depth timing and nodes/sec is printed; the exit status is
+non-zero if any node count differs from its reference value. ``--fen`` runs a
+single position instead, and ``--divide`` prints per-root-move counts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from typing import List, Optional
+
+from xiangqi_core.board import BACKENDS, Position
+from xiangqi_core.perf import REFERENCE_SUITE, divide, perft, run_suite
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m xiangqi_core.perft", description=__doc__)
+    parser.add_argument("--depth", type=int, default=None, help="maximum depth to search")
+    parser.add_argument("--fen", help="run a single position instead of the suite")
+    parser.add_argument("--divide", action="store_true", help="report counts per root move")
+    parser.add_argument("--case", action="append", help="suite case name (repeatable)")
+    parser.add_argument("--backend", choices=BACKENDS, default=None)
+    parser.add_argument("--indent", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    if args.fen is not None:
+        depth = args.depth or 1
+        position = Position.from_fen(args.fen, backend=args.backend)
+        start = time.perf_counter()
+        if args.divide:
+            moves = divide(position, depth)
+            nodes = sum(moves.values())
+        else:
+            moves = None
+            nodes = perft(position, depth)
+        elapsed = time.perf_counter() - start
+        report = {
+            "fen": args.fen,
+            "depth": depth,
+            "nodes": nodes,
+            "seconds": round(elapsed, 6),
+            "nodes_per_second": round(nodes / elapsed) if elapsed > 0 else None,
+        }
+        if moves is not None:
+            report["divide"] = moves
+        print(json.dumps(report, indent=args.indent))
+        return 0
+
+    cases = REFERENCE_SUITE
+    if args.case:
+        cases = tuple(case for case in REFERENCE_SUITE if case.name in set(args.case))
+        if not cases:
+            parser.error(f"unknown case(s): {', '.join(args.case)}")
+    report = run_suite(cases, max_depth=args.depth, backend=args.backend)
+    print(json.dumps(report, indent=args.indent))
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":  # pragma: no cover - script entrypoint
+    sys.exit(main())
@@ -0,0 +1,442 @@
+"""Streaming reader and writer for PGN-style Xiangqi game records.
+
+A record is a block of ``[Tag "value"]`` header lines followed by movetext::
+
+    [Event "Casual game"]
+    [Red "Alice"]
+    [Black "Bob"]
+    [Result "1-0"]
+    [Format "ICCS"]
+
+    1. H2-E2 H9-G7 2. H0-G2 I9-H9 1-0
+
+Moves may be written in ICCS (``H2-E2`` or ``h2e2``) or WXF (``C2.5``,
+``H8+7``, ``+R-1`` for the front of two rooks on a file, ``+7+1`` for the
+front pawn on file 7 when two files hold a pair of pawns); the notation is
+detected per move, so mixed files are accepted. A ``FEN`` header sets the
+starting position. Move numbers, ``{...}`` and ``;`` comments and ``(...)``
+variations are skipped.
+
+Readers consume the file line by line and yield one game at a time, so an
+archive of any size is processed in constant memory.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from xiangqi_core.board import Position, initial_position
+from xiangqi_core.coord import Coord
+from xiangqi_core.errors import ParseGameError, ParseMoveError, XiangqiError
+from xiangqi_core.fen import START_FEN
+from xiangqi_core.game import Game, GameResult
+from xiangqi_core.move import Move, _MOVES
+from xiangqi_core.piece import Piece
+from xiangqi_core.rules import is_pseudo_legal_move
+from xiangqi_core.types import PieceType, Side
+
+NOTATIONS = ("iccs", "wxf")
+
+RESULT_TOKENS: Dict[str, GameResult] = {
+    "1-0": GameResult.RED_WIN,
+    "0-1": GameResult.BLACK_WIN,
+    "1/2-1/2": GameResult.DRAW,
+    "*": GameResult.ONGOING,
+}
+_TOKENS_BY_RESULT = {result: token for token, result in RESULT_TOKENS.items()}
+
+_HEADER = re.compile(r'^\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]\s*$')
+_ICCS = re.compile(r"^[a-i][0-9]-?[a-i][0-9]$", re.IGNORECASE)
+_MOVE_NUMBER = re.compile(r"^\d+\.(\.\.)?$")
+_GLUED_NUMBER = re.compile(r"^\d+\.+")
+_SPECIAL = re.compile(r"[{};()]")
+
+_WXF_LETTERS: Dict[PieceType, str] = {
+    PieceType.KING: "K",
+    PieceType.ADVISOR: "A",
+    PieceType.ELEPHANT: "E",
+    PieceType.HORSE: "H",
+    PieceType.ROOK: "R",
+    PieceType.CANNON: "C",
+    PieceType.PAWN: "P",
+}
+_WXF_TYPES: Dict[str, PieceType] = {
+    **{letter: piece_type for piece_type, letter in _WXF_LETTERS.items()},
+    "B": PieceType.ELEPHANT,
+    "N": PieceType.HORSE,
+}
+_STRAIGHT_MOVERS = (PieceType.KING, PieceType.ROOK, PieceType.CANNON, PieceType.PAWN)
+_LINE_WIDTH = 80
+
+# Every geometric move by its lowercase ICCS string, skipping the parser.
+_ICCS_MOVES: Dict[str, Move] = {move.to_str(): move for move in _MOVES if move is not None}
+
+
+@dataclass
+class GameRecord:
+    """Headers, moves and result token of one game as read from a file.
+
+    ``error`` is only set by ``iter_records(strict=False)``, for a game that
+    could not be parsed; its ``moves`` are then empty.
+    """
+
+    headers: Dict[str, str] = field(default_factory=dict)
+    moves: List[Move] = field(default_factory=list)
+    result: str = "*"
+    error: Optional[str] = None
+
+    def start_position(self) -> Position:
+        """Return a fresh starting position (from the ``FEN`` header if any)."""
+
+        return _start_position(self.headers)
+
+
+def _start_position(headers: Dict[str, str]) -> Position:
+    fen = headers.get("FEN")
+    return Position.from_fen(fen) if fen else initial_position()
+
+
+def _file_number(x: int, side: Side) -> int:
+    """WXF file number: 1..9 counted from each player's right-hand side."""
+
+    return 9 - x if side is Side.RED else x + 1
+
+
+def _file_x(number: int, side: Side) -> int:
+    return 9 - number if side is Side.RED else number - 1
+
+
+def parse_wxf(position: Position, text: str) -> Move:
+    """Resolve the WXF move ``text`` against ``position``'s side to move."""
+
+    notation = text.strip().upper()
+    if len(notation) != 4 or notation[2] not in "+-.=" or not notation[3].isdigit():
+        raise ParseMoveError(f"Invalid WXF move: {text}")
+    side = position.side_to_move
+    forward = 1 if side is Side.RED else -1
+
+    if notation[0] in "+-" and notation[1].isdigit():
+        # "+7+1": the front pawn on file 7, used when two files hold tandem pawns.
+        tandem, letter, file_digit = notation[0], "P", notation[1]
+    elif notation[0] in "+-":
+        tandem, letter, file_digit = notation[0], notation[1], None
+    else:
+        tandem, letter, file_digit = None, notation[0], notation[1]
+    piece_type = _WXF_TYPES.get(letter)
+    if piece_type is None or (file_digit is not None and not "1" <= file_digit <= "9"):
+        raise ParseMoveError(f"Invalid WXF move: {text}")
+    piece = Piece.of(side, piece_type)
+
+    by_file: Dict[int, List[Coord]] = {}
+    for coord, occupant in position.board:
+        if occupant == piece:
+            by_file.setdefault(coord.x, []).append(coord)
+    if tandem is not None:
+        # Without a file digit, the move itself has to pick the doubled file.
+        candidates = []
+        for x, squares in by_file.items():
+            if file_digit is not None and x != _file_x(int(file_digit), side):
+                continue
+            if len(squares) == 2:
+                front, rear = sorted(squares, key=lambda coord: -coord.y * forward)
+                candidates.append(front if tandem == "+" else rear)
+        if not candidates:
+            raise ParseMoveError(f"Invalid tandem WXF move: {text}")
+    else:
+        candidates = by_file.get(_file_x(int(file_digit), side), [])  # type: ignore[arg-type]
+
+    operator = notation[2]
+    number = int(notation[3])
+    matches: List[Move] = []
+    for frm in candidates:
+        if piece_type in _STRAIGHT_MOVERS:
+            if operator in ".=":
+                x, y = _file_x(number, side), frm.y
+            else:
+                x, y = frm.x, frm.y + number * forward * (1 if operator == "+" else -1)
+        else:
+            if operator in ".=" or number == 0:
+                continue
+            x = _file_x(number, side)
+            dx = abs(x - frm.x)
+            if piece_type is PieceType.HORSE:
+                dy = {1: 2, 2: 1}.get(dx, 0)
+            else:
+                dy = 2 if piece_type is PieceType.ELEPHANT else 1
+            y = frm.y + dy * forward * (1 if operator == "+" else -1)
+        if not (0 <= x <= 8 and 0 <= y <= 9):
+            continue
+        move = Move.between(frm, Coord.at(x, y))
+        if is_pseudo_legal_move(position, move):
+            matches.append(move)
+    if not matches:
+        raise ParseMoveError(f"WXF move {text} does not match the position")
+    if len(matches) > 1 and tandem is not None:
+        raise ParseMoveError(f"Ambiguous tandem WXF move: {text}")
+    return matches[0]
+
+
+def _doubled_files(position: Position, piece: Piece) -> int:
+    counts: Dict[int, int] = {}
+    for coord, occupant in position.board:
+        if occupant == piece:
+            counts[coord.x] = counts.get(coord.x, 0) + 1
+    return sum(1 for count in counts.values() if count == 2)
+
+
+def format_wxf(position: Position, move: Move) -> str:
+    """Return the WXF notation of ``move`` in ``position``."""
+
+    piece = position.board.get(move.frm)
+    if piece is None:
+        raise ParseMoveError(f"No piece on {move.frm.to_str()}")
+    side = piece.side
+    forward = 1 if side is Side.RED else -1
+    letter = _WXF_LETTERS[piece.type]
+
+    prefix = f"{letter}{_file_number(move.frm.x, side)}"
+    # Advisors and elephants are told apart by where they move instead.
+    if piece.type not in (PieceType.ADVISOR, PieceType.ELEPHANT):
+        same_file = [
+            coord for coord, occupant in position.board if occupant == piece and coord.x == move.frm.x
+        ]
+        if len(same_file) == 2:
+            other = same_file[0] if same_file[1] == move.frm else same_file[1]
+            tandem = "+" if (move.frm.y - other.y) * forward > 0 else "-"
+            prefix = tandem + letter
+            if piece.type is PieceType.PAWN and _doubled_files(position, piece) > 1:
+                prefix = tandem + str(_file_number(move.frm.x, side))
+        elif len(same_file) > 2:
+            raise ParseMoveError("WXF notation for three or more pieces on a file is not supported")
+
+    dy = (move.to.y - move.frm.y) * forward
+    if dy == 0:
+        return f"{prefix}.{_file_number(move.to.x, side)}"
+    operator = "+" if dy > 0 else "-"
+    if piece.type in _STRAIGHT_MOVERS:
+        return f"{prefix}{operator}{abs(dy)}"
+    return f"{prefix}{operator}{_file_number(move.to.x, side)}"
+
+
+def _parse_iccs(token: str) -> Move:
+    text = token.replace("-", "").lower()
+    move = _ICCS_MOVES.get(text)
+    return move if move is not None else Move.from_str(text)
+
+
+def _tokenize(lines: Iterable[Tuple[int, str]]) -> Iterator[Tuple[int, str]]:
+    """Yield ``(line_number, token)`` from movetext, dropping comments."""
+
+    comment = False
+    depth = 0
+    for number, line in lines:
+        if not comment and depth == 0 and not _SPECIAL.search(line):
+            for token in line.split():
+                yield number, token
+            continue
+        position = 0
+        length = len(line)
+        while position < length:
+            char = line[position]
+            if comment:
+                end = line.find("}", position)
+                if end < 0:
+                    break
+                comment = False
+                position = end + 1
+            elif char == "{":
+                comment = True
+                position += 1
+            elif char == ";":
+                break
+            elif char == "(":
+                depth += 1
+                position += 1
+            elif char == ")":
+                depth = max(depth - 1, 0)
+                position += 1
+            elif char.isspace():
+                position += 1
+            else:
+                end = position
+                while end < length and not line[end].isspace() and line[end] not in "{;()":
+                    end += 1
+                if depth == 0:
+                    yield number, line[position:end]
+                position = end
+
+
+_Block = Tuple[Dict[str, str], List[Tuple[int, str]], Optional[str]]
+
+
+def _split_games(stream: Iterable[str]) -> Iterator[_Block]:
+    """Group lines into ``(headers, movetext lines, error)`` blocks, one per game.
+
+    A malformed header line does not stop the split: it is reported as the
+    block's error and the next game starts at the usual boundary.
+    """
+
+    headers: Dict[str, str] = {}
+    movetext: List[Tuple[int, str]] = []
+    error: Optional[str] = None
+    for number, line in enumerate(stream, start=1):
+        stripped = line.strip()
+        if stripped.startswith("["):
+            if movetext:
+                yield headers, movetext, error
+                headers, movetext, error = {}, [], None
+            match = _HEADER.match(stripped)
+            if match is None:
+                error = error or f"Line {number}: malformed header {stripped!r}"
+                continue
+            headers[match.group(1)] = match.group(2).replace('\\"', '"')
+        elif stripped:
+            movetext.append((number, line))
+            if stripped.split()[-1] in RESULT_TOKENS:
+                yield headers, movetext, error
+                headers, movetext, error = {}, [], None
+    if headers or movetext or error:
+        yield headers, movetext, error
+
+
+def _read_moves(
+    headers: Dict[str, str], movetext: List[Tuple[int, str]], game: Optional[Game]
+) -> Tuple[List[Move], str]:
+    """Decode the movetext, applying each move to ``game`` when given.
+
+    Without a game, ICCS moves are decoded without a board; a scratch
+    position is only built (and caught up) once a WXF move needs one.
+    """
+
+    moves: List[Move] = []
+    position = game.position if game is not None else None
+    result = headers.get("Result", "*")
+    for number, token in _tokenize(movetext):
+        if token in RESULT_TOKENS:
+            result = token
+            break
+        if _MOVE_NUMBER.match(token):
+            continue
+        # Tolerate move numbers glued to the move, as in "1.h2e2".
+        token = _GLUED_NUMBER.sub("", token)
+        try:
+            if _ICCS.match(token):
+                move = _parse_iccs(token)
+            else:
+                if position is None:
+                    position = _start_position(headers)
+                    for earlier in moves:
+                        position.make_move(earlier)
+                move = parse_wxf(position, token)
+            if game is not None:
+                game.apply_move(move)
+            elif position is not None:
+                position.make_move(move)
+        except XiangqiError as exc:
+            raise ParseGameError(f"Line {number}: {exc}") from exc
+        moves.append(move)
+    return moves, result
+
+
+def iter_records(stream: Iterable[str], strict: bool = True) -> Iterator[GameRecord]:
+    """Lazily yield a :class:`GameRecord` for every game in ``stream``.
+
+    Moves are replayed on a scratch position only when needed to resolve WXF
+    notation; no legality checks are made. A game that cannot be parsed
+    raises :class:`~xiangqi_core.errors.ParseGameError`; with
+    ``strict=False`` it is yielded with :attr:`GameRecord.error` set instead,
+    and reading goes on with the next game.
+    """
+
+    for headers, movetext, error in _split_games(stream):
+        try:
+            if error is not None:
+                raise ParseGameError(error)
+            moves, result = _read_moves(headers, movetext, None)
+        except ParseGameError as exc:
+            if strict:
+                raise
+            yield GameRecord(headers, [], headers.get("Result", "*"), str(exc))
+            continue
+        yield GameRecord(headers, moves, result)
+
+
+def iter_games(stream: Iterable[str]) -> Iterator[Game]:
+    """Lazily yield a :class:`Game` for every game in ``stream``.
+
+    Every move goes through :meth:`Game.apply_move`, so illegal moves raise
+    :class:`~xiangqi_core.errors.ParseGameError`. The headers are stored on
+    ``game.headers``.
+    """
+
+    for headers, movetext, error in _split_games(stream):
+        if error is not None:
+            raise ParseGameError(error)
+        game = Game(position=_start_position(headers))
+        game.headers = headers
+        _read_moves(headers, movetext, game)
+        yield game
+
+
+def format_record(record: GameRecord, notation: str = "iccs") -> str:
+    """Serialize ``record`` as PGN-style text ending with a blank line."""
+
+    if notation not in NOTATIONS:
+        raise ValueError(f"Unknown notation {notation!r}; expected one of {NOTATIONS}")
+    headers = dict(record.headers)
+    headers["Result"] = record.result
+    headers["Format"] = notation.upper()
+    lines = [
+        '[{} "{}"]'.format(tag, value.replace('"', '\\"')) for tag, value in headers.items()
+    ]
+    lines.append("")
+
+    position = record.start_position()
+    black_first = position.side_to_move is Side.BLACK
+    tokens: List[str] = []
+    for index, move in enumerate(record.moves):
+        ply = index + (1 if black_first else 0)
+        if ply % 2 == 0:
+            tokens.append(f"{ply // 2 + 1}.")
+        elif index == 0:
+            tokens.append("1...")
+        if notation == "wxf":
+            tokens.append(format_wxf(position, move))
+            position.make_move(move)
+        else:
+            tokens.append(f"{move.frm.to_str()}-{move.to.to_str()}".upper())
+    tokens.append(record.result)
+
+    line = ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > _LINE_WIDTH:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return "\n".join(lines) + "\n\n"
+
+
+def record_from_game(game: Game, headers: Optional[Dict[str, str]] = None) -> GameRecord:
+    """Build a :class:`GameRecord` for ``game``'s moves up to the current ply."""
+
+    merged = dict(game.headers)
+    merged.update(headers or {})
+    if game.start_fen != START_FEN:
+        merged.setdefault("FEN", game.start_fen)
+    return GameRecord(merged, list(game.history), _TOKENS_BY_RESULT[game.result])
+
+
+def write_records(
+    stream: TextIO, records: Iterable[GameRecord], notation: str = "iccs"
+) -> int:
+    """Write every record to ``stream`` and return the number written."""
+
+    count = 0
+    for record in records:
+        stream.write(format_record(record, notation))
+        count += 1
+    return count
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
 
 from xiangqi_core.types import PieceType, Side
 
@@ -16,3 +17,34 @@ class Piece:
 
     def __str__(self) -> str:
         return f"{self.side.value}:{self.type.value}"
+
+    @classmethod
+    def of(cls, side: Side, piece_type: PieceType) -> "Piece":
+        """Return the shared instance for ``side``'s ``piece_type``."""
+
+        return _INTERNED[side][piece_type]
+
+
+_PIECES_BY_CODE: Tuple[Optional[Piece], ...] = (None,) + tuple(
+    Piece(side, piece_type) for side in Side for piece_type in PieceType
+)
+_CODES_BY_PIECE: Dict[Piece, int] = {
+    piece: code for code, piece in enumerate(_PIECES_BY_CODE) if piece is not None
+}
+_INTERNED: Dict[Side, Dict[PieceType, Piece]] = {side: {} for side in Side}
+for _piece in _CODES_BY_PIECE:
+    _INTERNED[_piece.side][_piece.type] = _piece
+
+
+def encode_piece(piece: Optional[Piece]) -> int:
+    """Return the small-integer code for ``piece`` (``0`` means empty)."""
+
+    if piece is None:
+        return 0
+    return _CODES_BY_PIECE[piece]
+
+
+def decode_piece(code: int) -> Optional[Piece]:
+    """Return the piece for a code produced by :func:`encode_piece`."""
+
+    return _PIECES_BY_CODE[code]
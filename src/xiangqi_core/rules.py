@@ -22,7 +22,7 @@ def is_pseudo_legal_move(position: Position, move: Move) -> bool:
     if move.frm == move.to or not move.to.in_bounds():
         return False
 
-    target_piece = position.board.get(move.to)
+    target_piece = position.board.peek(move.to)
     if target_piece is not None and target_piece.side is piece.side:
         return False
 
@@ -55,7 +55,7 @@ def _is_cannon_move(position: Position, move: Move) -> bool:
         return False
 
     blockers = _count_blockers(position.board, move.frm, move.to)
-    target_piece = position.board.get(move.to)
+    target_piece = position.board.peek(move.to)
     if target_piece is None:
         return blockers == 0
     return blockers == 1
@@ -68,11 +68,11 @@ def _is_horse_move(position: Position, move: Move) -> bool:
         return False
 
     if abs(dx) == 2:
-        block_square = Coord(move.frm.x + dx // 2, move.frm.y)
+        block_square = Coord.at(move.frm.x + dx // 2, move.frm.y)
     else:
-        block_square = Coord(move.frm.x, move.frm.y + dy // 2)
+        block_square = Coord.at(move.frm.x, move.frm.y + dy // 2)
 
-    return position.board.get(block_square) is None
+    return position.board.peek(block_square) is None
 
 
 def _is_elephant_move(position: Position, move: Move, side: Side) -> bool:
@@ -86,8 +86,8 @@ def _is_elephant_move(position: Position, move: Move, side: Side) -> bool:
     if side is Side.BLACK and move.to.y < 5:
         return False
 
-    block_square = Coord(move.frm.x + dx // 2, move.frm.y + dy // 2)
-    return position.board.get(block_square) is None
+    block_square = Coord.at(move.frm.x + dx // 2, move.frm.y + dy // 2)
+    return position.board.peek(block_square) is None
 
 
 def _is_advisor_move(position: Position, move: Move, side: Side) -> bool:
@@ -130,7 +130,7 @@ def _count_blockers(board: Board, start: Coord, end: Coord) -> int:
     x, y = start.x + step_x, start.y + step_y
     blockers = 0
     while (x, y) != (end.x, end.y):
-        if board.get(Coord(x, y)) is not None:
+        if board.peek(Coord.at(x, y)) is not None:
             blockers += 1
         x += step_x
         y += step_y
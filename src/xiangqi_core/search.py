@@ -0,0 +1,341 @@
+"""Alpha-beta search with iterative deepening for an engine opponent.
+
+The searcher runs a negamax alpha-beta over :func:`generate_legal_moves`,
+deepening one ply at a time until the requested depth is reached or a time or
+node budget runs out. Leaf positions are resolved with a capture-only
+quiescence search so that scores are not taken in the middle of an exchange.
+Results are cached in a :class:`~xiangqi_core.tt.TranspositionTable` that
+lives as long as the searcher, so later moves of a game reuse earlier work.
+Leaves are scored by :func:`xiangqi_core.eval.evaluate`, which reads the
+board's incrementally maintained material and piece-square score. Moves are
+tried in the order of a :class:`~xiangqi_core.ordering.MoveOrderer`: hash
+move, MVV-LVA captures, killers, then quiet moves by history.
+
+Scores are in centipawn-like units from the point of view of the side to
+move. Mate scores are ``±(MATE_SCORE - ply)``; in Xiangqi a side without a
+legal move loses, so stalemate is scored like checkmate.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from xiangqi_core.attack import check_info
+from xiangqi_core.board import Board, Position
+from xiangqi_core.book import OpeningBook
+from xiangqi_core.eval import PIECE_VALUES, evaluate
+from xiangqi_core.legality import _leaves_king_in_check, generate_legal_moves
+from xiangqi_core.move import Move
+from xiangqi_core.movegen import generate_pseudo_legal_moves
+from xiangqi_core.ordering import MoveOrderer, mvv_lva
+from xiangqi_core.tt import Bound, TranspositionTable
+
+MATE_SCORE = 100_000
+INFINITY = 1_000_000
+MAX_PLY = 64
+DEFAULT_HASH_MB = 16.0
+
+_NODE_CHECK_INTERVAL = 1024
+# Stop requests are polled more often than the clock so they land within a
+# few milliseconds.
+_STOP_CHECK_INTERVAL = 64
+
+
+@dataclass
+class SearchResult:
+    """Outcome of a search: best move, its score and search statistics."""
+
+    best_move: Optional[Move]
+    score: int
+    depth: int
+    nodes: int
+    pv: List[Move] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def is_mate(self) -> bool:
+        return abs(self.score) >= MATE_SCORE - MAX_PLY
+
+
+class _SearchAborted(Exception):
+    """Raised inside the tree when the time or node budget is exhausted."""
+
+
+class Searcher:
+    """Iterative-deepening alpha-beta searcher.
+
+    The only state kept between :meth:`search` calls is the transposition
+    table, so one instance should be reused for every move of a game. Pass
+    ``hash_mb=0`` to search without a table. With an opening ``book``, book
+    positions are answered with the best book move without searching.
+    ``evaluator`` scores leaves from the side to move's view, for example
+    ``functools.partial(evaluate, mobility_term=True)``. ``ordering=False``
+    falls back to trying the hash move, then captures, then the rest, which
+    is only useful to measure what the move orderer saves.
+    """
+
+    def __init__(
+        self,
+        quiescence: bool = True,
+        hash_mb: float = DEFAULT_HASH_MB,
+        book: Optional[OpeningBook] = None,
+        evaluator: Callable[[Position], int] = evaluate,
+        ordering: bool = True,
+    ) -> None:
+        self.quiescence = quiescence
+        self.book = book
+        self.evaluator = evaluator
+        self.tt: Optional[TranspositionTable] = TranspositionTable(hash_mb) if hash_mb > 0 else None
+        self.orderer: Optional[MoveOrderer] = MoveOrderer(MAX_PLY) if ordering else None
+        self.nodes = 0
+        self._deadline: Optional[float] = None
+        self._node_limit: Optional[int] = None
+        self._stop_event: Optional[threading.Event] = None
+        self._pv: List[List[Move]] = [[] for _ in range(MAX_PLY + 1)]
+
+    def search(
+        self,
+        position: Position,
+        depth: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        node_limit: Optional[int] = None,
+        stop_event: Optional[threading.Event] = None,
+        on_iteration: Optional[Callable[[SearchResult], None]] = None,
+    ) -> SearchResult:
+        """Search ``position`` and return the best move found.
+
+        At least one of ``depth`` (plies), ``time_limit`` (seconds) or
+        ``node_limit`` should be given; without any, the search stops at
+        ``MAX_PLY``. Setting ``stop_event`` from another thread ends the
+        search like an exhausted budget: the result of the last completed
+        iteration is returned. ``on_iteration`` is called with that result
+        after every completed depth. ``position`` is restored before
+        returning.
+        """
+
+        start = time.perf_counter()
+        self.nodes = 0
+        self._deadline = start + time_limit if time_limit is not None else None
+        self._node_limit = node_limit
+        self._stop_event = stop_event
+        max_depth = min(depth, MAX_PLY) if depth is not None else MAX_PLY
+        if self.tt is not None:
+            self.tt.new_search()
+        if self.orderer is not None:
+            self.orderer.new_search()
+
+        root_moves = generate_legal_moves(position, position.side_to_move)
+        if not root_moves:
+            return SearchResult(None, -MATE_SCORE, 0, 0, elapsed=time.perf_counter() - start)
+        if self.book is not None:
+            book_move = self.book.choose(position)
+            if book_move in root_moves:
+                elapsed = time.perf_counter() - start
+                return SearchResult(book_move, 0, 0, 0, [book_move], elapsed)
+
+        if self.orderer is not None:
+            entry = self.tt.probe(position.key) if self.tt is not None else None
+            hash_move = entry.move if entry is not None else None
+            root_moves = self.orderer.order(position, root_moves, hash_move)
+
+        result = SearchResult(root_moves[0], 0, 0, 0, [root_moves[0]])
+        for current_depth in range(1, max_depth + 1):
+            try:
+                score, best_move = self._search_root(position, root_moves, current_depth)
+            except _SearchAborted:
+                break
+            pv = list(self._pv[0])
+            result = SearchResult(
+                best_move, score, current_depth, self.nodes, pv, time.perf_counter() - start
+            )
+            if on_iteration is not None:
+                on_iteration(result)
+            # Search the previous best move first in the next iteration.
+            root_moves.remove(best_move)
+            root_moves.insert(0, best_move)
+            if result.is_mate:
+                break
+
+        result.nodes = self.nodes
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def _search_root(
+        self, position: Position, moves: List[Move], depth: int
+    ) -> Tuple[int, Move]:
+        alpha, beta = -INFINITY, INFINITY
+        best_move = moves[0]
+        for move in moves:
+            undo = position.make_move(move)
+            try:
+                score = -self._negamax(position, depth - 1, -beta, -alpha, 1)
+            finally:
+                position.unmake_move(undo)
+            if score > alpha:
+                alpha = score
+                best_move = move
+                self._pv[0] = [move] + self._pv[1]
+        return alpha, best_move
+
+    def _negamax(self, position: Position, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self._count_node()
+        self._pv[ply] = []
+        if depth <= 0 or ply >= MAX_PLY:
+            if self.quiescence:
+                return self._quiescence(position, alpha, beta, ply)
+            return self.evaluator(position)
+
+        tt = self.tt
+        key = position.key
+        hash_move: Optional[Move] = None
+        if tt is not None:
+            entry = tt.probe(key)
+            if entry is not None:
+                hash_move = entry.move
+                if entry.depth >= depth:
+                    score = _score_from_tt(entry.score, ply)
+                    if entry.bound is Bound.EXACT:
+                        return min(max(score, alpha), beta)
+                    if entry.bound is Bound.LOWER and score >= beta:
+                        return beta
+                    if entry.bound is Bound.UPPER and score <= alpha:
+                        return alpha
+
+        orderer = self.orderer
+        moves: Iterable[Move]
+        if orderer is not None:
+            moves = orderer.staged_moves(position, hash_move, ply)
+        else:
+            moves = generate_legal_moves(position, position.side_to_move)
+            moves.sort(
+                key=lambda move: (move is not hash_move, position.board.peek(move.to) is None)
+            )
+
+        original_alpha = alpha
+        best_move: Optional[Move] = None
+        searched = 0
+        for move in moves:
+            searched += 1
+            undo = position.make_move(move)
+            try:
+                score = -self._negamax(position, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                position.unmake_move(undo)
+            if score >= beta:
+                if orderer is not None:
+                    orderer.record_cutoff(position, move, depth, ply)
+                if tt is not None:
+                    tt.store(key, depth, Bound.LOWER, _score_to_tt(beta, ply), move)
+                return beta
+            if score > alpha:
+                alpha = score
+                best_move = move
+                self._pv[ply] = [move] + self._pv[ply + 1]
+        if not searched:
+            return -MATE_SCORE + ply
+        if tt is not None:
+            bound = Bound.EXACT if alpha > original_alpha else Bound.UPPER
+            tt.store(key, depth, bound, _score_to_tt(alpha, ply), best_move)
+        return alpha
+
+    def _quiescence(self, position: Position, alpha: int, beta: int, ply: int) -> int:
+        side = position.side_to_move
+        board = position.board
+        info = check_info(position, side)
+        if info.in_check:
+            # A side in check may not stand pat: every evasion is searched,
+            # quiet ones included, so threats at the horizon are not missed.
+            moves = generate_legal_moves(position, side)
+            if not moves:
+                return -MATE_SCORE + ply
+            if ply >= MAX_PLY:
+                return self.evaluator(position)
+        else:
+            stand_pat = self.evaluator(position)
+            if stand_pat >= beta:
+                return beta
+            if stand_pat > alpha:
+                alpha = stand_pat
+            if ply >= MAX_PLY:
+                return alpha
+            moves = [
+                move
+                for move in generate_pseudo_legal_moves(position, side)
+                if board.peek(move.to) is not None
+                and not (
+                    info.needs_verification(move) and _leaves_king_in_check(position, move, side)
+                )
+            ]
+
+        # Captures first, biggest victim first; quiet evasions go last.
+        if self.orderer is not None:
+            moves.sort(key=lambda move: _capture_order(board, move), reverse=True)
+        else:
+            moves.sort(key=lambda move: _victim_value(board, move), reverse=True)
+        for move in moves:
+            self._count_node()
+            undo = position.make_move(move)
+            try:
+                score = -self._quiescence(position, -beta, -alpha, ply + 1)
+            finally:
+                position.unmake_move(undo)
+            if score >= beta:
+                return beta
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _count_node(self) -> None:
+        self.nodes += 1
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            raise _SearchAborted
+        if self._deadline is not None and self.nodes % _NODE_CHECK_INTERVAL == 0:
+            if time.perf_counter() >= self._deadline:
+                raise _SearchAborted
+        if self._stop_event is not None and self.nodes % _STOP_CHECK_INTERVAL == 0:
+            if self._stop_event.is_set():
+                raise _SearchAborted
+
+
+def _capture_order(board: Board, move: Move) -> int:
+    victim = board.peek(move.to)
+    if victim is None:
+        return -1
+    return mvv_lva(victim, board.peek(move.frm))  # type: ignore[arg-type]
+
+
+def _victim_value(board: Board, move: Move) -> int:
+    victim = board.peek(move.to)
+    return -1 if victim is None else PIECE_VALUES[victim.type]
+
+
+def _score_to_tt(score: int, ply: int) -> int:
+    """Make mate scores relative to the stored node rather than the root."""
+
+    if score >= MATE_SCORE - MAX_PLY:
+        return score + ply
+    if score <= -MATE_SCORE + MAX_PLY:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score: int, ply: int) -> int:
+    if score >= MATE_SCORE - MAX_PLY:
+        return score - ply
+    if score <= -MATE_SCORE + MAX_PLY:
+        return score + ply
+    return score
+
+
+def search(
+    position: Position,
+    depth: Optional[int] = None,
+    time_limit: Optional[float] = None,
+    node_limit: Optional[int] = None,
+) -> SearchResult:
+    """Convenience wrapper around :meth:`Searcher.search`."""
+
+    return Searcher().search(position, depth=depth, time_limit=time_limit, node_limit=node_limit)
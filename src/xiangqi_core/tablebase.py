@@ -0,0 +1,622 @@
+"""Retrograde endgame tablebases for small material.
+
+A table covers every placement of one material signature with either side to
+move. Signatures are written with FEN letters, red pieces in upper case
+first: ``KRk`` is king and rook against the bare king, ``KNPkaa`` king, horse
+and pawn against king and two advisors. A signature and its colour mirror
+(``KRk`` and ``Kkr``) share one table, stored for the side with the stronger
+material playing Red.
+
+Each entry is the distance to mate in plies from the side to move's point of
+view: odd distances win, even ones lose, and positions where neither side
+can force mate are draws. Repetition rules and the move limit are not
+modelled, and a side left without a legal move loses, mated or stalemated.
+
+Generation runs backwards from the mates. The forward pass that lists every
+position's moves is the expensive part and is split across worker
+processes; captures leave the table and are resolved by probing the smaller
+tables, which are generated first. Every table is one file of zlib-compressed
+16-bit entries, so even five-piece sets such as ``KRkaa`` take only tens of
+kilobytes on disk. Tables with two long-range pieces besides the kings reach
+tens of millions of entries and are not practical in pure Python.
+
+Command line::
+
+    python -m xiangqi_core.tablebase generate KRk KNPk --dir tables --workers 4
+    python -m xiangqi_core.tablebase probe --dir tables --fen "<FEN>"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from typing import DefaultDict, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from xiangqi_core.attack import is_in_check
+from xiangqi_core.board import Board, Position
+from xiangqi_core.coord import _COORDS
+from xiangqi_core.errors import XiangqiError
+from xiangqi_core.fen import _CHARS_BY_PIECE, _PIECES_BY_CHAR
+from xiangqi_core.legality import generate_legal_moves
+from xiangqi_core.move import Move
+from xiangqi_core.piece import Piece
+from xiangqi_core.types import PieceType, Side
+
+MAGIC = b"XQTB1\0\0\0"
+SUFFIX = ".xtb"
+_HEADER = struct.Struct("<8s16sQ")
+
+DEFAULT_CHUNK_SIZE = 4096
+
+# Stored entries: 0 is a draw, 0xFFFF a placement that cannot occur, and any
+# other value is the distance to mate in plies plus one.
+_DRAW = 0
+_INVALID = 0xFFFF
+
+_TYPE_ORDER = (
+    PieceType.KING,
+    PieceType.ADVISOR,
+    PieceType.ELEPHANT,
+    PieceType.HORSE,
+    PieceType.ROOK,
+    PieceType.CANNON,
+    PieceType.PAWN,
+)
+_RANK: Dict[Piece, int] = {
+    Piece.of(side, piece_type): rank
+    for rank, (side, piece_type) in enumerate(
+        (side, piece_type) for side in (Side.RED, Side.BLACK) for piece_type in _TYPE_ORDER
+    )
+}
+# Strongest first; decides which colour plays Red in a stored table.
+_STRENGTH = (
+    PieceType.ROOK,
+    PieceType.CANNON,
+    PieceType.HORSE,
+    PieceType.PAWN,
+    PieceType.ADVISOR,
+    PieceType.ELEPHANT,
+)
+
+
+def _red_squares(piece_type: PieceType) -> Tuple[Tuple[int, int], ...]:
+    if piece_type is PieceType.KING:
+        return tuple((x, y) for y in range(3) for x in range(3, 6))
+    if piece_type is PieceType.ADVISOR:
+        return ((3, 0), (5, 0), (4, 1), (3, 2), (5, 2))
+    if piece_type is PieceType.ELEPHANT:
+        return ((2, 0), (6, 0), (0, 2), (4, 2), (8, 2), (2, 4), (6, 4))
+    if piece_type is PieceType.PAWN:
+        return tuple(
+            (x, y) for y in range(3, 10) for x in range(9) if y >= 5 or x % 2 == 0
+        )
+    return tuple((x, y) for y in range(10) for x in range(9))
+
+
+def _domain(piece: Piece) -> Tuple[int, ...]:
+    """Squares ``piece`` can ever stand on, ascending."""
+
+    squares = _red_squares(piece.type)
+    if piece.side is Side.BLACK:
+        squares = tuple((x, 9 - y) for x, y in squares)
+    return tuple(sorted(y * 9 + x for x, y in squares))
+
+
+def _mirror_square(square: int) -> int:
+    return (9 - square // 9) * 9 + square % 9
+
+
+def _format_signature(pieces: Iterable[Piece]) -> str:
+    return "".join(_CHARS_BY_PIECE[piece] for piece in sorted(pieces, key=_RANK.__getitem__))
+
+
+def _mirror_signature(signature: str) -> str:
+    return _format_signature(_PIECES_BY_CHAR[char.swapcase()] for char in signature)
+
+
+def _strength(signature: str, side: Side) -> Tuple[int, ...]:
+    pieces = [_PIECES_BY_CHAR[char] for char in signature]
+    return tuple(
+        sum(1 for piece in pieces if piece.side is side and piece.type is piece_type)
+        for piece_type in _STRENGTH
+    )
+
+
+@lru_cache(maxsize=None)
+def canonical_signature(text: str) -> str:
+    """Return the signature under which the table for ``text`` is stored.
+
+    Raises ``ValueError`` unless ``text`` names exactly one king per side.
+    """
+
+    pieces = []
+    for char in text.strip():
+        piece = _PIECES_BY_CHAR.get(char)
+        if piece is None:
+            raise ValueError(f"Invalid piece letter in material signature: {text!r}")
+        pieces.append(piece)
+    kings = [piece.side for piece in pieces if piece.type is PieceType.KING]
+    if sorted(kings) != [Side.BLACK, Side.RED]:
+        raise ValueError(f"Material signature needs one king per side: {text!r}")
+    signature = _format_signature(pieces)
+    mirrored = _mirror_signature(signature)
+    red, black = _strength(signature, Side.RED), _strength(signature, Side.BLACK)
+    return signature if red >= black else mirrored
+
+
+def material_signature(position: Position) -> str:
+    """Return the material signature of ``position`` (not canonicalised)."""
+
+    return _format_signature(piece for _, piece in position.board)
+
+
+class _Layout:
+    """Mixed-radix indexing of every placement of a signature.
+
+    Pieces take one slot each, in signature order; each slot ranges over the
+    piece's domain and identical pieces must stand on ascending squares. The
+    lowest digit of an index is the side to move (``1`` for Black).
+    """
+
+    def __init__(self, signature: str) -> None:
+        self.signature = signature
+        self.pieces: Tuple[Piece, ...] = tuple(_PIECES_BY_CHAR[char] for char in signature)
+        self.domains = tuple(_domain(piece) for piece in self.pieces)
+        self.lookup: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(domain.index(square) if square in domain else -1 for square in range(90))
+            for domain in self.domains
+        )
+        self.slots: Dict[Piece, Tuple[int, int]] = {}
+        for slot, piece in enumerate(self.pieces):
+            start, _ = self.slots.get(piece, (slot, slot))
+            self.slots[piece] = (start, slot + 1)
+        self.size = 2
+        for domain in self.domains:
+            self.size *= len(domain)
+
+    def decode(self, index: int) -> Tuple[List[int], bool]:
+        black_to_move = bool(index & 1)
+        index >>= 1
+        squares = [0] * len(self.domains)
+        for slot in range(len(self.domains) - 1, -1, -1):
+            domain = self.domains[slot]
+            index, digit = divmod(index, len(domain))
+            squares[slot] = domain[digit]
+        return squares, black_to_move
+
+    def encode(self, squares: Sequence[int], black_to_move: bool) -> int:
+        """Index of ``squares`` (grouped and sorted), or -1 off the domains."""
+
+        index = 0
+        for slot, square in enumerate(squares):
+            digit = self.lookup[slot][square]
+            if digit < 0:
+                return -1
+            index = index * len(self.domains[slot]) + digit
+        return index * 2 + black_to_move
+
+    def canonical(self, squares: List[int]) -> List[int]:
+        """Sort the squares of each group of identical pieces in place."""
+
+        for start, stop in self.slots.values():
+            if stop - start > 1:
+                squares[start:stop] = sorted(squares[start:stop])
+        return squares
+
+    def is_canonical(self, squares: Sequence[int]) -> bool:
+        if len(set(squares)) != len(squares):
+            return False
+        return all(
+            squares[slot] < squares[slot + 1]
+            for start, stop in self.slots.values()
+            for slot in range(start, stop - 1)
+        )
+
+    def squares_of(self, pieces: Iterable[Tuple[Piece, int]]) -> Optional[List[int]]:
+        squares = [-1] * len(self.pieces)
+        filled = dict((piece, start) for piece, (start, _) in self.slots.items())
+        for piece, square in pieces:
+            slot = filled.get(piece)
+            if slot is None or slot >= self.slots[piece][1]:
+                return None
+            squares[slot] = square
+            filled[piece] = slot + 1
+        return self.canonical(squares)
+
+
+@lru_cache(maxsize=None)
+def _layout(signature: str) -> _Layout:
+    return _Layout(signature)
+
+
+class WDL(IntEnum):
+    """Game-theoretic value for the side to move."""
+
+    LOSS = -1
+    DRAW = 0
+    WIN = 1
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """Value of a position; ``dtm`` is the distance to mate in plies."""
+
+    wdl: WDL
+    dtm: Optional[int]
+
+
+def _result(entry: int) -> ProbeResult:
+    if entry == _DRAW:
+        return ProbeResult(WDL.DRAW, None)
+    dtm = entry - 1
+    return ProbeResult(WDL.WIN if dtm % 2 else WDL.LOSS, dtm)
+
+
+def table_path(directory: str, signature: str) -> str:
+    """Return the file holding the table for ``signature`` in ``directory``."""
+
+    return os.path.join(directory, canonical_signature(signature) + SUFFIX)
+
+
+def _write_table(path: str, signature: str, values: "array[int]") -> None:
+    if sys.byteorder == "big":  # pragma: no cover - files are little-endian
+        values = array("H", values)
+        values.byteswap()
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as stream:
+        stream.write(_HEADER.pack(MAGIC, signature.encode("ascii"), len(values)))
+        stream.write(zlib.compress(values.tobytes(), 6))
+    os.replace(temporary, path)
+
+
+def _read_table(path: str, signature: str) -> "array[int]":
+    with open(path, "rb") as stream:
+        data = stream.read()
+    if len(data) < _HEADER.size:
+        raise XiangqiError(f"Not a tablebase file: {path}")
+    magic, stored, count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or stored.rstrip(b"\0").decode("ascii", "replace") != signature:
+        raise XiangqiError(f"Not a tablebase file for {signature}: {path}")
+    values = array("H")
+    try:
+        values.frombytes(zlib.decompress(data[_HEADER.size :]))
+    except zlib.error as exc:
+        raise XiangqiError(f"Corrupt tablebase file: {path}") from exc
+    if len(values) != count or count != _layout(signature).size:
+        raise XiangqiError(f"Corrupt tablebase file: {path}")
+    if sys.byteorder == "big":  # pragma: no cover - files are little-endian
+        values.byteswap()
+    return values
+
+
+class Tablebase:
+    """Probe the tables stored in ``directory``, loading each on first use."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._tables: Dict[str, "array[int]"] = {}
+
+    def signatures(self) -> List[str]:
+        """Return the signatures with a table in the directory."""
+
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            name[: -len(SUFFIX)] for name in os.listdir(self.directory) if name.endswith(SUFFIX)
+        )
+
+    def _table(self, signature: str) -> Optional["array[int]"]:
+        table = self._tables.get(signature)
+        if table is None:
+            path = os.path.join(self.directory, signature + SUFFIX)
+            if not os.path.exists(path):
+                return None
+            table = self._tables[signature] = _read_table(path, signature)
+        return table
+
+    def _entry(self, pieces: List[Tuple[Piece, int]], black_to_move: bool) -> Optional[int]:
+        signature = _format_signature(piece for piece, _ in pieces)
+        try:
+            canonical = canonical_signature(signature)
+        except ValueError:
+            return None
+        if canonical != signature:
+            pieces = [
+                (Piece.of(piece.side.opponent(), piece.type), _mirror_square(square))
+                for piece, square in pieces
+            ]
+            black_to_move = not black_to_move
+        table = self._table(canonical)
+        if table is None:
+            return None
+        layout = _layout(canonical)
+        squares = layout.squares_of(pieces)
+        index = layout.encode(squares, black_to_move) if squares is not None else -1
+        return table[index] if index >= 0 else None
+
+    def probe(self, position: Position) -> Optional[ProbeResult]:
+        """Return the value of ``position`` for the side to move.
+
+        ``None`` means no table covers the material, or the placement cannot
+        arise because the side that just moved is in check.
+        """
+
+        pieces = [(piece, coord.y * 9 + coord.x) for coord, piece in position.board]
+        entry = self._entry(pieces, position.side_to_move is Side.BLACK)
+        if entry is None or entry == _INVALID:
+            return None
+        return _result(entry)
+
+    def best_move(self, position: Position) -> Optional[Move]:
+        """Return a move that keeps the value of ``position``.
+
+        Wins take the fastest mate, losses the slowest, and draws any move
+        that stays drawn. ``None`` without a covering table or legal move.
+        """
+
+        current = self.probe(position)
+        if current is None:
+            return None
+        best: Optional[Move] = None
+        best_dtm = 0
+        for move in generate_legal_moves(position, position.side_to_move):
+            undo = position.make_move(move)
+            reply = self.probe(position)
+            position.unmake_move(undo)
+            if reply is None or -reply.wdl != current.wdl:
+                continue
+            if current.wdl is WDL.DRAW:
+                return move
+            dtm = reply.dtm or 0
+            if best is None or (dtm < best_dtm if current.wdl is WDL.WIN else dtm > best_dtm):
+                best, best_dtm = move, dtm
+        return best
+
+
+# (first index, moves within the table per entry or _INVALID, their target
+#  indices, fastest win through a capture or 0, slowest capture into a lost
+#  position or -1, 1 where a capture reaches a draw)
+_Scan = Tuple[int, "array[int]", "array[int]", "array[int]", "array[int]", bytes]
+
+_WORKER_TABLES: Dict[str, Tablebase] = {}
+
+
+def _scan(signature: str, directory: str, start: int, stop: int) -> _Scan:
+    """Worker entry point: list the moves of entries ``start..stop``."""
+
+    tablebase = _WORKER_TABLES.get(directory)
+    if tablebase is None:
+        tablebase = _WORKER_TABLES[directory] = Tablebase(directory)
+    layout = _layout(signature)
+    pieces = layout.pieces
+    counts = array("H")
+    children = array("I")
+    exit_wins = array("H")
+    exit_losses = array("h")
+    exit_draws = bytearray()
+
+    for index in range(start, stop):
+        squares, black_to_move = layout.decode(index)
+        exit_wins.append(0)
+        exit_losses.append(-1)
+        exit_draws.append(0)
+        if not layout.is_canonical(squares):
+            counts.append(_INVALID)
+            continue
+        board = Board()
+        board._load_unchecked((_COORDS[square], piece) for square, piece in zip(squares, pieces))
+        side = Side.BLACK if black_to_move else Side.RED
+        position = Position(board, side)
+        if is_in_check(position, side.opponent()):
+            counts.append(_INVALID)
+            continue
+
+        count = 0
+        for move in generate_legal_moves(position, side):
+            code = move.code
+            frm, to = code >> 7, code & 0x7F
+            if board.peek(move.to) is None:
+                child = [to if square == frm else square for square in squares]
+                children.append(layout.encode(layout.canonical(child), not black_to_move))
+                count += 1
+                continue
+            after = [
+                (piece, to if square == frm else square)
+                for square, piece in zip(squares, pieces)
+                if square != to
+            ]
+            entry = tablebase._entry(after, not black_to_move)
+            if entry is None:
+                raise XiangqiError(f"Missing tablebase for {_format_signature(p for p, _ in after)}")
+            if entry == _DRAW:
+                exit_draws[-1] = 1
+            elif entry % 2:  # the opponent is mated in entry - 1 plies
+                if not exit_wins[-1] or entry < exit_wins[-1]:
+                    exit_wins[-1] = entry
+            elif entry - 1 > exit_losses[-1]:
+                exit_losses[-1] = entry - 1
+        counts.append(count)
+    return start, counts, children, exit_wins, exit_losses, bytes(exit_draws)
+
+
+def _retrograde(size: int, scans: Sequence[_Scan]) -> "array[int]":
+    """Resolve every entry from the move lists, shortest distances first."""
+
+    # Predecessors of each entry in compressed-row form.
+    offsets = array("I", [0]) * (size + 1)
+    for _, counts, children, _, _, _ in scans:
+        for child in children:
+            offsets[child + 1] += 1
+    for index in range(size):
+        offsets[index + 1] += offsets[index]
+    parents = array("I", [0]) * offsets[size]
+    fill = array("I", offsets)
+    for start, counts, children, _, _, _ in scans:
+        cursor = 0
+        for index, count in enumerate(counts, start):
+            if count == _INVALID:
+                continue
+            for child in children[cursor : cursor + count]:
+                parents[fill[child]] = index
+                fill[child] += 1
+            cursor += count
+
+    values = array("H", [0]) * size
+    remaining = array("H", [0]) * size
+    slowest = array("h", [-1]) * size
+    buckets: DefaultDict[int, List[int]] = defaultdict(list)
+    for start, counts, _, exit_wins, exit_losses, exit_draws in scans:
+        for offset, count in enumerate(counts):
+            index = start + offset
+            if count == _INVALID:
+                values[index] = _INVALID
+                continue
+            # Exits that are not lost keep the entry from ever being lost.
+            remaining[index] = count + exit_draws[offset] + (1 if exit_wins[offset] else 0)
+            slowest[index] = exit_losses[offset]
+            if exit_wins[offset]:
+                buckets[exit_wins[offset]].append(index)
+            if not remaining[index]:
+                buckets[slowest[index] + 1].append(index)
+
+    dtm = 0
+    while buckets:
+        for index in buckets.pop(dtm, ()):
+            if values[index]:
+                continue
+            if dtm + 1 >= _INVALID:
+                raise XiangqiError("Distance to mate exceeds the table format")
+            values[index] = dtm + 1
+            lost = dtm % 2 == 0
+            for parent in parents[offsets[index] : offsets[index + 1]]:
+                if values[parent]:
+                    continue
+                if lost:
+                    buckets[dtm + 1].append(parent)
+                    continue
+                if dtm > slowest[parent]:
+                    slowest[parent] = dtm
+                remaining[parent] -= 1
+                if not remaining[parent]:
+                    buckets[slowest[parent] + 1].append(parent)
+        dtm += 1
+    return values
+
+
+def _dependencies(signature: str, order: List[str]) -> List[str]:
+    """Append ``signature`` after every table its captures lead to."""
+
+    if signature in order:
+        return order
+    for position, char in enumerate(signature):
+        if char not in "Kk" and char not in signature[:position]:
+            _dependencies(canonical_signature(signature[:position] + signature[position + 1 :]), order)
+    order.append(signature)
+    return order
+
+
+def _generate_table(signature: str, directory: str, workers: int, chunk_size: int) -> None:
+    size = _layout(signature).size
+    ranges = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+    if workers == 1:
+        scans = [_scan(signature, directory, start, stop) for start, stop in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            scans = list(
+                executor.map(
+                    _scan,
+                    [signature] * len(ranges),
+                    [directory] * len(ranges),
+                    *zip(*ranges),
+                )
+            )
+    _write_table(table_path(directory, signature), signature, _retrograde(size, scans))
+
+
+def generate_tablebase(
+    signature: str,
+    directory: str,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[str]:
+    """Generate the table for ``signature`` and any missing smaller ones.
+
+    Tables already present in ``directory`` are reused. ``workers`` defaults
+    to the number of CPUs; with one worker everything runs in the calling
+    process. Returns the signatures written, smallest first.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(directory, exist_ok=True)
+    written = []
+    for needed in _dependencies(canonical_signature(signature), []):
+        if not os.path.exists(table_path(directory, needed)):
+            _generate_table(needed, directory, workers, chunk_size)
+            written.append(needed)
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m xiangqi_core.tablebase", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="build tables for material signatures")
+    generate.add_argument("signatures", nargs="+")
+    generate.add_argument("--dir", default="tablebases")
+    generate.add_argument("--workers", type=int, default=None)
+    generate.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    probe = commands.add_parser("probe", help="look a position up")
+    probe.add_argument("--dir", default="tablebases")
+    probe.add_argument("--fen", required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        report = []
+        for signature in args.signatures:
+            start = time.perf_counter()
+            written = generate_tablebase(signature, args.dir, args.workers, args.chunk_size)
+            report.append(
+                {
+                    "signature": canonical_signature(signature),
+                    "written": written,
+                    "seconds": round(time.perf_counter() - start, 3),
+                }
+            )
+        print(json.dumps(report, indent=2))
+        return 0
+
+    position = Position.from_fen(args.fen)
+    tablebase = Tablebase(args.dir)
+    result = tablebase.probe(position)
+    if result is None:
+        print(json.dumps({"signature": material_signature(position), "found": False}))
+        return 1
+    best = tablebase.best_move(position)
+    print(
+        json.dumps(
+            {
+                "signature": material_signature(position),
+                "found": True,
+                "wdl": result.wdl.name.lower(),
+                "dtm": result.dtm,
+                "best_move": best.to_str() if best is not None else None,
+            }
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - script entrypoint
+    sys.exit(main())
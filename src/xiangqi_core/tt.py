@@ -0,0 +1,166 @@
+"""Fixed-size transposition table for the search.
+
+The table is two preallocated ``array('Q')`` columns, one holding the 64-bit
+position keys and one holding the packed entry data, so its footprint is set
+once from the megabyte budget and never grows however long a game runs.
+
+Slots are grouped in buckets of two. The first slot is depth-preferred: it is
+only overwritten by a search at least as deep, by the same position, or once
+its entry is left over from an earlier search. The second slot always takes
+whatever the first one refused.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Dict, Optional
+
+from xiangqi_core.move import Move
+
+ENTRY_BYTES = 16
+"""Bytes per slot: an 8-byte key plus 8 bytes of packed data."""
+
+_BUCKET_SLOTS = 2
+
+# Packed data layout, least significant bits first:
+#   move code (14 bits, 0 for none) | bound (2) | depth (8) | age (8) | score + offset (22)
+_MOVE_MASK = (1 << 14) - 1
+_BOUND_SHIFT = 14
+_DEPTH_SHIFT = 16
+_AGE_SHIFT = 24
+_SCORE_SHIFT = 32
+_SCORE_OFFSET = 1 << 21
+_MAX_DEPTH = 0xFF
+
+
+class Bound(IntEnum):
+    """How a stored score relates to the true value of the position."""
+
+    EXACT = 1
+    LOWER = 2
+    UPPER = 3
+
+
+@dataclass(frozen=True, slots=True)
+class TTEntry:
+    """A decoded table entry."""
+
+    depth: int
+    bound: Bound
+    score: int
+    move: Optional[Move]
+
+
+class TranspositionTable:
+    """Bounded hash table of search results keyed by ``Position.key``."""
+
+    def __init__(self, size_mb: float = 16.0) -> None:
+        if size_mb <= 0:
+            raise ValueError("Transposition table size must be positive")
+        buckets = max(1, int(size_mb * 1024 * 1024) // (ENTRY_BYTES * _BUCKET_SLOTS))
+        self._buckets = buckets
+        self._keys = array("Q", [0]) * (buckets * _BUCKET_SLOTS)
+        self._data = array("Q", [0]) * (buckets * _BUCKET_SLOTS)
+        self._age = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    @property
+    def capacity(self) -> int:
+        """Number of entry slots."""
+
+        return len(self._keys)
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes held by the preallocated key and data arrays."""
+
+        return self.capacity * ENTRY_BYTES
+
+    def new_search(self) -> None:
+        """Mark existing entries as stale so deep slots can be reclaimed."""
+
+        self._age = (self._age + 1) & 0xFF
+
+    def clear(self) -> None:
+        """Empty the table and reset the counters."""
+
+        self._keys = array("Q", [0]) * self.capacity
+        self._data = array("Q", [0]) * self.capacity
+        self._age = 0
+        self.hits = self.misses = self.collisions = 0
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        """Return the entry stored for ``key``, or ``None``."""
+
+        slot = (key % self._buckets) * _BUCKET_SLOTS
+        keys = self._keys
+        data = self._data
+        for index in (slot, slot + 1):
+            packed = data[index]
+            if packed and keys[index] == key:
+                self.hits += 1
+                code = packed & _MOVE_MASK
+                return TTEntry(
+                    depth=(packed >> _DEPTH_SHIFT) & 0xFF,
+                    bound=Bound((packed >> _BOUND_SHIFT) & 0x3),
+                    score=(packed >> _SCORE_SHIFT) - _SCORE_OFFSET,
+                    move=Move.from_code(code) if code else None,
+                )
+        self.misses += 1
+        return None
+
+    def store(
+        self, key: int, depth: int, bound: Bound, score: int, move: Optional[Move] = None
+    ) -> None:
+        """Record a search result for ``key``.
+
+        ``score`` must fit in 22 signed bits; ``depth`` is clamped to 0..255.
+        """
+
+        depth = min(max(depth, 0), _MAX_DEPTH)
+        packed = (
+            (move.code if move is not None else 0)
+            | (int(bound) << _BOUND_SHIFT)
+            | (depth << _DEPTH_SHIFT)
+            | (self._age << _AGE_SHIFT)
+            | ((score + _SCORE_OFFSET) << _SCORE_SHIFT)
+        )
+        slot = (key % self._buckets) * _BUCKET_SLOTS
+        keys = self._keys
+        data = self._data
+
+        previous = data[slot]
+        if (
+            not previous
+            or keys[slot] == key
+            or depth >= (previous >> _DEPTH_SHIFT) & 0xFF
+            or (previous >> _AGE_SHIFT) & 0xFF != self._age
+        ):
+            index = slot
+        else:
+            index = slot + 1
+            previous = data[index]
+        if previous and keys[index] != key:
+            self.collisions += 1
+        keys[index] = key
+        data[index] = packed
+
+    def hashfull(self) -> int:
+        """Permille of slots filled by the current search (sampled)."""
+
+        sample = min(self.capacity, 1000)
+        used = sum(
+            1
+            for index in range(sample)
+            if self._data[index] and (self._data[index] >> _AGE_SHIFT) & 0xFF == self._age
+        )
+        return used * 1000 // sample
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit, miss and collision counters."""
+
+        return {"hits": self.hits, "misses": self.misses, "collisions": self.collisions}
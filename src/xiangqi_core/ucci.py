@@ -0,0 +1,283 @@
+"""UCCI engine front end over stdin/stdout.
+
+Run as ``python -m xiangqi_core.ucci`` and drive it like any UCCI engine::
+
+    ucci
+    position fen rnbakabnr/9/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/9/RNBAKABNR w - - 0 1 moves h2e2
+    go depth 6
+    stop
+    quit
+
+Supported commands are ``ucci``, ``isready``, ``setoption hashsize <mb>``,
+``position {fen <fen> | startpos} [moves ...]``, ``go [depth
+<n> | nodes <n> | time <ms> [movestogo <n> | increment <ms>] | movetime <ms>
+| infinite]``, ``stop`` and ``quit``. Every completed iteration prints an
+``info depth ... score ... time ... nodes ... pv ...`` line and the search
+ends with ``bestmove <move>`` or ``nobestmove``.
+
+The search runs on a worker thread while the command loop keeps reading, so
+``stop`` takes effect within a few milliseconds. A ``position`` command whose
+move list extends or shortens the previous one from the same start is
+applied incrementally with make/unmake instead of being replayed.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from typing import List, Optional, TextIO
+
+from xiangqi_core.attack import has_both_kings, is_in_check
+from xiangqi_core.board import Position, UndoInfo, initial_position
+from xiangqi_core.errors import XiangqiError
+from xiangqi_core.fen import START_FEN
+from xiangqi_core.legality import generate_legal_moves
+from xiangqi_core.move import Move
+from xiangqi_core.search import DEFAULT_HASH_MB, SearchResult, Searcher
+
+ENGINE_NAME = "xiangqi-core"
+ENGINE_AUTHOR = "Xiangqi Coach Team"
+
+# Share of the remaining clock spent on one move when no move count is given.
+_DEFAULT_MOVES_TO_GO = 30
+
+# The hashsize range advertised in reply to ``ucci``, in MB.
+HASH_MB_MIN = 0
+HASH_MB_MAX = 1024
+
+
+class UcciEngine:
+    """Command interpreter; :meth:`handle` processes one input line."""
+
+    def __init__(self, output: TextIO = sys.stdout, hash_mb: float = DEFAULT_HASH_MB) -> None:
+        self.output = output
+        self.searcher = Searcher(hash_mb=hash_mb)
+        self.position = initial_position()
+        self._start_fen = START_FEN
+        self._moves: List[Move] = []
+        self._undos: List[UndoInfo] = []
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._write_lock = threading.Lock()
+
+    def send(self, line: str) -> None:
+        with self._write_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    @property
+    def searching(self) -> bool:
+        return self._worker is not None and self._worker.is_alive()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until the current search (if any) has printed its best move."""
+
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def handle(self, line: str) -> bool:
+        """Process one command; returns ``False`` once ``quit`` is received."""
+
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == "quit":
+            self._stop_search()
+            self.send("bye")
+            return False
+        if command == "stop":
+            self._stop_search()
+        elif command == "ucci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(
+                f"option hashsize type spin min {HASH_MB_MIN} max {HASH_MB_MAX} "
+                f"default {int(DEFAULT_HASH_MB)}"
+            )
+            self.send("ucciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif self.searching:
+            self.send(f"info string ignored while searching: {command}")
+        elif command == "setoption":
+            self._set_option(args)
+        elif command == "position":
+            self._set_position(args)
+        elif command == "go":
+            self._go(args)
+        else:
+            self.send(f"info string unknown command: {command}")
+        return True
+
+    def run(self, stream: TextIO) -> None:
+        """Read commands from ``stream`` until ``quit`` or end of input."""
+
+        for line in stream:
+            if not self.handle(line):
+                return
+        self._stop_search()
+
+    def _stop_search(self) -> None:
+        self._stop.set()
+        self.wait()
+
+    def _set_option(self, args: List[str]) -> None:
+        # UCCI writes ``setoption <name> <value>``; accept the UCI form too.
+        words = [word for word in args if word not in ("name", "value")]
+        if len(words) >= 2 and words[0].lower() == "hashsize":
+            try:
+                hash_mb = float(words[1])
+            except ValueError:
+                self.send(f"info string invalid hashsize: {words[1]}")
+                return
+            if not HASH_MB_MIN <= hash_mb <= HASH_MB_MAX:
+                self.send(f"info string hashsize must be {HASH_MB_MIN} to {HASH_MB_MAX}")
+                return
+            self.searcher = Searcher(hash_mb=hash_mb)
+        else:
+            self.send(f"info string unsupported option: {' '.join(args)}")
+
+    def _set_position(self, args: List[str]) -> None:
+        if "moves" in args:
+            split = args.index("moves")
+            setup, move_texts = args[:split], args[split + 1 :]
+        else:
+            setup, move_texts = args, []
+        if setup[:1] == ["startpos"]:
+            fen = START_FEN
+        elif setup[:1] == ["fen"] and len(setup) > 1:
+            fen = " ".join(setup[1:])
+        else:
+            self.send("info string position needs 'fen <fen>' or 'startpos'")
+            return
+        saved = (self.position, self._start_fen, self._moves, self._undos)
+        try:
+            moves = [Move.from_str(text) for text in move_texts]
+            if fen != self._start_fen:
+                position = Position.from_fen(fen)
+                # Legal play from here can then never capture a king.
+                if not has_both_kings(position) or is_in_check(
+                    position, position.side_to_move.opponent()
+                ):
+                    self.send("info string illegal position: a king is missing or can be captured")
+                    return
+                self.position, self._start_fen = position, fen
+                self._moves, self._undos = [], []
+        except XiangqiError as exc:
+            self.send(f"info string {exc}")
+            return
+        same_start = self.position is saved[0]
+        if same_start:
+            self._moves, self._undos = list(self._moves), list(self._undos)
+
+        # Keep the common prefix of the old and new move lists, take back the
+        # rest and play only the new tail.
+        common = 0
+        for old, new in zip(self._moves, moves):
+            if old != new:
+                break
+            common += 1
+        while len(self._moves) > common:
+            self.position.unmake_move(self._undos.pop())
+            self._moves.pop()
+        for move in moves[common:]:
+            if move not in generate_legal_moves(self.position, self.position.side_to_move):
+                self.send(f"info string illegal move {move.to_str()}")
+                # A rejected command leaves the previous position in place.
+                if not same_start:
+                    self.position, self._start_fen, self._moves, self._undos = saved
+                    return
+                while len(self._moves) > common:
+                    self.position.unmake_move(self._undos.pop())
+                    self._moves.pop()
+                for previous in saved[2][common:]:
+                    self._undos.append(self.position.make_move(previous))
+                    self._moves.append(previous)
+                return
+            self._undos.append(self.position.make_move(move))
+            self._moves.append(move)
+
+    def _go(self, args: List[str]) -> None:
+        options = {}
+        infinite = False
+        index = 0
+        while index < len(args):
+            word = args[index]
+            if word in ("infinite", "ponder", "draw"):
+                infinite = infinite or word != "draw"
+                index += 1
+                continue
+            if index + 1 < len(args):
+                try:
+                    options[word] = int(args[index + 1])
+                except ValueError:
+                    self.send(f"info string invalid value for {word}: {args[index + 1]}")
+                    return
+            index += 2
+
+        depth = options.get("depth")
+        node_limit = options.get("nodes")
+        time_limit: Optional[float] = None
+        if "movetime" in options:
+            time_limit = options["movetime"] / 1000
+        elif "time" in options:
+            moves_to_go = options.get("movestogo") or _DEFAULT_MOVES_TO_GO
+            time_limit = options["time"] / 1000 / moves_to_go + options.get("increment", 0) / 1000
+        if infinite:
+            depth, node_limit, time_limit = None, None, None
+
+        # Search a copy so the command thread keeps its own position and undo
+        # stack untouched while the worker makes and unmakes moves.
+        position = Position.from_fen(self.position.to_fen())
+        self._stop.clear()
+        self._worker = threading.Thread(
+            target=self._search,
+            args=(position, depth, time_limit, node_limit),
+            name="ucci-search",
+            daemon=True,
+        )
+        self._worker.start()
+
+    def _search(
+        self,
+        position: Position,
+        depth: Optional[int],
+        time_limit: Optional[float],
+        node_limit: Optional[int],
+    ) -> None:
+        try:
+            result = self.searcher.search(
+                position,
+                depth=depth,
+                time_limit=time_limit,
+                node_limit=node_limit,
+                stop_event=self._stop,
+                on_iteration=self._report,
+            )
+        except Exception as exc:
+            # The GUI waits for a reply to every go, so always send one.
+            self.send(f"info string search failed: {exc}")
+            self.send("nobestmove")
+            return
+        if result.best_move is None:
+            self.send("nobestmove")
+        else:
+            self.send(f"bestmove {result.best_move.to_str()}")
+
+    def _report(self, result: SearchResult) -> None:
+        pv = " ".join(move.to_str() for move in result.pv)
+        self.send(
+            f"info depth {result.depth} score {result.score} "
+            f"time {int(result.elapsed * 1000)} nodes {result.nodes} pv {pv}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    engine = UcciEngine()
+    engine.run(sys.stdin)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - script entrypoint
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Deterministic 64-bit Zobrist keys for Xiangqi positions.
+
+The key tables are derived from a fixed seed with SplitMix64, so the same
+position always hashes to the same key in every process and Python version.
+That makes keys safe to persist (opening books, transposition table dumps).
+
+:class:`~xiangqi_core.board.Board` keeps the piece component of the key up to
+date as pieces are placed, removed and moved; ``Position.key`` folds in the
+side to move. Setting ``XIANGQI_ZOBRIST_DEBUG=1`` (or calling
+:func:`set_debug_verification`) makes every ``make_move``/``unmake_move``
+assert the incremental key against a from-scratch recomputation.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Iterable, List, Tuple
+
+from xiangqi_core.coord import Coord
+from xiangqi_core.piece import Piece, encode_piece
+from xiangqi_core.types import Side
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from xiangqi_core.board import Position
+
+_SEED = 0x584951414E475149  # "XIANGQI"
+_MASK64 = (1 << 64) - 1
+
+
+def _splitmix64(seed: int) -> Iterable[int]:
+    state = seed
+    while True:
+        state = (state + 0x9E3779B97F4A7C15) & _MASK64
+        value = state
+        value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+        yield value ^ (value >> 31)
+
+
+def _build_tables() -> Tuple[Tuple[Tuple[int, ...], ...], int]:
+    stream = iter(_splitmix64(_SEED))
+    # Row 0 belongs to the "empty" piece code and stays all zeros.
+    rows: List[Tuple[int, ...]] = [(0,) * 90]
+    for _ in range(14):
+        rows.append(tuple(next(stream) for _ in range(90)))
+    return tuple(rows), next(stream)
+
+
+PIECE_SQUARE_KEYS, SIDE_KEY = _build_tables()
+"""``PIECE_SQUARE_KEYS[piece_code][square_index]`` and the black-to-move key."""
+
+_debug_verification = os.environ.get("XIANGQI_ZOBRIST_DEBUG", "") not in ("", "0")
+
+
+def piece_key(piece: Piece, coord: Coord) -> int:
+    """Return the key contribution of ``piece`` standing on ``coord``."""
+
+    return PIECE_SQUARE_KEYS[encode_piece(piece)][coord.y * 9 + coord.x]
+
+
+def compute_board_key(pieces: Iterable[Tuple[Coord, Piece]]) -> int:
+    """Compute the piece component of a key from scratch."""
+
+    key = 0
+    for coord, piece in pieces:
+        key ^= piece_key(piece, coord)
+    return key
+
+
+def compute_key(position: "Position") -> int:
+    """Compute the full key of ``position`` from scratch."""
+
+    key = compute_board_key(position.board)
+    if position.side_to_move is Side.BLACK:
+        key ^= SIDE_KEY
+    return key
+
+
+def set_debug_verification(enabled: bool) -> None:
+    """Enable or disable from-scratch verification of incremental keys."""
+
+    global _debug_verification
+    _debug_verification = enabled
+
+
+def debug_verification_enabled() -> bool:
+    """Return ``True`` if incremental keys are verified on every move."""
+
+    return _debug_verification
+
+
+def verify_key(position: "Position") -> None:
+    """Raise ``AssertionError`` if ``position.key`` disagrees with a recomputation."""
+
+    expected = compute_key(position)
+    if position.key != expected:
+        raise AssertionError(
+            f"Zobrist key drift: incremental {position.key:#018x} != recomputed {expected:#018x}"
+        )
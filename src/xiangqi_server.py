@@ -0,0 +1,685 @@
+"""Asyncio HTTP/WebSocket game server backed by ``xiangqi_core``.
+
+The server uses only the standard library and keeps one :class:`Session`
+per game in memory:
+
+* ``GET /`` serves ``frontend/index.html``;
+* ``POST /games`` creates a session (optional JSON body ``{"fen": ...}``);
+* ``GET /games/<id>`` returns the session state;
+* ``POST /games/<id>/moves`` applies ``{"move": "h2e2"}``;
+* ``DELETE /games/<id>`` closes the session;
+* ``GET /games/<id>/ws`` upgrades to a WebSocket.
+
+WebSocket clients send ``{"type": "move", "move": "h2e2"}`` or
+``{"type": "engine", "depth": 3}``, and ``{"type": "state"}`` asks for the
+full state again. Each applied move is pushed to every subscriber of the
+session as a ``delta`` message. A delta carries the changed
+squares, the check flag, the result and the next side's legal moves. Failures
+go back to the sender only, as ``{"type": "error", "message": ...}``.
+
+Legality checks, result detection and engine searches run on a bounded
+thread pool. The event loop only parses requests and writes replies, so one
+long search does not hold up the other games. Each session's lock serialises
+the moves played in that game and the state reads that see them.
+
+Run from the repository root::
+
+    PYTHONPATH=src python src/xiangqi_server.py --port 8000 --workers 4
+
+Like the CLI demo, this module stays outside the core package.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import re
+import secrets
+import struct
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar
+
+from xiangqi_core import (
+    Game,
+    GameOverError,
+    GameResult,
+    Move,
+    Position,
+    XiangqiError,
+    has_both_kings,
+    initial_position,
+    is_in_check,
+)
+from xiangqi_core.fen import _CHARS_BY_PIECE
+from xiangqi_core.search import Searcher
+
+T = TypeVar("T")
+
+_log = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 64
+DEFAULT_MAX_SESSIONS = 10000
+
+ENGINE_HASH_MB = 4.0
+MAX_ENGINE_DEPTH = 6
+DEFAULT_ENGINE_TIME = 1.0
+
+_MAX_HEADER = 16 * 1024
+_MAX_BODY = 64 * 1024
+_WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC11B65"
+_OP_TEXT, _OP_CLOSE, _OP_PING, _OP_PONG = 0x1, 0x8, 0x9, 0xA
+
+_STATIC_ROOT = Path(__file__).resolve().parent.parent / "frontend"
+_GAME_PATH = re.compile(r"^/games/([0-9a-f]+)(/moves|/ws)?$")
+_REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    """Aborts a request with an HTTP status and a message."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class Request:
+    """A parsed HTTP request."""
+
+    method: str
+    path: str
+    headers: Dict[str, str]
+    body: bytes
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get("connection", "").lower() != "close"
+
+    def json(self) -> Dict[str, Any]:
+        if not self.body:
+            return {}
+        try:
+            payload = json.loads(self.body)
+        except ValueError as exc:
+            raise HttpError(400, f"Invalid JSON body: {exc}") from exc
+        if not isinstance(payload, dict):
+            raise HttpError(400, "JSON body must be an object")
+        return payload
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """Read one request from ``reader``, or ``None`` when the peer closed."""
+
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as exc:
+        if not exc.partial.strip():
+            return None
+        raise HttpError(400, "Truncated request") from exc
+    except asyncio.LimitOverrunError as exc:
+        raise HttpError(413, "Request header too large") from exc
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _version = lines[0].split(" ", 2)
+    except ValueError as exc:
+        raise HttpError(400, "Malformed request line") from exc
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", "0") or 0)
+    except ValueError as exc:
+        raise HttpError(400, "Invalid Content-Length") from exc
+    if length < 0:
+        raise HttpError(400, "Invalid Content-Length")
+    if length > _MAX_BODY:
+        raise HttpError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return Request(method.upper(), target.split("?", 1)[0], headers, body)
+
+
+def _encode_response(status: int, payload: Any, keep_alive: bool) -> bytes:
+    if isinstance(payload, bytes):
+        body, content_type = payload, "text/html; charset=utf-8"
+    else:
+        body, content_type = json.dumps(payload).encode(), "application/json"
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+class WebSocketClosed(Exception):
+    """Raised when sending on a WebSocket whose peer has gone away."""
+
+
+class WebSocket:
+    """One end of an RFC 6455 connection carrying text messages.
+
+    Servers send unmasked frames and clients masked ones, so pass
+    ``mask=True`` on the client side.
+    """
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, mask: bool = False
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.mask = mask
+        self.closed = False
+
+    async def send(self, text: str) -> None:
+        await self._send_frame(_OP_TEXT, text.encode())
+
+    async def receive(self) -> Optional[str]:
+        """Return the next text message, or ``None`` once the connection closes."""
+
+        fragments: List[bytes] = []
+        while not self.closed:
+            try:
+                fin, opcode, payload = await self._read_frame()
+            except (asyncio.IncompleteReadError, ConnectionError):
+                self.closed = True
+                return None
+            if opcode == _OP_CLOSE:
+                await self.close()
+                return None
+            if opcode == _OP_PING:
+                await self._send_frame(_OP_PONG, payload)
+                continue
+            if opcode == _OP_PONG:
+                continue
+            fragments.append(payload)
+            if sum(len(fragment) for fragment in fragments) > _MAX_BODY:
+                await self.close(1009)
+                return None
+            if fin:
+                return b"".join(fragments).decode("utf-8", errors="replace")
+        return None
+
+    async def close(self, code: int = 1000) -> None:
+        if self.closed:
+            return
+        try:
+            await self._send_frame(_OP_CLOSE, struct.pack("!H", code))
+        except WebSocketClosed:
+            pass
+        self.closed = True
+        self.writer.close()
+
+    async def _send_frame(self, opcode: int, payload: bytes) -> None:
+        if self.writer.is_closing():
+            raise WebSocketClosed("connection closed")
+        length = len(payload)
+        mask_bit = 0x80 if self.mask else 0
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, mask_bit | length)
+        elif length < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, mask_bit | 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, mask_bit | 127, length)
+        if self.mask:
+            key = secrets.token_bytes(4)
+            header += key
+            payload = _apply_mask(payload, key)
+        try:
+            self.writer.write(header + payload)
+            await self.writer.drain()
+        except ConnectionError as exc:
+            self.closed = True
+            raise WebSocketClosed(str(exc)) from exc
+
+    async def _read_frame(self) -> Tuple[bool, int, bytes]:
+        first, second = await self.reader.readexactly(2)
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", await self.reader.readexactly(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", await self.reader.readexactly(8))
+        if length > _MAX_BODY:
+            raise ConnectionError("WebSocket frame too large")
+        key = await self.reader.readexactly(4) if second & 0x80 else b""
+        payload = await self.reader.readexactly(length)
+        if key:
+            payload = _apply_mask(payload, key)
+        opcode = first & 0x0F
+        return bool(first & 0x80), opcode, payload
+
+
+def _apply_mask(data: bytes, key: bytes) -> bytes:
+    """XOR ``data`` with the repeating four-byte ``key``."""
+
+    size = len(data)
+    stream = (key * (size // 4 + 1))[:size]
+    return (int.from_bytes(data, "little") ^ int.from_bytes(stream, "little")).to_bytes(
+        size, "little"
+    )
+
+
+def _accept_key(key: str) -> str:
+    digest = hashlib.sha1((key + _WEBSOCKET_GUID).encode()).digest()
+    return base64.b64encode(digest).decode()
+
+
+class BoundedExecutor:
+    """Thread pool that admits at most ``max_pending`` jobs at a time.
+
+    Callers beyond the limit wait on a semaphore. A burst of requests then
+    costs suspended coroutines rather than an unbounded executor queue.
+    """
+
+    def __init__(
+        self, workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING
+    ) -> None:
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="xiangqi-worker")
+        self._slots = asyncio.Semaphore(max_pending)
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, func, *args)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+@dataclass
+class Session:
+    """A game together with the WebSockets watching it."""
+
+    id: str
+    game: Game
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    subscribers: Set[WebSocket] = field(default_factory=set)
+
+
+# Searchers are not thread-safe, so each worker thread keeps its own.
+_local = threading.local()
+
+
+def _searcher() -> Searcher:
+    searcher = getattr(_local, "searcher", None)
+    if searcher is None:
+        searcher = _local.searcher = Searcher(hash_mb=ENGINE_HASH_MB)
+    return searcher
+
+
+def _piece_char(game: Game, square: Any) -> Optional[str]:
+    piece = game.position.board.peek(square)
+    return None if piece is None else _CHARS_BY_PIECE[piece]
+
+
+def _status(game: Game) -> Dict[str, Any]:
+    position = game.position
+    ongoing = game.result is GameResult.ONGOING
+    return {
+        "ply": game.ply,
+        "side_to_move": position.side_to_move.value,
+        "check": ongoing and is_in_check(position, position.side_to_move),
+        "result": game.result.value,
+        "termination": game.termination.value if game.termination else None,
+        "legal_moves": [move.to_str() for move in game.legal_moves()] if ongoing else [],
+    }
+
+
+def game_state(session: Session) -> Dict[str, Any]:
+    """Return the full ``state`` message for ``session``; runs on a worker."""
+
+    game = session.game
+    return {"type": "state", "id": session.id, "fen": game.position.to_fen(), **_status(game)}
+
+
+def apply_move(game: Game, move: Move) -> Dict[str, Any]:
+    """Play ``move`` and return the ``delta`` message; runs on a worker."""
+
+    moving = _piece_char(game, move.frm)
+    captured = _piece_char(game, move.to)
+    game.apply_move(move)
+    return {
+        "type": "delta",
+        "move": move.to_str(),
+        "changes": [
+            {"square": move.frm.to_str(), "piece": None},
+            {"square": move.to.to_str(), "piece": moving},
+        ],
+        "captured": captured,
+        **_status(game),
+    }
+
+
+def engine_move(game: Game, depth: int, time_limit: float) -> Dict[str, Any]:
+    """Search the current position and play the best move; runs on a worker."""
+
+    if game.result is not GameResult.ONGOING:
+        raise GameOverError("Game is already finished")
+    result = _searcher().search(game.position, depth=depth, time_limit=time_limit)
+    if result.best_move is None:
+        raise GameOverError("No legal move to play")
+    delta = apply_move(game, result.best_move)
+    delta["score"] = result.score
+    return delta
+
+
+class GameServer:
+    """Holds the sessions and answers HTTP and WebSocket traffic."""
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        static_root: Path = _STATIC_ROOT,
+    ) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_sessions = max_sessions
+        self.static_root = static_root
+        self.sessions: Dict[str, Session] = {}
+        self.executor: Optional[BoundedExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000) -> int:
+        """Start listening and return the bound port (useful with ``port=0``)."""
+
+        self.executor = BoundedExecutor(self.workers, self.max_pending)
+        self._server = await asyncio.start_server(
+            self._handle_connection, host, port, limit=_MAX_HEADER
+        )
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        for session in list(self.sessions.values()):
+            await self._close_session(session)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    async def play(
+        self, session: Session, func: Callable[..., Dict[str, Any]], *args: Any
+    ) -> Dict[str, Any]:
+        """Run a move-making ``func`` on a worker and broadcast its delta."""
+
+        assert self.executor is not None
+        async with session.lock:
+            delta = await self.executor.run(func, session.game, *args)
+            message = json.dumps(delta)
+            await asyncio.gather(
+                *(self._send(socket, message) for socket in list(session.subscribers))
+            )
+        return delta
+
+    async def state(self, session: Session) -> Dict[str, Any]:
+        """Build the ``state`` message on a worker, holding the session lock."""
+
+        assert self.executor is not None
+        async with session.lock:
+            return await self.executor.run(game_state, session)
+
+    async def _send(self, socket: WebSocket, message: str) -> None:
+        try:
+            await socket.send(message)
+        except WebSocketClosed:
+            pass
+
+    async def _close_session(self, session: Session) -> None:
+        self.sessions.pop(session.id, None)
+        for socket in list(session.subscribers):
+            await socket.close(1001)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    if request.headers.get("upgrade", "").lower() == "websocket":
+                        await self._serve_websocket(request, reader, writer)
+                        break
+                    status, payload = await self._route_safely(request)
+                except HttpError as exc:
+                    writer.write(_encode_response(exc.status, {"error": str(exc)}, False))
+                    await writer.drain()
+                    break
+                writer.write(_encode_response(status, payload, request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _session(self, session_id: str) -> Session:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HttpError(404, f"Unknown game: {session_id}")
+        return session
+
+    async def _route_safely(self, request: Request) -> Tuple[int, Any]:
+        """Route ``request``, turning an unexpected failure into a 500."""
+
+        try:
+            return await self._route(request)
+        except HttpError:
+            raise
+        except Exception as exc:
+            _log.exception("Error handling %s %s", request.method, request.path)
+            raise HttpError(500, "Internal server error") from exc
+
+    async def _route(self, request: Request) -> Tuple[int, Any]:
+        assert self.executor is not None
+        if request.path in ("/", "/index.html"):
+            if request.method != "GET":
+                raise HttpError(405, "Use GET")
+            try:
+                return 200, (self.static_root / "index.html").read_bytes()
+            except OSError as exc:
+                raise HttpError(404, "Frontend not found") from exc
+
+        if request.path == "/games":
+            if request.method != "POST":
+                raise HttpError(405, "Use POST to create a game")
+            if len(self.sessions) >= self.max_sessions:
+                raise HttpError(503, "Too many games in progress")
+            fen = request.json().get("fen")
+            if fen is not None and not isinstance(fen, str):
+                raise HttpError(400, "fen must be a string")
+            try:
+                position = Position.from_fen(fen) if fen else initial_position()
+            except XiangqiError as exc:
+                raise HttpError(400, str(exc)) from exc
+            # Legal play from here can then never capture a king.
+            if not has_both_kings(position) or is_in_check(
+                position, position.side_to_move.opponent()
+            ):
+                raise HttpError(400, "Illegal position: a king is missing or can be captured")
+            game = Game(position)
+            session = Session(secrets.token_hex(8), game)
+            self.sessions[session.id] = session
+            return 201, await self.state(session)
+
+        match = _GAME_PATH.match(request.path)
+        if match is None:
+            raise HttpError(404, f"No route for {request.path}")
+        session = self._session(match.group(1))
+        action = match.group(2)
+        if action is None and request.method == "GET":
+            return 200, await self.state(session)
+        if action is None and request.method == "DELETE":
+            await self._close_session(session)
+            return 200, {"id": session.id, "closed": True}
+        if action == "/moves" and request.method == "POST":
+            try:
+                move = Move.from_str(str(request.json().get("move", "")))
+                return 200, await self.play(session, apply_move, move)
+            except GameOverError as exc:
+                raise HttpError(409, str(exc)) from exc
+            except XiangqiError as exc:
+                raise HttpError(400, str(exc)) from exc
+        raise HttpError(405, f"{request.method} not allowed on {request.path}")
+
+    async def _serve_websocket(
+        self, request: Request, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        assert self.executor is not None
+        match = _GAME_PATH.match(request.path)
+        if match is None or match.group(2) != "/ws":
+            raise HttpError(404, f"No WebSocket at {request.path}")
+        session = self._session(match.group(1))
+        key = request.headers.get("sec-websocket-key")
+        if not key:
+            raise HttpError(400, "Missing Sec-WebSocket-Key")
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {_accept_key(key)}\r\n\r\n"
+            ).encode("latin-1")
+        )
+        socket = WebSocket(reader, writer)
+        session.subscribers.add(socket)
+        try:
+            await socket.send(json.dumps(await self.state(session)))
+            while True:
+                text = await socket.receive()
+                if text is None:
+                    break
+                error = await self._on_message(session, socket, text)
+                if error is not None:
+                    await socket.send(json.dumps({"type": "error", "message": error}))
+        except WebSocketClosed:
+            pass
+        finally:
+            session.subscribers.discard(socket)
+
+    async def _on_message(self, session: Session, socket: WebSocket, text: str) -> Optional[str]:
+        """Handle one client message; returns an error message on failure."""
+
+        try:
+            message = json.loads(text)
+            kind = message.get("type")
+        except (ValueError, AttributeError):
+            return "Messages must be JSON objects"
+        try:
+            if kind == "move":
+                await self.play(session, apply_move, Move.from_str(str(message.get("move", ""))))
+            elif kind == "engine":
+                depth = max(1, min(int(message.get("depth", MAX_ENGINE_DEPTH)), MAX_ENGINE_DEPTH))
+                time_limit = float(message.get("time", DEFAULT_ENGINE_TIME))
+                await self.play(session, engine_move, depth, time_limit)
+            elif kind == "state":
+                await socket.send(json.dumps(await self.state(session)))
+            else:
+                return f"Unknown message type: {kind}"
+        except (XiangqiError, ValueError, TypeError) as exc:
+            return str(exc)
+        except Exception:
+            _log.exception("Error handling WebSocket message %r", text)
+            return "Internal server error"
+        return None
+
+
+async def open_websocket(host: str, port: int, path: str) -> WebSocket:
+    """Open a client WebSocket to ``path`` (used by the tests and load test)."""
+
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(secrets.token_bytes(16)).decode()
+    writer.write(
+        (
+            f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+            "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+        ).encode("latin-1")
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    if not head.startswith(b"HTTP/1.1 101") or _accept_key(key).encode() not in head:
+        writer.close()
+        raise ConnectionError(head.split(b"\r\n", 1)[0].decode("latin-1"))
+    return WebSocket(reader, writer, mask=True)
+
+
+async def request_json(
+    host: str, port: int, method: str, path: str, payload: Optional[Dict[str, Any]] = None
+) -> Tuple[int, Any]:
+    """Send one HTTP request and return ``(status, decoded JSON body)``."""
+
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        (
+            f"{method} {path} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode("latin-1")
+        + body
+    )
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    return status, json.loads(content) if content else None
+
+
+async def serve(host: str, port: int, workers: int, max_pending: int, max_sessions: int) -> None:
+    server = GameServer(workers, max_pending, max_sessions)
+    bound = await server.start(host, port)
+    print(f"listening on http://{host}:{bound}", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000, help="0 picks a free port")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING)
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAX_SESSIONS)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(
+            serve(args.host, args.port, args.workers, args.max_pending, args.max_sessions)
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - script entrypoint
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import random
+from typing import Iterator, List
+
+import pytest
+
+from xiangqi_core import Board, Coord, Piece, PieceType, Position, Side
+from xiangqi_core.board import BACKENDS, get_default_backend, set_default_backend
+
+_EXTRA_TYPES = (
+    PieceType.ROOK,
+    PieceType.CANNON,
+    PieceType.HORSE,
+    PieceType.ELEPHANT,
+    PieceType.ADVISOR,
+    PieceType.PAWN,
+)
+
+
+@pytest.fixture(autouse=True, params=BACKENDS)
+def board_backend(request) -> Iterator[str]:
+    """Run every test once per board storage backend."""
+
+    previous = get_default_backend()
+    set_default_backend(request.param)
+    yield request.param
+    set_default_backend(previous)
+
+
+def make_random_position(rng: random.Random, max_extra: int = 14) -> Position:
+    """Build a position with both kings in their palaces plus random material."""
+
+    board = Board()
+    occupied = set()
+    for side, rows in ((Side.RED, (0, 1, 2)), (Side.BLACK, (7, 8, 9))):
+        king_square = Coord(rng.randint(3, 5), rng.choice(rows))
+        board.place(king_square, Piece(side, PieceType.KING))
+        occupied.add(king_square)
+
+    for _ in range(rng.randint(0, max_extra)):
+        square = Coord(rng.randint(0, 8), rng.randint(0, 9))
+        if square in occupied:
+            continue
+        occupied.add(square)
+        board.place(square, Piece(rng.choice((Side.RED, Side.BLACK)), rng.choice(_EXTRA_TYPES)))
+
+    return Position(board=board, side_to_move=rng.choice((Side.RED, Side.BLACK)))
+
+
+@pytest.fixture
+def random_positions() -> List[Position]:
+    rng = random.Random(20240601)
+    return [make_random_position(rng) for _ in range(200)]
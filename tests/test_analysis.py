@@ -0,0 +1,90 @@
+import io
+import json
+
+import pytest
+
+from xiangqi_core import Game, Move
+from xiangqi_core.analysis import MoveQuality, analyze_game, analyze_moves, classify, main
+from xiangqi_core.search import SearchResult, Searcher
+
+HANGING_ROOKS = "4k4/9/9/9/9/9/9/r8/9/R2K5 w - - 0 1"
+
+
+def _moves(*texts):
+    return [Move.from_str(text) for text in texts]
+
+
+def test_classify_thresholds():
+    assert classify(0) is MoveQuality.BEST
+    assert classify(40) is MoveQuality.GOOD
+    assert classify(100) is MoveQuality.INACCURACY
+    assert classify(250) is MoveQuality.MISTAKE
+    assert classify(1000) is MoveQuality.BLUNDER
+
+
+def test_missed_capture_is_a_blunder():
+    (result,) = analyze_moves(_moves("d0d1"), HANGING_ROOKS, time_per_ply=None, depth=2, workers=1)
+    assert result.ply == 1
+    assert result.best_move == Move.from_str("a0a2")
+    assert result.quality is MoveQuality.BLUNDER
+    assert result.delta < -1000
+    assert result.red_score == result.score
+
+
+def test_best_move_has_no_loss():
+    (result,) = analyze_moves(_moves("a0a2"), HANGING_ROOKS, time_per_ply=None, depth=2, workers=1)
+    assert result.quality is MoveQuality.BEST
+
+
+def test_position_out_of_time_before_depth_one_is_searched_again(monkeypatch):
+    search = Searcher.search
+
+    def out_of_time(self, position, depth=None, time_limit=None):
+        if time_limit is not None:  # the placeholder a search returns at depth 0
+            return SearchResult(Move.from_str("d0d1"), 0, 0, 0, [Move.from_str("d0d1")])
+        return search(self, position, depth=depth)
+
+    monkeypatch.setattr(Searcher, "search", out_of_time)
+    (result,) = analyze_moves(_moves("d0d1"), HANGING_ROOKS, time_per_ply=0.01, workers=1)
+    assert result.depth == 1
+    assert result.best_move == Move.from_str("a0a2")
+    assert result.quality is MoveQuality.BLUNDER
+
+
+def test_pool_streams_every_ply_once_and_matches_in_process():
+    moves = _moves("h2e2", "h9g7", "h0g2", "i9h9", "i0h0", "b9c7")
+    options = dict(time_per_ply=None, depth=1, hash_mb=0, chunk_size=2)
+    local = sorted(analyze_moves(moves, workers=1, **options), key=lambda item: item.ply)
+    pooled = sorted(analyze_moves(moves, workers=2, **options), key=lambda item: item.ply)
+    assert [item.ply for item in local] == list(range(1, 7))
+    assert local == pooled
+
+
+def test_analyze_game_recovers_the_start_and_leaves_the_game_alone():
+    game = Game()
+    for move in _moves("h2e2", "h9g7", "h0g2"):
+        game.apply_move(move)
+    game.undo()
+    fen = game.position.to_fen()
+    results = list(analyze_game(game, time_per_ply=None, depth=1, workers=1))
+    assert sorted(item.ply for item in results) == [1, 2]
+    assert game.position.to_fen() == fen and game.length == 3
+
+
+def test_chunk_size_must_be_positive():
+    with pytest.raises(ValueError):
+        list(analyze_moves([], chunk_size=0))
+
+
+def test_search_must_be_bounded():
+    with pytest.raises(ValueError):
+        list(analyze_moves(_moves("h2e2"), time_per_ply=None, depth=None))
+
+
+def test_cli_streams_json_lines(tmp_path, capsys):
+    path = tmp_path / "game.pgn"
+    path.write_text('[Result "*"]\n\n1. h2e2 h9g7 *\n', encoding="utf-8")
+    assert main([str(path), "--depth", "1", "--workers", "1"]) == 0
+    lines = [json.loads(line) for line in io.StringIO(capsys.readouterr().out)]
+    assert sorted(line["ply"] for line in lines) == [1, 2]
+    assert {"score", "best_move", "delta", "quality"} <= set(lines[0])
@@ -1,14 +1,28 @@
+import random
+
+import pytest
+
 from xiangqi_core import (
     Board,
     Coord,
+    Move,
     Piece,
     PieceType,
     Position,
     Side,
     find_king,
+    has_both_kings,
+    initial_position,
     is_in_check,
+    is_pseudo_legal_move,
     is_square_attacked,
 )
+from xiangqi_core.attack import check_info
+from xiangqi_core.legality import _leaves_king_in_check
+from xiangqi_core.movegen import generate_pseudo_legal_moves
+from xiangqi_core.rules import _count_blockers
+
+from conftest import make_random_position
 
 
 def test_rook_and_cannon_attack_detection() -> None:
@@ -60,3 +74,75 @@ def test_face_to_face_kings_count_as_attack() -> None:
     assert is_in_check(position, Side.RED)
     assert is_in_check(position, Side.BLACK)
     assert find_king(position, Side.RED) == Coord(4, 1)
+
+
+def _reference_is_square_attacked(position, by_side, square):
+    """The original piece-by-piece scan, kept as a differential oracle."""
+
+    for coord, piece in position.board:
+        if piece.side is not by_side:
+            continue
+        if piece.type is PieceType.KING and coord.x == square.x:
+            if _count_blockers(position.board, coord, square) == 0:
+                return True
+        if is_pseudo_legal_move(position, Move(coord, square)):
+            return True
+    return False
+
+
+def test_reverse_lookup_matches_reference_on_random_positions(random_positions) -> None:
+    for position in random_positions:
+        for side in (Side.RED, Side.BLACK):
+            for x in range(9):
+                for y in range(10):
+                    square = Coord(x, y)
+                    assert is_square_attacked(position, side, square) == (
+                        _reference_is_square_attacked(position, side, square)
+                    ), (side, square, dict(position.board.items()))
+
+
+def test_king_square_is_tracked_through_moves() -> None:
+    position = initial_position()
+    assert position.king_square(Side.RED) == Coord(4, 0)
+
+    undo = position.make_move(Move(Coord(4, 0), Coord(4, 1)))
+    assert find_king(position, Side.RED) == Coord(4, 1)
+    position.unmake_move(undo)
+    assert find_king(position, Side.RED) == Coord(4, 0)
+
+    assert has_both_kings(position)
+    position.board.remove(Coord(4, 9))
+    assert position.king_square(Side.BLACK) is None
+    assert not has_both_kings(position)
+    with pytest.raises(ValueError):
+        find_king(position, Side.BLACK)
+
+
+def test_check_info_flags_every_unsafe_move(random_positions) -> None:
+    rng = random.Random(7)
+    crowded = [make_random_position(rng, max_extra=40) for _ in range(200)]
+    for position in random_positions + crowded:
+        for side in (Side.RED, Side.BLACK):
+            info = check_info(position, side)
+            for move in generate_pseudo_legal_moves(position, side):
+                if not info.needs_verification(move):
+                    assert not _leaves_king_in_check(position, move, side), (
+                        move.to_str(),
+                        position.to_fen(),
+                    )
+
+
+def test_check_info_pins() -> None:
+    # e1 rook screens the e9 cannon behind the e4 pawn; d1 pins a horse leg.
+    position = Position.from_fen("4k4/4c4/9/9/9/4p4/9/9/3RR4/4K1n2 w - - 0 1")
+    info = check_info(position, Side.RED)
+
+    assert not info.in_check
+    assert Coord.from_str("e1").index in info.risky_from
+    assert Coord.from_str("d1").index not in info.risky_from
+    assert info.needs_verification(Move.from_str("e0d0"))
+    assert not info.needs_verification(Move.from_str("d1d5"))
+
+    position = Position.from_fen("4k4/9/9/9/9/9/9/4c4/9/4K4 w - - 0 1")
+    info = check_info(position, Side.RED)
+    assert info.risky_to == {Coord.from_str("e1").index}
@@ -0,0 +1,110 @@
+import io
+import json
+
+from xiangqi_core import GameResult, Move, Termination
+from xiangqi_core.batch import main, summarize, validate_games
+from xiangqi_core.pgn import GameRecord, iter_records
+
+ARCHIVE = """\
+[Event "fine"]
+[Result "*"]
+
+1. h2e2 h9g7 2. h0g2 *
+
+[Event "illegal"]
+[Result "*"]
+
+1. h2e2 h9g7 2. e2e9 *
+
+[Event "stalemate"]
+[FEN "4k4/R8/9/9/9/9/9/9/9/R2K5 w - - 0 1"]
+[Result "0-1"]
+
+1. a8f8 0-1
+"""
+
+
+def _records():
+    return list(iter_records(io.StringIO(ARCHIVE)))
+
+
+def test_outcomes_in_process_and_in_a_pool() -> None:
+    local = list(validate_games(_records(), workers=1, chunk_size=2))
+    pooled = list(validate_games(_records(), workers=2, chunk_size=1))
+    assert local == pooled
+
+    fine, illegal, stalemate = local
+    assert fine.valid and fine.plies == 3 and fine.result is GameResult.ONGOING
+    assert not illegal.valid and illegal.illegal_ply == 3 and illegal.plies == 2
+    assert "e2e9" in (illegal.error or "")
+    assert stalemate.result is GameResult.RED_WIN
+    assert stalemate.termination is Termination.STALEMATE
+    assert not stalemate.result_matches
+
+    summary = summarize(local)
+    assert summary["games"] == 3
+    assert (summary["valid"], summary["illegal"], summary["result_mismatches"]) == (2, 1, 1)
+
+
+def test_empty_and_non_geometric_moves() -> None:
+    record = GameRecord(moves=[Move.from_str("a0i9")])
+    (outcome,) = validate_games([record], workers=1)
+    assert outcome.illegal_ply == 1
+    assert list(validate_games([], workers=1)) == []
+
+
+def test_cli_reports_problems(tmp_path, capsys) -> None:
+    path = tmp_path / "archive.pgn"
+    path.write_text(ARCHIVE, encoding="utf-8")
+
+    assert main([str(path), "--workers", "1"]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["games"] == 3
+    assert [problem["game"] for problem in report["problems"]] == [2, 3]
+
+
+UNPARSEABLE = """\
+[Event "one"]
+
+1. h2e2 h9g7 *
+
+[Event "broken"]
+
+1. h2e2 Q9x9 *
+
+[Event three]
+
+1. c3c4 *
+
+[Event "four"]
+
+1. b2b1 *
+
+[Event "bad fen"]
+[FEN "not a fen"]
+
+1. h2e2 *
+
+[Event "no black king"]
+[FEN "9/9/9/9/9/9/9/9/9/4K4 w - - 0 1"]
+
+1. e0e1 *
+"""
+
+
+def test_unparseable_games_are_reported_and_skipped(tmp_path, capsys) -> None:
+    records = list(iter_records(io.StringIO(UNPARSEABLE), strict=False))
+    outcomes = list(validate_games(records, workers=2, chunk_size=1))
+    assert [outcome.parsed for outcome in outcomes] == [True, False, False, True, False, False]
+    assert [outcome.valid for outcome in outcomes] == [True, False, False, True, False, False]
+    assert "Line 7" in (outcomes[1].error or "")
+    assert "malformed header" in (outcomes[2].error or "")
+    assert "FEN" in (outcomes[4].error or "")
+    assert "both kings" in (outcomes[5].error or "")
+
+    path = tmp_path / "archive.pgn"
+    path.write_text(UNPARSEABLE, encoding="utf-8")
+    assert main([str(path), "--workers", "1"]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert (report["games"], report["valid"], report["unparsed"]) == (6, 2, 4)
+    assert [problem["game"] for problem in report["problems"]] == [2, 3, 5, 6]
@@ -0,0 +1,84 @@
+import random
+
+from xiangqi_core import Coord, Side, initial_position
+from xiangqi_core.attack import is_in_check, is_square_attacked
+from xiangqi_core.bitboard import (
+    ELEPHANT_TARGETS,
+    HALF_MASKS,
+    HORSE_TARGETS,
+    PALACE_MASKS,
+    RAYS,
+    BitboardPosition,
+    cannon_attacks,
+    rook_attacks,
+)
+from xiangqi_core.legality import generate_legal_moves
+from xiangqi_core.movegen import generate_pseudo_legal_moves
+
+
+def _square(text: str) -> int:
+    return Coord.from_str(text).index
+
+
+def _squares(mask: int):
+    return {Coord.from_index(index).to_str() for index in range(90) if mask >> index & 1}
+
+
+def test_precomputed_masks() -> None:
+    assert bin(PALACE_MASKS[0]).count("1") == 9 and PALACE_MASKS[0] >> _square("e1") & 1
+    assert HALF_MASKS[0] | HALF_MASKS[1] == (1 << 90) - 1 and not HALF_MASKS[0] & HALF_MASKS[1]
+    assert _squares(RAYS[_square("a0")][1]) == {f"{file}0" for file in "bcdefghi"}
+    # A horse in the corner with its north leg blocked only jumps east.
+    assert _squares(HORSE_TARGETS[_square("a0")][0b0001]) == {"c1"}
+    assert _squares(ELEPHANT_TARGETS[0][_square("e2")][0]) == {"c0", "g0", "c4", "g4"}
+
+    occupied = (1 << _square("e4")) | (1 << _square("e7")) | (1 << _square("e9"))
+    assert _squares(rook_attacks(_square("e2"), occupied) & RAYS[_square("e2")][0]) == {"e3", "e4"}
+    assert _squares(cannon_attacks(_square("e2"), occupied) & RAYS[_square("e2")][0]) == {"e3", "e7"}
+
+
+def test_matches_board_move_generation(random_positions) -> None:
+    for position in random_positions + [initial_position()]:
+        bitboard = BitboardPosition.from_position(position)
+        for side in Side:
+            assert set(bitboard.generate_pseudo_legal_moves(side)) == set(
+                generate_pseudo_legal_moves(position, side)
+            )
+            assert set(bitboard.generate_legal_moves(side)) == set(
+                generate_legal_moves(position, side)
+            )
+            assert bitboard.is_in_check(side) == is_in_check(position, side)
+
+
+def test_matches_board_attack_detection(random_positions) -> None:
+    for position in random_positions[:60]:
+        bitboard = BitboardPosition.from_position(position)
+        for side in Side:
+            for index in range(90):
+                coord = Coord.from_index(index)
+                occupant = position.board.peek(coord)
+                if occupant is not None and occupant.side is side:
+                    continue
+                assert bitboard.is_square_attacked(side, index) == is_square_attacked(
+                    position, side, coord
+                ), (position.to_fen(), side, coord.to_str())
+
+
+def test_make_unmake_round_trip() -> None:
+    rng = random.Random(21)
+    position = initial_position()
+    bitboard = BitboardPosition.from_position(position)
+    undos = []
+    for _ in range(60):
+        moves = bitboard.generate_legal_moves(bitboard.side_to_move)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        undos.append(bitboard.make_move(move))
+        position.make_move(move)
+        # Bitboards carry no move counters; compare placement and side to move.
+        assert bitboard.to_position().to_fen().split()[:2] == position.to_fen().split()[:2]
+        assert bitboard.occupied == bitboard.sides[0] | bitboard.sides[1]
+    while undos:
+        bitboard.unmake_move(undos.pop())
+    assert bitboard.to_position().to_fen() == initial_position().to_fen()
@@ -10,6 +10,7 @@ from xiangqi_core import (
     Side,
     initial_position,
 )
+from xiangqi_core.board import ArrayBoard
 
 
 def test_initial_position_piece_layout():
@@ -56,3 +57,37 @@ def test_move_from_empty_square_raises():
     board = Board()
     with pytest.raises(IllegalMoveError):
         board.move_piece(Move(Coord(0, 0), Coord(0, 1)))
+
+
+def test_make_and_unmake_move_restore_position():
+    position = initial_position()
+    before = dict(position.board.items())
+
+    undo = position.make_move(Move.from_str("b2b9"))
+    assert undo.captured == Piece(Side.BLACK, PieceType.HORSE)
+    assert position.side_to_move is Side.BLACK
+    assert position.board.get(Coord.from_str("b9")).type is PieceType.CANNON
+    assert position.board.get(Coord.from_str("b2")) is None
+
+    position.unmake_move(undo)
+    assert position.side_to_move is Side.RED
+    assert dict(position.board.items()) == before
+
+
+def test_backend_is_selectable_at_construction():
+    pieces = {
+        Coord(4, 0): Piece(Side.RED, PieceType.KING),
+        Coord(4, 9): Piece(Side.BLACK, PieceType.KING),
+    }
+    dict_board = Board(pieces, backend="dict")
+    array_board = Board(pieces, backend="array")
+
+    assert isinstance(array_board, ArrayBoard)
+    assert not isinstance(dict_board, ArrayBoard)
+    assert sorted(array_board, key=lambda item: item[0].index) == sorted(
+        dict_board, key=lambda item: item[0].index
+    )
+    assert initial_position(backend="array").board.backend == "array"
+
+    with pytest.raises(ValueError):
+        Board(backend="bitset")
@@ -0,0 +1,102 @@
+import io
+import json
+import random
+
+import pytest
+
+from xiangqi_core import Move, XiangqiError, initial_position
+from xiangqi_core.book import OpeningBook, build_book, main
+from xiangqi_core.pgn import iter_records
+from xiangqi_core.search import Searcher
+
+ARCHIVE = """\
+[Result "1-0"]
+
+1. h2e2 h9g7 2. h0g2 1-0
+
+[Result "1/2-1/2"]
+
+1. h2e2 b9c7 1/2-1/2
+
+[Result "0-1"]
+
+1. c3c4 h9g7 0-1
+
+[Result "1-0"]
+
+1. h2e2 h9g7 1-0
+"""
+
+
+def _build(tmp_path, **kwargs):
+    path = str(tmp_path / "book.bin")
+    count = build_book(iter_records(io.StringIO(ARCHIVE)), path, **kwargs)
+    return path, count
+
+
+def test_lookup_orders_moves_by_weight(tmp_path) -> None:
+    path, count = _build(tmp_path)
+    with OpeningBook(path) as book:
+        assert len(book) == count
+        entries = book.moves(initial_position())
+
+    assert [entry.move.to_str() for entry in entries] == ["h2e2", "c3c4"]
+    central = entries[0]
+    assert (central.games, central.wins, central.draws, central.losses) == (3, 2, 1, 0)
+    assert central.weight == 5 and central.score == pytest.approx(5 / 6)
+    assert (entries[1].wins, entries[1].losses) == (0, 1)
+
+
+def test_stats_are_counted_for_the_side_to_move(tmp_path) -> None:
+    path, _ = _build(tmp_path)
+    position = initial_position()
+    position.make_move(Move.from_str("h2e2"))
+    with OpeningBook(path) as book:
+        entries = book.moves(position)
+
+    assert [entry.move.to_str() for entry in entries] == ["b9c7", "h9g7"]
+    assert [(entry.wins, entry.losses) for entry in entries] == [(0, 0), (0, 2)]
+
+
+def test_unknown_positions_and_filters(tmp_path) -> None:
+    path, _ = _build(tmp_path, max_ply=1, min_games=2)
+    position = initial_position()
+    with OpeningBook(path) as book:
+        assert [entry.move.to_str() for entry in book.moves(position)] == ["h2e2"]
+        position.make_move(Move.from_str("h2e2"))
+        assert book.moves(position) == []
+        assert book.choose(position) is None
+        assert book.lookup(0) == []
+
+
+def test_choose_and_search_play_book_moves(tmp_path) -> None:
+    path, _ = _build(tmp_path)
+    position = initial_position()
+    with OpeningBook(path) as book:
+        assert book.choose(position) == Move.from_str("h2e2")
+        drawn = {book.choose(position, random.Random(seed)) for seed in range(30)}
+        assert drawn <= {Move.from_str("h2e2"), Move.from_str("c3c4")}
+
+        result = Searcher(book=book).search(position, depth=3)
+        assert result.best_move == Move.from_str("h2e2")
+        assert result.nodes == 0
+
+
+def test_rejects_files_that_are_not_books(tmp_path) -> None:
+    for content in (b"", b"not a book", b"XQBOOK1\0" + (5).to_bytes(8, "little")):
+        path = tmp_path / "bad.bin"
+        path.write_bytes(content)
+        with pytest.raises(XiangqiError):
+            OpeningBook(str(path))
+
+
+def test_cli_build_and_probe(tmp_path, capsys) -> None:
+    archive = tmp_path / "games.pgn"
+    archive.write_text(ARCHIVE, encoding="utf-8")
+    output = str(tmp_path / "book.bin")
+
+    assert main(["build", str(archive), output, "--max-ply", "2"]) == 0
+    assert json.loads(capsys.readouterr().out)["records"] > 0
+    assert main(["probe", output]) == 0
+    probed = json.loads(capsys.readouterr().out)
+    assert [entry["move"] for entry in probed] == ["h2e2", "c3c4"]
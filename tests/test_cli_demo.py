@@ -1,7 +1,7 @@
 import textwrap
 
 from xiangqi_cli_demo import describe_status, render_board
-from xiangqi_core import Game, GameResult, Position
+from xiangqi_core import Game, GameResult, Position, Termination
 from xiangqi_core.board import Board
 from xiangqi_core.coord import Coord
 from xiangqi_core.piece import Piece
@@ -42,3 +42,9 @@ def test_describe_status_includes_check_and_results():
 
     game.result = GameResult.RED_WIN
     assert describe_status(game) == "Side to move: Black | Game over — Red wins"
+
+    game.termination = Termination.STALEMATE
+    assert describe_status(game) == "Side to move: Black | Game over — Red wins by stalemate"
+
+    game.result = GameResult.DRAW
+    assert describe_status(game) == "Side to move: Black | Game over — Draw"
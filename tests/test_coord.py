@@ -25,3 +25,11 @@ def test_coord_from_str_invalid_inputs(text):
 def test_coord_out_of_bounds_to_str_raises():
     with pytest.raises(ValueError):
         Coord(9, 0).to_str()
+
+
+def test_coord_at_returns_shared_instances():
+    assert Coord.at(4, 9) is Coord.at(4, 9)
+    assert Coord.at(4, 9) == Coord(4, 9)
+    assert Coord.from_str("e9") is Coord.at(4, 9)
+    assert Coord.from_index(Coord(4, 9).index) is Coord.at(4, 9)
+    assert not Coord.at(9, 0).in_bounds()
@@ -0,0 +1,88 @@
+import functools
+import random
+
+from conftest import make_random_position
+
+from xiangqi_core import Board, Coord, Move, Piece, PieceType, Position, Side, initial_position
+from xiangqi_core.eval import (
+    PIECE_SQUARE_SCORES,
+    compute_score,
+    evaluate,
+    king_safety,
+    mobility,
+    piece_square_score,
+)
+from xiangqi_core.legality import generate_legal_moves
+from xiangqi_core.search import Searcher
+
+
+def _mirrored(position: Position) -> Position:
+    board = Board()
+    for coord, piece in position.board:
+        board.place(Coord.at(coord.x, 9 - coord.y), Piece.of(piece.side.opponent(), piece.type))
+    return Position(board, position.side_to_move.opponent())
+
+
+def test_tables_cover_every_piece_and_square() -> None:
+    assert len(PIECE_SQUARE_SCORES) == 15 and PIECE_SQUARE_SCORES[0] == (0,) * 90
+    assert all(len(row) == 90 for row in PIECE_SQUARE_SCORES)
+
+    red_pawn = Piece.of(Side.RED, PieceType.PAWN)
+    assert piece_square_score(red_pawn, Coord.from_str("e6")) > piece_square_score(
+        red_pawn, Coord.from_str("e3")
+    )
+    black_rook = Piece.of(Side.BLACK, PieceType.ROOK)
+    assert piece_square_score(black_rook, Coord.from_str("a9")) < -500
+
+
+def test_incremental_score_matches_recomputation() -> None:
+    rng = random.Random(2020)
+    position = initial_position()
+    assert position.board.psq_score == 0 == evaluate(position)
+
+    undos = []
+    for _ in range(80):
+        moves = generate_legal_moves(position, position.side_to_move)
+        if not moves:
+            break
+        undos.append(position.make_move(rng.choice(moves)))
+        assert position.board.psq_score == compute_score(position.board)
+    while undos:
+        position.unmake_move(undos.pop())
+        assert position.board.psq_score == compute_score(position.board)
+    assert position.board.psq_score == 0
+
+    board = position.board
+    board.remove(Coord.from_str("a0"))
+    board.place(Coord.from_str("e4"), Piece.of(Side.BLACK, PieceType.HORSE))
+    board.place(Coord.from_str("e4"), Piece.of(Side.RED, PieceType.CANNON))
+    assert board.psq_score == compute_score(board)
+    assert Position.from_fen(position.to_fen()).board.psq_score == board.psq_score
+
+
+def test_scores_are_colour_symmetric() -> None:
+    rng = random.Random(7)
+    for _ in range(50):
+        position = make_random_position(rng)
+        mirrored = _mirrored(position)
+        assert mirrored.board.psq_score == -position.board.psq_score
+        for terms in ({}, {"mobility_term": True, "king_safety_term": True}):
+            assert evaluate(mirrored, **terms) == evaluate(position, **terms)
+
+
+def test_optional_terms() -> None:
+    start = initial_position()
+    assert mobility(start) == 0 and king_safety(start) == 0
+
+    # A red rook across the river against a king stripped of its defenders.
+    bare = Position.from_fen("4k4/9/9/9/R8/9/9/9/9/3AKA3 w - - 0 1")
+    assert king_safety(bare) > 0
+    assert mobility(bare) > 0
+    assert evaluate(bare, mobility_term=True, king_safety_term=True) > evaluate(bare)
+
+
+def test_searcher_accepts_an_evaluator() -> None:
+    position = Position.from_fen("5k3/9/9/9/r8/9/9/9/9/R2K5 w - - 0 1")
+    evaluator = functools.partial(evaluate, mobility_term=True, king_safety_term=True)
+    result = Searcher(evaluator=evaluator).search(position, depth=2)
+    assert result.best_move == Move.from_str("a0a5")
@@ -0,0 +1,69 @@
+import pytest
+
+from xiangqi_core import (
+    Coord,
+    Move,
+    ParseFenError,
+    Piece,
+    PieceType,
+    Position,
+    Side,
+    initial_position,
+)
+from xiangqi_core.fen import START_FEN
+from xiangqi_core.perf import REFERENCE_SUITE
+
+
+def test_start_fen_matches_initial_position() -> None:
+    position = Position.from_fen(START_FEN)
+    expected = initial_position()
+
+    assert dict(position.board.items()) == dict(expected.board.items())
+    assert position.key == expected.key
+    assert position.king_square(Side.BLACK) == Coord(4, 9)
+    assert position.board.get(Coord(4, 9)) is Piece.of(Side.BLACK, PieceType.KING)
+    assert expected.to_fen() == START_FEN
+
+
+@pytest.mark.parametrize("case", REFERENCE_SUITE, ids=lambda case: case.name)
+def test_round_trip(case) -> None:
+    assert Position.from_fen(case.fen).to_fen() == case.fen
+
+
+def test_move_counters_follow_make_and_unmake() -> None:
+    position = Position.from_fen("4k4/9/9/9/9/9/9/9/4p4/3KR4 b - - 7 20")
+    assert position.halfmove_clock == 7
+    assert position.fullmove_number == 20
+
+    undo = position.make_move(Move.from_str("e9d9"))
+    assert position.to_fen() == "3k5/9/9/9/9/9/9/9/4p4/3KR4 w - - 8 21"
+
+    position.unmake_move(undo)
+    capture = position.make_move(Move.from_str("e1e0"))
+    assert capture.captured.type is PieceType.ROOK
+    assert position.to_fen().endswith(" w - - 0 21")
+
+
+def test_aliases_and_defaults() -> None:
+    position = Position.from_fen("4k4/9/9/9/9/9/9/9/9/3KEH3")
+    assert position.side_to_move is Side.RED
+    assert position.board.get(Coord(4, 0)).type is PieceType.ELEPHANT
+    assert position.to_fen() == "4k4/9/9/9/9/9/9/9/9/3KBN3 w - - 0 1"
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "",
+        "rnbakabnr/9/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/9 w",
+        "rnbakabnr/9/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/9/RNBAKABNR/9 w",
+        "rnbakabnrr/9/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/9/RNBAKABNR w",
+        "rnbakabn/9/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/9/RNBAKABNR w",
+        "rnbakabnx/9/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/9/RNBAKABNR w",
+        "rnbakabnr/9/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/9/RNBAKABNR x",
+        "rnbakabnr/9/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/9/RNBAKABNR w - - x 1",
+    ],
+)
+def test_invalid_fen_raises(fen) -> None:
+    with pytest.raises(ParseFenError):
+        Position.from_fen(fen)
@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from xiangqi_core import Game, GameResult, Move, Position, Termination, decode_moves
+
+
+def _play(game: Game, moves: str) -> None:
+    for text in moves.split():
+        game.apply_move(Move.from_str(text))
+
+
+def test_threefold_repetition_is_a_draw() -> None:
+    game = Game()
+    _play(game, "h0g2 h9g7 g2h0 g7h9 h0g2 h9g7 g2h0")
+    assert game.result is GameResult.ONGOING
+    assert game.repetition_count() == 2
+
+    game.apply_move(Move.from_str("g7h9"))
+    assert game.repetition_count() == 3
+    assert game.result is GameResult.DRAW
+    assert game.termination is Termination.REPETITION
+
+
+def test_perpetual_check_loses() -> None:
+    game = Game(position=Position.from_fen("5k3/9/9/9/9/9/9/9/R8/3K5 w - - 0 1"))
+    _play(game, "a1a9 f9f8 a9a8 f8f9 a8a9 f9f8 a9a8")
+    assert game.result is GameResult.ONGOING
+
+    game.apply_move(Move.from_str("f8f9"))
+    game.apply_move(Move.from_str("a8a9"))
+    assert game.result is GameResult.BLACK_WIN
+    assert game.termination is Termination.PERPETUAL_CHECK
+
+
+def test_perpetual_chase_loses() -> None:
+    game = Game(position=Position.from_fen("5k3/9/9/9/c7R/9/9/9/9/3K5 b - - 0 1"))
+    _play(game, "a5a6 i5i6 a6a5 i6i5 a5a6 i5i6 a6a5")
+    assert game.result is GameResult.ONGOING
+
+    game.apply_move(Move.from_str("i6i5"))
+    assert game.result is GameResult.BLACK_WIN
+    assert game.termination is Termination.PERPETUAL_CHASE
+    assert game.position.key == game.keys[-1]
+    assert len(game.keys) == len(game.history) + 1
+
+
+def test_natural_move_limit_is_a_draw() -> None:
+    game = Game(position=Position.from_fen("5k3/9/9/9/9/9/9/9/9/R2K5 w - - 118 60"))
+    game.apply_move(Move.from_str("a0a1"))
+    assert game.result is GameResult.ONGOING
+
+    game.apply_move(Move.from_str("f9f8"))
+    assert game.result is GameResult.DRAW
+    assert game.termination is Termination.MOVE_LIMIT
+
+
+def test_undo_redo_and_goto_restore_positions() -> None:
+    rng = random.Random(11)
+    game = Game(keyframe_interval=4)
+    fens = [game.position.to_fen()]
+    while game.ply < 21 and game.result is GameResult.ONGOING:
+        game.apply_move(rng.choice(sorted(game.legal_moves(), key=Move.to_str)))
+        fens.append(game.position.to_fen())
+    assert game.ply == 21
+    keys = list(game.keys)
+    last = game.history[-1]
+
+    assert game.undo() == last
+    assert game.position.to_fen() == fens[-2]
+    assert game.redo() == last
+    assert game.redo() is None
+    assert game.keys == keys
+
+    for ply in (0, 13, 3, 20, 8, 21, 1, 16):
+        game.goto(ply)
+        assert game.ply == ply
+        assert game.position.to_fen() == fens[ply]
+        assert game.keys == keys[: ply + 1]
+        assert game.position.key == keys[ply]
+
+    assert decode_moves(game.move_codes()) == game.history
+
+    game.goto(0)
+    assert game.undo() is None
+    with pytest.raises(ValueError):
+        game.goto(len(fens))
+
+
+def test_undo_restores_result_and_new_move_discards_redo() -> None:
+    game = Game(keyframe_interval=0)
+    _play(game, "h0g2 h9g7 g2h0 g7h9 h0g2 h9g7 g2h0 g7h9")
+    assert game.result is GameResult.DRAW
+
+    game.undo()
+    assert game.result is GameResult.ONGOING
+    assert game.termination is None
+    assert game.repetition_count() == 2
+
+    game.undo()
+    game.apply_move(Move.from_str("b0c2"))
+    assert game.length == game.ply == 7
+    assert game.redo() is None
@@ -11,10 +11,16 @@ from xiangqi_core import (
     PieceType,
     Position,
     Side,
+    Termination,
     generate_legal_moves,
+    has_legal_move,
+    initial_position,
     is_checkmate,
     is_legal_move,
+    is_stalemate,
+    iter_legal_moves,
 )
+from xiangqi_core import legality
 
 
 def test_move_exposing_king_is_illegal() -> None:
@@ -54,6 +60,7 @@ def test_checkmate_detection_and_legal_move_generation() -> None:
     game.apply_move(finishing_move)
 
     assert game.result is GameResult.RED_WIN
+    assert game.termination is Termination.CHECKMATE
     assert position.side_to_move is Side.BLACK
     assert is_checkmate(position, Side.BLACK)
     assert generate_legal_moves(position, Side.BLACK) == []
@@ -76,3 +83,41 @@ def test_game_ends_when_king_is_captured() -> None:
     assert game.result is GameResult.RED_WIN
     with pytest.raises(GameOverError):
         game.apply_move(Move(Coord(0, 0), Coord(0, 1)))
+
+
+def test_stalemate_is_a_loss() -> None:
+    game = Game(position=Position.from_fen("4k4/R8/9/9/9/9/9/9/9/R2K5 w - - 0 1"))
+
+    game.apply_move(Move.from_str("a8f8"))
+
+    assert is_stalemate(game.position, Side.BLACK)
+    assert not is_checkmate(game.position, Side.BLACK)
+    assert game.result is GameResult.RED_WIN
+    assert game.termination is Termination.STALEMATE
+
+
+def test_legal_move_iterator_is_lazy(monkeypatch: pytest.MonkeyPatch) -> None:
+    position = initial_position()
+    assert set(iter_legal_moves(position, Side.RED)) == set(generate_legal_moves(position, Side.RED))
+
+    calls = []
+    original = legality._leaves_king_in_check
+
+    def counting(*args):  # type: ignore[no-untyped-def]
+        calls.append(args[1])
+        return original(*args)
+
+    monkeypatch.setattr(legality, "_leaves_king_in_check", counting)
+    assert has_legal_move(position, Side.RED)
+    assert not is_checkmate(position, Side.BLACK)
+    assert len(calls) <= 1
+
+
+def test_has_legal_move_skips_full_generation(monkeypatch: pytest.MonkeyPatch) -> None:
+    def full_generation(*args):  # type: ignore[no-untyped-def]
+        raise AssertionError("full move list generated")
+
+    monkeypatch.setattr(legality, "generate_pseudo_legal_moves", full_generation)
+    position = initial_position()
+    assert has_legal_move(position, Side.RED)
+    assert not is_checkmate(position, Side.BLACK)
@@ -1,6 +1,16 @@
 import pytest
 
-from xiangqi_core import Coord, Move, ParseMoveError
+from xiangqi_core import (
+    Coord,
+    Move,
+    ParseMoveError,
+    decode_moves,
+    encode_moves,
+    generate_legal_move_codes,
+    generate_legal_moves,
+    initial_position,
+)
+from xiangqi_core.move import move_code_from_str, move_code_to_str
 
 
 def test_move_from_str_and_to_str_round_trip():
@@ -19,3 +29,34 @@ def test_move_from_str_invalid_inputs(text):
 def test_move_from_str_rejects_non_string():
     with pytest.raises(ParseMoveError):
         Move.from_str(123)  # type: ignore[arg-type]
+
+
+def test_move_between_returns_shared_instances():
+    a0, a5, b2 = Coord.from_str("a0"), Coord.from_str("a5"), Coord.from_str("b2")
+    assert Move.between(a0, a5) is Move.between(Coord(0, 0), Coord(0, 5))
+    assert Move.from_str("a0b2") is Move.between(a0, b2)
+    # Not a move any piece can make: still valid, just not shared.
+    assert Move.between(a0, Coord.from_str("c5")) == Move(a0, Coord.from_str("c5"))
+
+
+def test_move_codes_round_trip():
+    move = Move.from_str("h2e2")
+    assert move.code == (Coord.from_str("h2").index << 7) | Coord.from_str("e2").index
+    assert Move.from_code(move.code) is move
+    assert move_code_to_str(move_code_from_str("h2e2")) == "h2e2"
+    assert Move.from_code(Move.from_str("a0c5").code) == Move.from_str("a0c5")
+    squares = [Coord.from_index(index) for index in range(90)]
+    assert len({Move(frm, to).code for frm in squares for to in squares}) == 8100
+
+    with pytest.raises(ParseMoveError):
+        Move.from_code(90 << 7)
+
+
+def test_packed_move_lists():
+    position = initial_position()
+    moves = generate_legal_moves(position, position.side_to_move)
+    codes = generate_legal_move_codes(position, position.side_to_move)
+
+    assert codes.typecode == "H" and codes.itemsize == 2
+    assert set(decode_moves(codes)) == set(moves)
+    assert decode_moves(encode_moves(moves)) == moves
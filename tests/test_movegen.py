@@ -0,0 +1,41 @@
+from xiangqi_core import Coord, Move, Side, initial_position, is_pseudo_legal_move
+from xiangqi_core.movegen import generate_pseudo_legal_moves
+
+
+def _brute_force_moves(position, side):
+    moves = set()
+    for coord, piece in position.board:
+        if piece.side is not side:
+            continue
+        for x in range(9):
+            for y in range(10):
+                move = Move(coord, Coord(x, y))
+                if is_pseudo_legal_move(position, move):
+                    moves.add(move)
+    return moves
+
+
+def test_initial_position_move_count() -> None:
+    position = initial_position()
+    moves = generate_pseudo_legal_moves(position, Side.RED)
+
+    assert len(moves) == 44
+    assert len(set(moves)) == len(moves)
+    assert set(moves) == _brute_force_moves(position, Side.RED)
+
+
+def test_generator_matches_brute_force_on_random_positions(random_positions) -> None:
+    for position in random_positions:
+        for side in (Side.RED, Side.BLACK):
+            moves = generate_pseudo_legal_moves(position, side)
+            assert len(set(moves)) == len(moves)
+            assert set(moves) == _brute_force_moves(position, side)
+
+
+def test_generation_reuses_shared_move_objects() -> None:
+    position = initial_position()
+    first = generate_pseudo_legal_moves(position, Side.RED)
+    second = generate_pseudo_legal_moves(position, Side.RED)
+
+    assert all(a is b for a, b in zip(first, second))
+    assert all(move is Move.between(move.frm, move.to) for move in first)
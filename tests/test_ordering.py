@@ -0,0 +1,82 @@
+from xiangqi_core import Move, Piece, PieceType, Position, Side, generate_legal_moves
+from xiangqi_core.ordering import MoveOrderer, mvv_lva
+from xiangqi_core.piece import encode_piece
+from xiangqi_core.search import Searcher
+
+# Red can take the rook with the cannon or the pawn, or the horse with the rook.
+CAPTURES = "4k4/9/9/9/2r6/2P1n4/9/2C1R4/9/3K5 w - - 0 1"
+
+
+def _legal(position):
+    return generate_legal_moves(position, position.side_to_move)
+
+
+def test_mvv_lva_prefers_big_victims_then_small_attackers():
+    rook = Piece.of(Side.BLACK, PieceType.ROOK)
+    horse = Piece.of(Side.BLACK, PieceType.HORSE)
+    pawn = Piece.of(Side.RED, PieceType.PAWN)
+    cannon = Piece.of(Side.RED, PieceType.CANNON)
+    assert mvv_lva(rook, pawn) > mvv_lva(rook, cannon) > mvv_lva(horse, pawn)
+
+
+def test_staged_moves_are_the_legal_moves(random_positions):
+    orderer = MoveOrderer()
+    for position in random_positions:
+        fen = position.to_fen()
+        staged = list(orderer.staged_moves(position))
+        assert len(staged) == len(set(staged))
+        assert set(staged) == set(_legal(position))
+        assert position.to_fen() == fen
+
+
+def test_stage_order():
+    position = Position.from_fen(CAPTURES)
+    orderer = MoveOrderer()
+    killer = Move.from_str("d0d1")
+    orderer.killers[0] = [killer, None]
+    hash_move = Move.from_str("e2e1")
+
+    moves = list(orderer.staged_moves(position, hash_move, 0))
+    assert moves[0] == hash_move
+    assert moves[1:4] == [Move.from_str(text) for text in ("c4c5", "c2c5", "e2e4")]
+    assert moves[4] == killer
+    assert moves == orderer.order(position, _legal(position), hash_move, 0)
+
+
+def test_illegal_hash_move_is_skipped():
+    position = Position.from_fen(CAPTURES)
+    moves = list(MoveOrderer().staged_moves(position, Move.from_str("a0a1")))
+    assert set(moves) == set(_legal(position))
+
+
+def test_cutoffs_update_killers_and_history():
+    position = Position.from_fen(CAPTURES)
+    orderer = MoveOrderer()
+    quiet, other = Move.from_str("e2f2"), Move.from_str("e2g2")
+    orderer.record_cutoff(position, quiet, 3, 2)
+    orderer.record_cutoff(position, other, 2, 2)
+    orderer.record_cutoff(position, Move.from_str("e2e4"), 5, 2)  # capture: ignored
+    assert orderer.killers[2] == [other, quiet]
+    rook_row = orderer.history[encode_piece(Piece.of(Side.RED, PieceType.ROOK))]
+    assert rook_row[quiet.to.index] == 9 and rook_row[other.to.index] == 4
+    orderer.new_search()
+    assert orderer.killers[2] == [None, None]
+    assert rook_row[quiet.to.index] == 4
+
+
+def test_ordering_keeps_scores_and_saves_nodes():
+    positions = [Position.from_fen(CAPTURES)] + [
+        Position.from_fen(fen)
+        for fen in (
+            "rnbakabnr/9/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/9/RNBAKABNR w - - 0 1",
+            "r1bakab1r/9/1cn3nc1/p1p1p1p1p/9/9/P1P1P1P1P/1CN3NC1/9/R1BAKAB1R w - - 0 1",
+        )
+    ]
+    plain_nodes = ordered_nodes = 0
+    for position in positions:
+        plain = Searcher(hash_mb=0, ordering=False).search(position, depth=3)
+        ordered = Searcher(hash_mb=0).search(position, depth=3)
+        assert ordered.score == plain.score
+        plain_nodes += plain.nodes
+        ordered_nodes += ordered.nodes
+    assert ordered_nodes < plain_nodes
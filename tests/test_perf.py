@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from xiangqi_core import initial_position
+from xiangqi_core.perf import REFERENCE_SUITE, START_FEN, divide, perft, run_suite
+from xiangqi_core.perft import main
+
+
+@pytest.mark.parametrize("case", REFERENCE_SUITE, ids=lambda case: case.name)
+def test_reference_counts_to_depth_two(case) -> None:
+    report = run_suite([case], max_depth=2)
+    assert report["ok"], report
+
+
+def test_divide_sums_to_perft_and_leaves_position_unchanged() -> None:
+    position = initial_position()
+    key = position.key
+
+    counts = divide(position, 2)
+    assert len(counts) == 44
+    assert sum(counts.values()) == perft(position, 2) == 1920
+    assert position.key == key
+
+
+def test_cli_prints_json_report(capsys) -> None:
+    assert main(["--fen", START_FEN, "--depth", "2", "--divide"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["nodes"] == 1920
+    assert len(report["divide"]) == 44
@@ -0,0 +1,132 @@
+import io
+import random
+
+import pytest
+
+from xiangqi_core import (
+    Game,
+    GameResult,
+    Move,
+    ParseGameError,
+    ParseMoveError,
+    Position,
+    Side,
+    generate_legal_moves,
+    initial_position,
+)
+from xiangqi_core.pgn import (
+    GameRecord,
+    format_record,
+    format_wxf,
+    iter_games,
+    iter_records,
+    parse_wxf,
+    record_from_game,
+    write_records,
+)
+
+SAMPLE = """\
+[Event "Casual game"]
+[Red "Alice"]
+[Black "Bob"]
+[Result "1-0"]
+
+1. H2-E2 H9-G7 {the usual reply
+spanning two lines} 2. H0-G2 (2. b0c2 b9c7) I9-H9 ; a comment
+3. i0h0 1-0
+
+[Event "WXF"]
+[FEN "rnbakabnr/9/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/9/RNBAKABNR b - - 0 1"]
+
+1... H2+3 2. C2.5 C8.5 *
+"""
+
+
+def _random_game(rng: random.Random, plies: int) -> Game:
+    game = Game()
+    while game.ply < plies and game.result is GameResult.ONGOING:
+        game.apply_move(rng.choice(sorted(game.legal_moves(), key=Move.to_str)))
+    return game
+
+
+def test_reads_headers_moves_comments_and_variations() -> None:
+    records = list(iter_records(io.StringIO(SAMPLE)))
+
+    assert [record.headers.get("Event") for record in records] == ["Casual game", "WXF"]
+    first, second = records
+    assert [move.to_str() for move in first.moves] == ["h2e2", "h9g7", "h0g2", "i9h9", "i0h0"]
+    assert first.result == "1-0"
+    assert [move.to_str() for move in second.moves] == ["b9c7", "h2e2", "h7e7"]
+    assert second.result == "*"
+
+
+def test_wxf_notation() -> None:
+    position = initial_position()
+    assert parse_wxf(position, "C2.5") == Move.from_str("h2e2")
+    assert parse_wxf(position, "H8+7") == Move.from_str("b0c2")
+    assert format_wxf(position, Move.from_str("a3a4")) == "P9+1"
+
+    game = Game()
+    for text in ("h2e2", "h9g7", "b2b1", "i9i8", "b1e1", "i8i9"):  # doubled cannons
+        game.apply_move(Move.from_str(text))
+    position = game.position
+    assert format_wxf(position, Move.from_str("e2f2")) == "+C.4"
+    assert format_wxf(position, Move.from_str("e1f1")) == "-C.4"
+    assert parse_wxf(position, "-C.4") == Move.from_str("e1f1")
+
+
+def test_wxf_round_trip_with_two_doubled_pawn_files() -> None:
+    position = Position.from_fen("4k4/9/9/2P1P4/2P1P4/9/9/9/9/4K4 w - - 0 1")
+    assert format_wxf(position, Move.from_str("c6c7")) == "+7+1"
+    assert format_wxf(position, Move.from_str("e5d5")) == "-5.6"
+    for move in generate_legal_moves(position, Side.RED):
+        assert parse_wxf(position, format_wxf(position, move)) == move
+    # The short form is still read when only one doubled file can make the move.
+    blocked = Position.from_fen("4k4/9/2R6/2P1P4/2P1P4/9/9/9/9/4K4 w - - 0 1")
+    assert parse_wxf(blocked, "+P+1") == Move.from_str("e6e7")
+    with pytest.raises(ParseMoveError):
+        parse_wxf(position, "+P+1")
+
+
+def test_round_trip_in_both_notations() -> None:
+    rng = random.Random(3)
+    games = [_random_game(rng, rng.randint(1, 80)) for _ in range(10)]
+    records = [record_from_game(game, {"Round": str(index)}) for index, game in enumerate(games)]
+
+    for notation in ("iccs", "wxf"):
+        buffer = io.StringIO()
+        assert write_records(buffer, records, notation) == len(records)
+        buffer.seek(0)
+        parsed = list(iter_games(buffer))
+        assert [game.history for game in parsed] == [game.history for game in games]
+        assert [game.position.key for game in parsed] == [game.position.key for game in games]
+        assert parsed[3].headers["Round"] == "3"
+
+
+def test_illegal_move_reports_line() -> None:
+    text = '[Event "bad"]\n\n1. h2e2 h9g7\n2. e2e9 *\n'
+    assert len(next(iter_records(io.StringIO(text))).moves) == 3
+    with pytest.raises(ParseGameError, match="Line 4"):
+        list(iter_games(io.StringIO(text)))
+
+
+def test_records_from_a_non_initial_position_keep_the_fen() -> None:
+    records = list(iter_records(io.StringIO(SAMPLE)))
+    text = format_record(records[1], "wxf")
+    assert '[Format "WXF"]' in text.splitlines()
+    assert text.splitlines()[1].startswith("[FEN ")
+    assert "1... H2+3 2. C2.5 C8.5 *" in text
+    assert next(iter_records(io.StringIO(text))).moves == records[1].moves
+    assert isinstance(records[1], GameRecord)
+
+
+def test_record_from_game_leaves_the_game_untouched() -> None:
+    fen = "4k4/9/9/9/9/9/9/9/4A4/3K5 w - - 0 1"
+    game = Game(Position.from_fen(fen))
+    for text in ("e1f2", "e9f9", "f2e1"):
+        game.apply_move(Move.from_str(text))
+    board, history, keys = game.position.board, game.history, game.keys
+
+    record = record_from_game(game)
+    assert record.headers["FEN"] == fen == game.start_fen
+    assert game.position.board is board and game.history is history and game.keys is keys
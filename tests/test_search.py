@@ -0,0 +1,60 @@
+from xiangqi_core import Move, Position, Side, generate_legal_moves, initial_position
+from xiangqi_core.eval import evaluate
+from xiangqi_core.search import INFINITY, MATE_SCORE, Searcher, search
+
+
+def test_finds_win_in_one() -> None:
+    # a0a9 mates; a8f8 stalemates, which also wins in Xiangqi.
+    position = Position.from_fen("4k4/R8/9/9/9/9/9/9/9/R2K5 w - - 0 1")
+    result = search(position, depth=3)
+
+    assert result.best_move in (Move.from_str("a0a9"), Move.from_str("a8f8"))
+    assert result.is_mate
+    assert result.score == MATE_SCORE - 1
+    assert result.pv[0] == result.best_move
+    position.make_move(result.best_move)
+    assert generate_legal_moves(position, Side.BLACK) == []
+
+
+def test_captures_hanging_rook() -> None:
+    position = Position.from_fen("5k3/9/9/9/r8/9/9/9/9/R2K5 w - - 0 1")
+
+    result = search(position, depth=2)
+    assert result.best_move == Move.from_str("a0a5")
+    assert result.score > 0
+
+
+def test_budgets_and_position_is_restored() -> None:
+    position = initial_position()
+    fen = position.to_fen()
+
+    result = Searcher().search(position, depth=6, node_limit=500)
+    assert result.nodes <= 500
+    assert result.best_move in generate_legal_moves(position, Side.RED)
+    assert result.depth < 6
+    assert position.to_fen() == fen
+
+    timed = search(position, time_limit=0.2)
+    assert timed.best_move is not None
+    assert timed.elapsed < 2.0
+    assert position.to_fen() == fen
+
+
+def test_no_legal_moves_returns_no_move() -> None:
+    # Stalemate: Black is not in check but every king move is covered.
+    position = Position.from_fen("4k4/R8/9/9/9/9/9/9/9/3K1R3 b - - 0 1")
+    assert generate_legal_moves(position, Side.BLACK) == []
+
+    result = search(position, depth=2)
+    assert result.best_move is None
+    assert result.score == -MATE_SCORE
+
+
+def test_quiescence_searches_quiet_evasions_when_in_check() -> None:
+    # Red's only evasion is e0f0, after which the rook takes the horse; a
+    # stand-pat score would keep the horse.
+    position = Position.from_fen("3k5/9/9/9/1N2r4/9/9/9/9/4K4 w - - 0 1")
+    searcher = Searcher(hash_mb=0)
+    score = searcher._quiescence(position, -INFINITY, INFINITY, 0)
+    assert score < evaluate(position) - 200
+    assert position.to_fen() == "3k5/9/9/9/1N2r4/9/9/9/9/4K4 w - - 0 1"
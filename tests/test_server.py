@@ -0,0 +1,185 @@
+import asyncio
+import json
+
+from xiangqi_core import Game, Move
+from xiangqi_server import GameServer, open_websocket, request_json
+
+HOST = "127.0.0.1"
+
+
+def run_with_server(scenario, **options):
+    async def main():
+        server = GameServer(workers=2, **options)
+        port = await server.start(HOST, 0)
+        try:
+            return await asyncio.wait_for(scenario(server, port), 30)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+async def receive(socket):
+    return json.loads(await socket.receive())
+
+
+def test_http_create_move_and_state():
+    async def scenario(server, port):
+        status, state = await request_json(HOST, port, "POST", "/games")
+        assert status == 201
+        assert state["ply"] == 0 and "h2e2" in state["legal_moves"]
+        path = f"/games/{state['id']}"
+
+        status, delta = await request_json(HOST, port, "POST", path + "/moves", {"move": "h2e2"})
+        assert status == 200
+        assert delta["changes"] == [
+            {"square": "h2", "piece": None},
+            {"square": "e2", "piece": "C"},
+        ]
+        assert delta["side_to_move"] == "black" and delta["ply"] == 1
+
+        status, error = await request_json(HOST, port, "POST", path + "/moves", {"move": "h2e2"})
+        assert status == 400 and "Illegal" in error["error"]
+
+        status, state = await request_json(HOST, port, "GET", path)
+        assert state["fen"].startswith("rnbakabnr/9/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C2C4/9/")
+
+        assert (await request_json(HOST, port, "DELETE", path))[0] == 200
+        assert (await request_json(HOST, port, "GET", path))[0] == 404
+
+    run_with_server(scenario)
+
+
+def test_state_reads_never_see_a_half_played_move():
+    async def scenario(server, port):
+        _, state = await request_json(HOST, port, "POST", "/games")
+        path = f"/games/{state['id']}"
+        socket = await open_websocket(HOST, port, path + "/ws")
+        await receive(socket)
+        done = asyncio.Event()
+
+        async def reader():
+            states = []
+            while not done.is_set():
+                status, state = await request_json(HOST, port, "GET", path)
+                assert status == 200, state
+                states.append(state)
+            return states
+
+        # Engine moves search the live position, so an unlocked read would
+        # catch it mid-search.
+        readers = [asyncio.create_task(reader()) for _ in range(4)]
+        played = []
+        for _ in range(4):
+            await socket.send(json.dumps({"type": "engine", "depth": 3}))
+            delta = await receive(socket)
+            assert delta["type"] == "delta", delta
+            played.append(delta["move"])
+        done.set()
+        states = [state for task in readers for state in await task]
+        await socket.close()
+        return played, states
+
+    played, states = run_with_server(scenario)
+    game = Game()
+    fens = [game.position.to_fen()]
+    for text in played:
+        game.apply_move(Move.from_str(text))
+        fens.append(game.position.to_fen())
+    assert states
+    for state in states:
+        assert state["fen"] == fens[state["ply"]]
+
+
+def test_session_limit_and_bad_fen():
+    async def scenario(server, port):
+        status, _ = await request_json(HOST, port, "POST", "/games", {"fen": "bad"})
+        assert status == 400
+        status, error = await request_json(HOST, port, "POST", "/games", {"fen": 1})
+        assert status == 400 and "string" in error["error"]
+        assert (await request_json(HOST, port, "POST", "/games"))[0] == 201
+        assert (await request_json(HOST, port, "POST", "/games"))[0] == 503
+
+    run_with_server(scenario, max_sessions=1)
+
+
+def test_positions_without_a_safe_pair_of_kings_are_rejected():
+    async def scenario(server, port):
+        for fen in (
+            "9/9/9/9/9/9/9/9/9/4K4 w - - 0 1",
+            "4k4/9/9/9/9/9/9/9/4R4/3K5 w - - 0 1",
+        ):
+            status, error = await request_json(HOST, port, "POST", "/games", {"fen": fen})
+            assert status == 400 and "king" in error["error"]
+        assert not server.sessions
+
+    run_with_server(scenario)
+
+
+def test_unexpected_errors_are_a_500(monkeypatch):
+    async def scenario(server, port):
+        async def broken(request):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(server, "_route", broken)
+        status, error = await request_json(HOST, port, "GET", "/games/x")
+        assert status == 500 and error == {"error": "Internal server error"}
+
+    run_with_server(scenario)
+
+
+def test_bad_content_length_is_a_400():
+    async def scenario(server, port):
+        for length in ("abc", "-1"):
+            reader, writer = await asyncio.open_connection(HOST, port)
+            writer.write(f"POST /games HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+            reply = await reader.read()
+            writer.close()
+            assert reply.startswith(b"HTTP/1.1 400") and b"Content-Length" in reply
+
+    run_with_server(scenario)
+
+
+def test_websocket_deltas_reach_every_subscriber():
+    async def scenario(server, port):
+        _, state = await request_json(HOST, port, "POST", "/games")
+        path = f"/games/{state['id']}/ws"
+        player = await open_websocket(HOST, port, path)
+        watcher = await open_websocket(HOST, port, path)
+        assert (await receive(player))["type"] == "state"
+        assert (await receive(watcher))["type"] == "state"
+
+        await player.send(json.dumps({"type": "move", "move": "h2e2"}))
+        for socket in (player, watcher):
+            delta = await receive(socket)
+            assert delta["type"] == "delta" and delta["move"] == "h2e2"
+
+        await player.send(json.dumps({"type": "move", "move": "a0a5"}))
+        error = await receive(player)
+        assert error["type"] == "error"
+
+        await player.send(json.dumps({"type": "engine", "depth": 1}))
+        reply = await receive(watcher)
+        assert reply["type"] == "delta" and reply["ply"] == 2 and "score" in reply
+
+        await player.close()
+        await watcher.close()
+
+    run_with_server(scenario)
+
+
+def test_finished_game_reports_result_and_rejects_moves():
+    async def scenario(server, port):
+        fen = "3k5/9/4R4/9/9/9/9/9/9/4K4 w - - 0 1"
+        _, state = await request_json(HOST, port, "POST", "/games", {"fen": fen})
+        socket = await open_websocket(HOST, port, f"/games/{state['id']}/ws")
+        await receive(socket)
+        await socket.send(json.dumps({"type": "move", "move": "e7e8"}))
+        delta = await receive(socket)
+        assert delta["result"] == "red_win" and delta["legal_moves"] == []
+        assert delta["check"] is False
+        await socket.send(json.dumps({"type": "engine"}))
+        assert "finished" in (await receive(socket))["message"]
+        await socket.close()
+
+    run_with_server(scenario)
@@ -0,0 +1,117 @@
+import json
+import random
+
+import pytest
+
+from xiangqi_core import Move, Position, XiangqiError, generate_legal_moves, initial_position
+from xiangqi_core.board import Board
+from xiangqi_core.coord import Coord
+from xiangqi_core.tablebase import (
+    WDL,
+    ProbeResult,
+    Tablebase,
+    _layout,
+    canonical_signature,
+    generate_tablebase,
+    main,
+    table_path,
+)
+from xiangqi_core.types import Side
+
+
+@pytest.fixture(scope="module")
+def tables(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("tables"))
+    assert generate_tablebase("KRk", directory, workers=1) == ["Kk", "KRk"]
+    assert generate_tablebase("kpK", directory, workers=1) == ["KPk"]
+    return directory
+
+
+def test_signatures_are_canonicalised() -> None:
+    assert canonical_signature("KRk") == "KRk"
+    assert canonical_signature("Kkr") == "KRk"
+    assert canonical_signature("kNKr") == "KRkn"
+    assert canonical_signature("KHPkaa") == "KNPkaa"
+    for bad in ("KR", "KKk", "KXk"):
+        with pytest.raises(ValueError):
+            canonical_signature(bad)
+
+
+def test_known_positions(tables) -> None:
+    tablebase = Tablebase(tables)
+    assert tablebase.signatures() == ["KPk", "KRk", "Kk"]
+
+    # Black's rook mates (by stalemate) from the mirrored side of the table.
+    mate_in_one = Position.from_fen("3k5/9/9/9/9/9/9/9/r8/4K4 b - - 0 1")
+    assert tablebase.probe(mate_in_one) == ProbeResult(WDL.WIN, 1)
+    move = tablebase.best_move(mate_in_one)
+    mate_in_one.make_move(move)
+    assert tablebase.probe(mate_in_one) == ProbeResult(WDL.LOSS, 0)
+    assert generate_legal_moves(mate_in_one, Side.RED) == []
+
+    hanging_rook = Position.from_fen("4k4/4R4/9/9/9/9/9/9/9/3K5 b - - 0 1")
+    assert tablebase.probe(hanging_rook) == ProbeResult(WDL.DRAW, None)
+    assert tablebase.best_move(hanging_rook) == Move.from_str("e9e8")
+
+    assert tablebase.probe(Position.from_fen("3k5/9/9/9/9/9/9/9/9/4K4 w - - 0 1")).wdl is WDL.DRAW
+    assert tablebase.probe(initial_position()) is None
+    # Black to move while Red's king is attacked cannot arise.
+    assert tablebase.probe(Position.from_fen("3k5/9/9/9/9/9/9/9/9/4K3r b - - 0 1")) is None
+
+
+@pytest.mark.parametrize("signature", ["KRk", "KPk"])
+def test_entries_agree_with_their_best_reply(tables, signature) -> None:
+    tablebase = Tablebase(tables)
+    layout = _layout(signature)
+    rng = random.Random(19)
+    checked = 0
+    while checked < 150:
+        squares, black_to_move = layout.decode(rng.randrange(layout.size))
+        if not layout.is_canonical(squares):
+            continue
+        board = Board()
+        for square, piece in zip(squares, layout.pieces):
+            board.place(Coord.from_index(square), piece)
+        position = Position(board, Side.BLACK if black_to_move else Side.RED)
+        result = tablebase.probe(position)
+        if result is None:
+            continue
+        replies = []
+        for move in generate_legal_moves(position, position.side_to_move):
+            undo = position.make_move(move)
+            replies.append(tablebase.probe(position))
+            position.unmake_move(undo)
+
+        losses = [reply.dtm for reply in replies if reply.wdl is WDL.LOSS]
+        if not replies:
+            expected = ProbeResult(WDL.LOSS, 0)
+        elif losses:
+            expected = ProbeResult(WDL.WIN, min(losses) + 1)
+        elif all(reply.wdl is WDL.WIN for reply in replies):
+            expected = ProbeResult(WDL.LOSS, max(reply.dtm for reply in replies) + 1)
+        else:
+            expected = ProbeResult(WDL.DRAW, None)
+        assert result == expected, position.to_fen()
+        checked += 1
+
+
+def test_worker_processes_write_identical_tables(tables, tmp_path) -> None:
+    directory = str(tmp_path)
+    assert generate_tablebase("KPk", directory, workers=2, chunk_size=1000) == ["Kk", "KPk"]
+    with open(table_path(directory, "KPk"), "rb") as ours, open(
+        table_path(tables, "KPk"), "rb"
+    ) as reference:
+        assert ours.read() == reference.read()
+
+
+def test_rejects_corrupt_files(tmp_path) -> None:
+    (tmp_path / "Kk.xtb").write_bytes(b"XQTB1\0\0\0garbage")
+    with pytest.raises(XiangqiError):
+        Tablebase(str(tmp_path)).probe(Position.from_fen("3k5/9/9/9/9/9/9/9/9/4K4 w"))
+
+
+def test_cli_probe(tables, capsys) -> None:
+    assert main(["probe", "--dir", tables, "--fen", "3k5/9/9/9/9/9/9/9/r8/4K4 b"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert (report["wdl"], report["dtm"], report["best_move"]) == ("win", 1, "a1f1")
+    assert main(["probe", "--dir", tables, "--fen", initial_position().to_fen()]) == 1
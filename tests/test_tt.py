@@ -0,0 +1,64 @@
+import pytest
+
+from xiangqi_core import Move, initial_position
+from xiangqi_core.search import MATE_SCORE, Searcher
+from xiangqi_core.tt import ENTRY_BYTES, Bound, TranspositionTable
+
+
+def test_budget_sets_a_fixed_footprint() -> None:
+    table = TranspositionTable(size_mb=0.25)
+    assert table.size_bytes == 256 * 1024
+    assert table.capacity == 256 * 1024 // ENTRY_BYTES
+
+    for key in range(3 * table.capacity):
+        table.store(key * 0x9E3779B97F4A7C15 % (1 << 64), 3, Bound.EXACT, 10)
+    assert table.size_bytes == 256 * 1024
+
+    with pytest.raises(ValueError):
+        TranspositionTable(size_mb=0)
+
+
+def test_store_and_probe_round_trip() -> None:
+    table = TranspositionTable(size_mb=0.01)
+    move = Move.from_str("h2e2")
+
+    assert table.probe(42) is None
+    table.store(42, 5, Bound.LOWER, -MATE_SCORE + 3, move)
+    entry = table.probe(42)
+
+    assert entry is not None
+    assert (entry.depth, entry.bound, entry.score) == (5, Bound.LOWER, -MATE_SCORE + 3)
+    assert entry.move is move
+    assert table.stats() == {"hits": 1, "misses": 1, "collisions": 0}
+
+
+def test_depth_preferred_and_always_replace_slots() -> None:
+    table = TranspositionTable(size_mb=ENTRY_BYTES * 2 / (1024 * 1024))  # a single bucket
+    table.store(1, 8, Bound.EXACT, 100)
+    table.store(2, 2, Bound.EXACT, 200)
+    table.store(3, 1, Bound.EXACT, 300)
+
+    # The deep entry survives; the shallow slot keeps only the latest store.
+    assert table.probe(1).score == 100  # type: ignore[union-attr]
+    assert table.probe(2) is None
+    assert table.probe(3).score == 300  # type: ignore[union-attr]
+    assert table.collisions == 1
+
+    # Entries from an earlier search no longer protect the deep slot.
+    table.new_search()
+    table.store(4, 1, Bound.UPPER, 400)
+    assert table.probe(1) is None
+    assert table.probe(4).score == 400  # type: ignore[union-attr]
+
+
+def test_search_uses_and_reuses_the_table() -> None:
+    position = initial_position()
+    searcher = Searcher(hash_mb=1)
+
+    first = searcher.search(position, depth=3)
+    assert searcher.tt is not None and searcher.tt.hits > 0
+    second = searcher.search(position, depth=3)
+
+    assert second.nodes < first.nodes
+    assert second.score == first.score
+    assert Searcher(hash_mb=0).tt is None
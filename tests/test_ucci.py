@@ -0,0 +1,137 @@
+import io
+import time
+
+from xiangqi_core import Move, initial_position
+from xiangqi_core.fen import START_FEN
+from xiangqi_core.legality import generate_legal_moves
+from xiangqi_core.ucci import UcciEngine
+
+
+def make_engine():
+    output = io.StringIO()
+    return UcciEngine(output=output, hash_mb=1), output
+
+
+def lines(output):
+    return output.getvalue().splitlines()
+
+
+def test_handshake_and_quit():
+    engine, output = make_engine()
+    assert engine.handle("ucci")
+    assert engine.handle("isready")
+    assert not engine.handle("quit")
+    out = lines(output)
+    assert out[0].startswith("id name")
+    assert "ucciok" in out
+    assert out[-2:] == ["readyok", "bye"]
+
+
+def test_position_applies_only_the_new_moves():
+    engine, _ = make_engine()
+    engine.handle(f"position fen {START_FEN} moves h2e2 h9g7")
+    undos = list(engine._undos)
+    engine.handle(f"position fen {START_FEN} moves h2e2 h9g7 h0g2")
+    assert engine._undos[:2] == undos
+    assert len(engine._undos) == 3
+
+    # A takeback unmakes to the common prefix and replays the new tail.
+    engine.handle("position startpos moves h2e2 b9c7")
+    expected = initial_position()
+    expected.make_move(Move.from_str("h2e2"))
+    expected.make_move(Move.from_str("b9c7"))
+    assert engine._undos[0] is undos[0]
+    assert engine.position.to_fen() == expected.to_fen()
+    assert engine.position.key == expected.key
+
+
+def test_rejected_position_leaves_the_engine_unchanged():
+    engine, output = make_engine()
+    engine.handle("position startpos moves h2e2 h9g7")
+    fen, moves = engine.position.to_fen(), list(engine._moves)
+
+    engine.handle("position startpos moves h2e2 b9c7 e2e9")
+    assert lines(output) == ["info string illegal move e2e9"]
+    assert engine.position.to_fen() == fen and engine._moves == moves
+
+    engine.handle("position fen 4k4/9/9/9/9/9/9/9/9/4K4 w - - 0 1 moves e0e1 e9e8 e1e5")
+    assert engine.position.to_fen() == fen and engine._moves == moves
+    assert engine._start_fen == START_FEN
+
+
+def test_hashsize_outside_the_advertised_range_is_rejected():
+    engine, output = make_engine()
+    searcher = engine.searcher
+    for value in ("1e9", "-1", "nan"):
+        engine.handle(f"setoption hashsize {value}")
+        assert lines(output)[-1].startswith("info string hashsize must be 0 to 1024")
+        assert engine.searcher is searcher
+    engine.handle("setoption hashsize 2")
+    assert engine.searcher is not searcher
+
+
+def test_positions_without_a_safe_pair_of_kings_are_rejected():
+    engine, output = make_engine()
+    engine.handle("position startpos moves h2e2")
+    fen = engine.position.to_fen()
+    for setup in ("9/9/9/9/9/9/9/9/9/4K4 w - - 0 1 moves e0e1", "4k4/9/9/9/9/9/9/9/4R4/3K5 w - - 0 1"):
+        engine.handle(f"position fen {setup}")
+        assert lines(output)[-1].startswith("info string illegal position")
+        assert engine.position.to_fen() == fen
+
+
+def test_failed_search_still_answers(monkeypatch):
+    engine, output = make_engine()
+
+    def broken(*args, **kwargs):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(engine.searcher, "search", broken)
+    engine.handle("position startpos")
+    engine.handle("go depth 2")
+    engine.wait(10)
+    assert lines(output)[-2:] == ["info string search failed: boom", "nobestmove"]
+
+
+def test_go_depth_reports_iterations_and_best_move():
+    engine, output = make_engine()
+    engine.handle("position startpos")
+    engine.handle("go depth 2")
+    engine.wait(30)
+    out = lines(output)
+    infos = [line for line in out if line.startswith("info depth")]
+    assert [line.split()[2] for line in infos] == ["1", "2"]
+    assert " pv " in infos[-1]
+    assert out[-1].startswith("bestmove ")
+    best = Move.from_str(out[-1].split()[1])
+    position = initial_position()
+    assert best in generate_legal_moves(position, position.side_to_move)
+
+
+def test_stop_ends_an_infinite_search_quickly():
+    engine, output = make_engine()
+    engine.handle("position startpos")
+    engine.handle("go infinite")
+    time.sleep(0.2)
+    assert engine.searching
+    started = time.perf_counter()
+    engine.handle("stop")
+    assert time.perf_counter() - started < 0.5
+    assert not engine.searching
+    assert lines(output)[-1].startswith("bestmove ")
+
+
+def test_no_legal_moves_gives_nobestmove():
+    engine, output = make_engine()
+    engine.handle("position fen 3k5/4R4/4R4/9/9/9/9/9/9/4K4 b - - 0 1")
+    engine.handle("go depth 1")
+    engine.wait(10)
+    assert lines(output)[-1] == "nobestmove"
+
+
+def test_run_reads_until_quit():
+    engine, output = make_engine()
+    engine.run(io.StringIO("ucci\nposition startpos\ngo depth 1\nquit\nisready\n"))
+    out = lines(output)
+    assert out[-1] == "bye"
+    assert "readyok" not in out
@@ -0,0 +1,49 @@
+import pytest
+
+from xiangqi_core import Coord, Game, Move, Piece, PieceType, Side, initial_position
+from xiangqi_core import zobrist
+
+
+def test_initial_key_is_stable_across_processes() -> None:
+    # Keys are persisted (books, tables), so the seeded tables must never drift.
+    assert initial_position().key == 0x898D84FDB18D8B4C
+
+
+def test_incremental_key_matches_recomputation() -> None:
+    game = Game()
+    keys = [game.position.key]
+    for text in ("h2e2", "h9g7", "h0g2", "i9h9", "e2e6", "g7e6"):
+        game.apply_move(Move.from_str(text))
+        assert game.position.key == zobrist.compute_key(game.position)
+        keys.append(game.position.key)
+
+    assert len(set(keys)) == len(keys)
+
+    board = game.position.board
+    board.remove(Coord.from_str("e6"))
+    board.place(Coord.from_str("e5"), Piece(Side.RED, PieceType.PAWN))
+    assert game.position.key == zobrist.compute_key(game.position)
+
+
+def test_transpositions_share_a_key() -> None:
+    first = Game()
+    for text in ("h0g2", "h9g7", "b0c2"):
+        first.apply_move(Move.from_str(text))
+    second = Game()
+    for text in ("b0c2", "h9g7", "h0g2"):
+        second.apply_move(Move.from_str(text))
+
+    assert first.position.key == second.position.key
+    first.position.side_to_move = Side.RED
+    assert first.position.key != second.position.key
+
+
+def test_debug_verification_detects_drift(monkeypatch) -> None:
+    monkeypatch.setattr(zobrist, "_debug_verification", True)
+    position = initial_position()
+    undo = position.make_move(Move.from_str("h2e2"))
+    position.unmake_move(undo)
+
+    position.board._key ^= 1
+    with pytest.raises(AssertionError):
+        position.make_move(Move.from_str("h2e2"))